@@ -1,11 +1,14 @@
-import pandas as pd
 import re
 from typing import List, Tuple
 
+from kohi_io import read_rows, write_rows
+from kohi_memo import MEMO_FILE, EnhanceMemo
+from kohi_segment import DICTIONARY_FILE, Segmenter, load_dictionary
+
 class SearchTermEnhancer:
     """검색어를 의미맥락 단위로 분리하여 검색 성공률 향상"""
 
-    def __init__(self):
+    def __init__(self, titles=None, dictionary_file=None, rebuild_dictionary=False):
         # 의미 단위 키워드 사전
         self.compound_words = [
             '사회복지', '보건복지', '기초생활', '긴급복지', '사례관리',
@@ -18,6 +21,19 @@ class SearchTermEnhancer:
         self.particles = ['의', '을', '를', '이', '가', '와', '과', '에', '에서', '로', '으로']
         self.connectors = ['위한', '통해', '통한', '대한', '관한']
 
+        # 붙어 쓴 단어 분리기 (입력 교육명 + work.csv/결과 CSV의 알려진 교육명에서 단어 빈도 수집,
+        # dictionary_file을 주면 그 파일에 고정한 빈도를 씀)
+        counts, version = load_dictionary(dictionary_file, titles or [], particles=self.particles,
+                                          rebuild=rebuild_dictionary)
+        self.segmenter = Segmenter.from_counts(counts, version=version,
+                                               extra_words=self.compound_words,
+                                               particles=self.particles)
+
+    def memo_key(self):
+        """검색어 메모 버전에 넣을 값 (복합명사/조사/연결어구 사전 + 분리기 규칙/단어 사전 버전)"""
+        return {'compound_words': self.compound_words, 'particles': self.particles,
+                'connectors': self.connectors, 'segmenter': self.segmenter.memo_key()}
+
     def split_by_meaning_units(self, text: str) -> str:
         """의미맥락 단위로 텍스트 분리"""
         original = text
@@ -38,40 +54,23 @@ class SearchTermEnhancer:
             if compound in protected_text:
                 placeholder = f"__COMPOUND{idx}__"
                 replacements[placeholder] = compound
-                protected_text = protected_text.replace(compound, placeholder)
+                protected_text = protected_text.replace(compound, f" {placeholder} ")
 
         # 4. CamelCase 및 붙어있는 단어 분리
         # 대문자 앞에 공백 추가
         protected_text = re.sub(r'([가-힣])([A-Z])', r'\1 \2', protected_text)
         protected_text = re.sub(r'([a-z])([A-Z])', r'\1 \2', protected_text)
 
-        # 5. 한글 단어 경계 감지 및 분리
-        # 명사+명사 패턴 분리
+        # 5. 교육명 사전 기반 최적 경로 분리 (조사는 떼어 내고 연결어구는 그대로 둠)
         words = []
-        temp_word = ""
 
-        for char in protected_text:
-            if char == ' ' or char in '.,':
-                if temp_word:
-                    words.append(temp_word)
-                    temp_word = ""
+        for token in re.split(r'[\s.,]+', protected_text):
+            if not token:
                 continue
-
-            temp_word += char
-
-            # 조사나 연결어구 발견 시 분리
-            for particle in self.particles + self.connectors:
-                if temp_word.endswith(particle) and len(temp_word) > len(particle):
-                    # 조사/연결어 앞까지 단어로 추가
-                    base = temp_word[:-len(particle)]
-                    if base and not base.startswith('__COMPOUND'):
-                        words.append(base)
-                        words.append(particle)
-                        temp_word = ""
-                        break
-
-        if temp_word:
-            words.append(temp_word)
+            if token.startswith('__COMPOUND') or token in self.connectors:
+                words.append(token)
+            else:
+                words.extend(self.segmenter.split_word(token))
 
         # 6. 복합명사 복원
         restored_words = []
@@ -122,29 +121,32 @@ class SearchTermEnhancer:
             'improvement_ratio': round(len(enhanced.split()) / max(1, len(original.split())), 2)
         }
 
-def main():
-    """메인 실행 함수"""
+def main(input_file='work.csv', output_file='work_enhanced.csv', memo_file=MEMO_FILE,
+         dictionary_file=DICTIONARY_FILE, rebuild_dictionary=False):
+    """메인 실행 함수 (memo_file에 있는 교육명은 다시 분리하지 않음, None이면 전부 계산)"""
     print("=" * 60)
     print("검색어 개선 프로세스 시작")
     print("=" * 60)
 
     # 1. 원본 데이터 로드
-    df = pd.read_csv('work.csv')
-    print(f"\n[OK] 원본 교육과정 수: {len(df)}")
+    rows = read_rows(input_file)
+    print(f"\n[OK] 원본 교육과정 수: {len(rows)}")
 
-    enhancer = SearchTermEnhancer()
+    enhancer = SearchTermEnhancer(titles=[row['교육명'] for row in rows], dictionary_file=dictionary_file,
+                                  rebuild_dictionary=rebuild_dictionary)
+    memo = EnhanceMemo(memo_file, enhancer)
 
     # 2. 검색어 개선
-    enhanced_terms = []
-    improvement_stats = []
-
-    for idx, row in df.iterrows():
+    for idx, row in enumerate(rows):
         original = row['교육명']
-        enhanced = enhancer.split_by_meaning_units(original)
-        enhanced_terms.append(enhanced)
-
+        enhanced = memo.get(original, enhancer.split_by_meaning_units)
         stats = enhancer.analyze_improvement(original, enhanced)
-        improvement_stats.append(stats)
+
+        # 3. 개선된 데이터 컬럼 추가
+        row['검색어_원본'] = original
+        row['검색어_개선'] = enhanced
+        row['검색어_수'] = stats['term_count']
+        row['개선율'] = stats['improvement_ratio']
 
         # 샘플 출력 (처음 10개)
         if idx < 10:
@@ -152,23 +154,19 @@ def main():
             print(f"    TO-BE: {enhanced}")
             print(f"    개선율: {stats['improvement_ratio']}x ({stats['term_count']} 검색어)")
 
-    # 3. 개선된 데이터 저장
-    df['검색어_원본'] = df['교육명']
-    df['검색어_개선'] = enhanced_terms
-    df['검색어_수'] = [len(term.split()) for term in enhanced_terms]
-    df['개선율'] = [stat['improvement_ratio'] for stat in improvement_stats]
-
-    df.to_csv('work_enhanced.csv', index=False, encoding='utf-8-sig')
-    print("\n[OK] 개선된 검색어 파일 저장: work_enhanced.csv")
+    write_rows(output_file, rows)
+    memo.save()
+    print(f"\n[OK] 개선된 검색어 파일 저장: {output_file} (메모 재사용 {memo.hits}개, 신규 계산 {memo.misses}개)")
 
     # 4. 통계 분석
     print("\n" + "=" * 60)
     print("[ANALYSIS] AS-IS / TO-BE 분석 결과")
     print("=" * 60)
 
-    avg_original_terms = df['교육명'].str.split().str.len().mean()
-    avg_enhanced_terms = df['검색어_수'].mean()
-    avg_improvement = df['개선율'].mean()
+    count = max(1, len(rows))
+    avg_original_terms = sum(len(row['교육명'].split()) for row in rows) / count
+    avg_enhanced_terms = sum(row['검색어_수'] for row in rows) / count
+    avg_improvement = sum(row['개선율'] for row in rows) / count
 
     print(f"""
     AS-IS (기존):
@@ -189,17 +187,19 @@ def main():
     """)
 
     # 5. 개선 효과가 큰 TOP 10
-    df_sorted = df.sort_values('개선율', ascending=False)
+    rows_sorted = sorted(rows, key=lambda r: r['개선율'], reverse=True)
     print("\n[TOP10] 개선 효과 TOP 10:")
     print("-" * 60)
 
-    for idx, row in df_sorted.head(10).iterrows():
+    for row in rows_sorted[:10]:
         print(f"{row['검색어_원본'][:30]:<30} → {row['개선율']:.1f}x 개선")
 
     print("\n[COMPLETE] 검색어 개선 완료!")
     print("다음 단계: 개선된 검색어로 스크래핑 실행")
 
-    return df
+    return rows
 
 if __name__ == "__main__":
-    enhanced_df = main()
\ No newline at end of file
+    import sys
+    from kohi import main as cli_main
+    sys.exit(cli_main(['enhance', '--algorithm', 'basic'] + sys.argv[1:]))
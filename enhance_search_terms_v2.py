@@ -1,11 +1,14 @@
-import pandas as pd
 import re
 from typing import List
 
+from kohi_io import read_rows, write_rows
+from kohi_memo import MEMO_FILE, EnhanceMemo
+from kohi_segment import DICTIONARY_FILE, Segmenter, load_dictionary
+
 class AdvancedSearchEnhancer:
     """고급 검색어 개선 알고리즘"""
 
-    def __init__(self):
+    def __init__(self, titles=None, dictionary_file=None, rebuild_dictionary=False):
         # 복합명사 사전 (분리하면 안되는 단어들)
         self.preserve_compounds = {
             '사회복지', '보건복지', '기초생활', '긴급복지', '사례관리',
@@ -14,8 +17,16 @@ class AdvancedSearchEnhancer:
             '상담기법', '사회보장', '공무원', '공문서', '저작권'
         }
 
-        # 분리 키워드 (이 뒤는 분리)
-        self.split_keywords = ['의', '을', '를', '와', '과', '에서', '위한', '통해', '통한']
+        # 붙어 쓴 단어 분리기 (입력 교육명 + work.csv/결과 CSV의 알려진 교육명에서 단어 빈도 수집,
+        # dictionary_file을 주면 그 파일에 고정한 빈도를 씀)
+        counts, version = load_dictionary(dictionary_file, titles or [], rebuild=rebuild_dictionary)
+        self.segmenter = Segmenter.from_counts(counts, version=version,
+                                               extra_words=self.preserve_compounds)
+
+    def memo_key(self):
+        """검색어 메모 버전에 넣을 값 (복합명사 사전 + 분리기 규칙/단어 사전 버전)"""
+        return {'preserve_compounds': sorted(self.preserve_compounds),
+                'segmenter': self.segmenter.memo_key()}
 
     def smart_split(self, text: str) -> str:
         """스마트 검색어 분리"""
@@ -41,9 +52,9 @@ class AdvancedSearchEnhancer:
                 parts.append(eng)
                 main_text = main_text.replace(eng, ' ')
 
-        # 4. 복합명사 보호
+        # 4. 복합명사 보호 (긴 것부터 고정 순서로, set 순회 순서에 따라 결과가 바뀌지 않도록)
         protected_parts = []
-        for compound in self.preserve_compounds:
+        for compound in sorted(self.preserve_compounds, key=lambda c: (-len(c), c)):
             if compound in main_text:
                 protected_parts.append(compound)
                 main_text = main_text.replace(compound, f' __{len(protected_parts)-1}__ ')
@@ -52,34 +63,15 @@ class AdvancedSearchEnhancer:
         # CamelCase 분리
         main_text = re.sub(r'([가-힣])([A-Z])', r'\1 \2', main_text)
 
-        # 조사/연결어 기준 분리
-        for keyword in self.split_keywords:
-            pattern = f'([가-힣]+){keyword}([가-힣]+)'
-            main_text = re.sub(pattern, rf'\1 {keyword} \2', main_text)
-
-        # 붙어있는 단어 휴리스틱 분리
-        # 4글자 이상 붙어있으면 중간에서 분리 시도
+        # 교육명 사전 기반 최적 경로 분리 (조사 제거, 사전 단어 또는 원문 글자 묶음만 남음)
         words = main_text.split()
         new_words = []
 
         for word in words:
             if word.startswith('__') and word.endswith('__'):
                 new_words.append(word)
-                continue
-
-            if len(word) >= 6 and all(c in '가나다라마바사아자차카타파하' +
-                                      '각낙닥락막박삭악작착칵탁팍학' +
-                                      '간난단란만반산안잔찬칸탄판한' +
-                                      '감남담람맘밤삼암잠참캄탐팜함' +
-                                      '강낭당랑망방상앙장창캉탕팡항' for c in word[0]):
-                # 긴 한글 단어는 의미 단위로 분리 시도
-                mid = len(word) // 2
-                if mid >= 2:
-                    new_words.extend([word[:mid], word[mid:]])
-                else:
-                    new_words.append(word)
             else:
-                new_words.append(word)
+                new_words.extend(self.segmenter.split_word(word))
 
         # 6. 복원 및 정리
         final_parts = []
@@ -116,29 +108,31 @@ class AdvancedSearchEnhancer:
 
         return ' '.join(unique_parts)
 
-def analyze_and_enhance():
-    """검색어 개선 및 분석"""
+def analyze_and_enhance(input_file='work.csv', output_file='work_enhanced.csv', memo_file=MEMO_FILE,
+                        dictionary_file=DICTIONARY_FILE, rebuild_dictionary=False):
+    """검색어 개선 및 분석 (memo_file에 있는 교육명은 다시 분리하지 않음, None이면 전부 계산)"""
 
     print("\n" + "="*70)
     print(" " * 20 + "KOHI 검색어 최적화 시스템")
     print("="*70)
 
     # 데이터 로드
-    df = pd.read_csv('work.csv', encoding='utf-8-sig')
-    total_courses = len(df)
+    rows = read_rows(input_file)
+    total_courses = len(rows)
     print(f"\n[1] 데이터 로드 완료: {total_courses}개 교육과정")
 
-    enhancer = AdvancedSearchEnhancer()
+    enhancer = AdvancedSearchEnhancer(titles=[row['교육명'] for row in rows], dictionary_file=dictionary_file,
+                                      rebuild_dictionary=rebuild_dictionary)
+    memo = EnhanceMemo(memo_file, enhancer)
 
-    # 검색어 개선
+    # 검색어 개선 (새로 추가되거나 바뀐 교육명만 분리)
     print("\n[2] 검색어 개선 진행중...")
 
     results = []
-    improvements = []
 
-    for idx, row in df.iterrows():
+    for idx, row in enumerate(rows):
         original = str(row['교육명']).strip()
-        enhanced = enhancer.smart_split(original)
+        enhanced = memo.get(original, enhancer.smart_split)
 
         # 분석 데이터
         original_terms = original.split()
@@ -154,23 +148,20 @@ def analyze_and_enhance():
             '개선율': improvement_rate
         })
 
+        # 원본 데이터와 병합
+        row['검색어_원본'] = original
+        row['검색어_개선'] = enhanced
+        row['개선_단어수'] = len(enhanced_terms)
+        row['개선율'] = improvement_rate
+
         # 진행상황 표시
         if (idx + 1) % 50 == 0:
             print(f"    처리중... {idx+1}/{total_courses}")
 
-    # DataFrame 생성
-    result_df = pd.DataFrame(results)
-
-    # 원본 데이터와 병합
-    df['검색어_원본'] = result_df['원본']
-    df['검색어_개선'] = result_df['개선']
-    df['개선_단어수'] = result_df['개선_단어수']
-    df['개선율'] = result_df['개선율']
-
-    # 저장
-    output_file = 'work_enhanced.csv'
-    df.to_csv(output_file, index=False, encoding='utf-8-sig')
-    print(f"\n[3] 개선된 파일 저장: {output_file}")
+    # 저장 (결과 CSV와 메모 모두 임시 파일 후 교체)
+    write_rows(output_file, rows)
+    memo.save()
+    print(f"\n[3] 개선된 파일 저장: {output_file} (메모 재사용 {memo.hits}개, 신규 계산 {memo.misses}개)")
 
     # AS-IS / TO-BE 분석
     print("\n" + "="*70)
@@ -178,9 +169,10 @@ def analyze_and_enhance():
     print("="*70)
 
     # 통계
-    avg_original = result_df['원본_단어수'].mean()
-    avg_enhanced = result_df['개선_단어수'].mean()
-    avg_improvement = result_df['개선율'].mean()
+    count = max(1, len(results))
+    avg_original = sum(r['원본_단어수'] for r in results) / count
+    avg_enhanced = sum(r['개선_단어수'] for r in results) / count
+    avg_improvement = sum(r['개선율'] for r in results) / count
 
     print(f"""
     [AS-IS] 기존 검색 방식
@@ -206,9 +198,9 @@ def analyze_and_enhance():
     print("\n[개선 효과 TOP 10]")
     print("-" * 70)
 
-    top10 = result_df.nlargest(10, '개선율')
+    top10 = sorted(enumerate(results), key=lambda x: x[1]['개선율'], reverse=True)[:10]
 
-    for idx, row in top10.iterrows():
+    for idx, row in top10:
         original_preview = row['원본'][:30] + ('...' if len(row['원본']) > 30 else '')
         print(f"  {idx+1:3d}. {original_preview:35s} | {row['개선율']:.1f}x")
         print(f"       -> {row['개선'][:60]}")
@@ -218,8 +210,8 @@ def analyze_and_enhance():
     print("\n[샘플 비교 (처음 5개)]")
     print("-" * 70)
 
-    for i in range(min(5, len(result_df))):
-        row = result_df.iloc[i]
+    for i in range(min(5, len(results))):
+        row = results[i]
         print(f"\n  [{i+1}] AS-IS: {row['원본']}")
         print(f"      TO-BE: {row['개선']}")
         print(f"      개선율: {row['개선율']:.1f}x ({row['원본_단어수']}개 -> {row['개선_단어수']}개)")
@@ -228,8 +220,9 @@ def analyze_and_enhance():
     print(" " * 25 + "검색어 개선 완료!")
     print("="*70)
 
-    return df
+    return rows
 
 if __name__ == "__main__":
-    enhanced_df = analyze_and_enhance()
-    print("\n다음 단계: kohi_scraper_ultimate.py를 개선된 검색어로 업데이트")
\ No newline at end of file
+    import sys
+    from kohi import main as cli_main
+    sys.exit(cli_main(['enhance', '--algorithm', 'advanced'] + sys.argv[1:]))
@@ -0,0 +1,638 @@
+"""
+KOHI 통합 명령행 도구
+
+    python kohi.py enhance                  # 검색어 개선 (work.csv -> work_enhanced.csv)
+    python kohi.py scrape --limit 10        # 스크래핑 (기본: ultimate 엔진)
+    python kohi.py resume                   # 임시 저장 파일에서 이어서 스크래핑
+    python kohi.py eval                     # 검색어 전략 오프라인 평가
+    python kohi.py search --port 8770       # 수집 결과 로컬 검색 서비스
+    python kohi.py normalize                # 날짜/인원/시간/교육비 타입 컬럼 추가
+    python kohi.py reextract                # 보관된 원본 HTML로 결과 재생성 (오프라인)
+    python kohi.py assets                   # 썸네일/첨부자료 다운로드
+    python kohi.py watch --interval 300     # 모집중 과정 신청현황 변화 감시
+    python kohi.py browserd --detach        # 상주 브라우저 서버 (scrape --browser-server로 연결)
+    python kohi.py report scraped_ultimate_final.csv
+
+설정은 플래그 또는 JSON 파일(--config, 기본 ./kohi.json)로 지정한다.
+파일의 최상위 키는 모든 하위 명령에, "scrape" 같은 섹션 키는 해당 명령에만 적용되며
+명령행 플래그가 항상 우선한다.
+
+무거운 모듈(pandas, playwright)은 실제로 필요한 하위 명령에서만 import하므로
+enhance/report는 즉시 시작된다.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from kohi_options import BROWSERD_STATE_FILE, add_browserd_arguments, add_mock_arguments
+
+DEFAULT_CONFIG_FILE = 'kohi.json'
+
+# 엔진별 기본 입출력 경로
+ENGINE_DEFAULTS = {
+    'ultimate': {
+        'input': 'work.csv',
+        'output': 'scraped_ultimate_final.csv',
+        'temp': 'scraped_ultimate_temp.csv',
+        'log_file': 'scraper_ultimate.log',
+        'delay': 1.0,
+    },
+    'optimized': {
+        'input': 'work_enhanced.csv',
+        'output': 'scraped_optimized_final.csv',
+        'temp': 'scraped_optimized_temp.csv',
+        'log_file': 'scraper_optimized.log',
+        'delay': 2.0,
+    },
+}
+
+
+def load_config(path):
+    """JSON 설정 파일 로드 (키의 '-'는 '_'로 정규화)"""
+    if not path:
+        if not os.path.exists(DEFAULT_CONFIG_FILE):
+            return {}
+        path = DEFAULT_CONFIG_FILE
+
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+
+    def normalize(d):
+        return {k.replace('-', '_'): (normalize(v) if isinstance(v, dict) else v)
+                for k, v in d.items()}
+
+    return normalize(raw)
+
+
+def cmd_enhance(args):
+    """검색어 개선"""
+    if args.algorithm == 'basic':
+        from enhance_search_terms import main as enhance_main
+    else:
+        from enhance_search_terms_v2 import analyze_and_enhance as enhance_main
+
+    enhance_main(input_file=args.input or 'work.csv',
+                 output_file=args.output or 'work_enhanced.csv',
+                 memo_file=None if args.no_memo else args.memo,
+                 dictionary_file=args.dictionary, rebuild_dictionary=args.rebuild_dictionary)
+    return 0
+
+
+def _split_list(value):
+    """'a, b,c' -> ['a', 'b', 'c']"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _resolve_engine_defaults(args):
+    """지정되지 않은 옵션을 엔진별 기본값으로 채우기"""
+    for key, value in ENGINE_DEFAULTS[args.engine].items():
+        if getattr(args, key, None) is None:
+            setattr(args, key, value)
+
+
+def cmd_scrape(args, resume=False):
+    """스크래핑 실행"""
+    from kohi_io import load_completed
+
+    _resolve_engine_defaults(args)
+
+    if args.engine == 'optimized':
+        import kohi_scraper_optimized as engine
+    else:
+        import kohi_scraper_ultimate as engine
+
+    engine.setup_logging(args.log_file or None, level=args.log_level.upper(),
+                         log_format=args.log_format, debug_sample_rate=args.debug_sample)
+    completed = load_completed(args.temp) if resume else None
+    stop_metrics = _start_metrics(args)
+
+    hedge = None
+    if args.hedge:
+        from kohi_hedge import HedgedSearch
+        from kohi_io import first_column
+        hedge = HedgedSearch(args.base_url, _split_list(args.hedge_variants),
+                             titles=first_column(args.input), max_parallel=args.workers)
+
+    scheduler = None
+    if args.priority or args.time_budget:
+        from kohi_priority import CourseHistory, PriorityScheduler
+        history = args.history or [path for path in (args.output, args.temp) if os.path.exists(path)]
+        scheduler = PriorityScheduler(CourseHistory.from_files(history), budget=args.time_budget,
+                                      course_seconds=args.course_seconds)
+
+    from kohi_projection import from_option
+    projection = from_option(args.columns)
+
+    try:
+        if args.engine == 'optimized':
+            profile = None
+            if args.profile:
+                from kohi_profile import BrowserProfile
+                profile = BrowserProfile(args.profile)
+                profile.prepare(args.base_url)
+            scraper = engine.KOHIScraperOptimized(base_url=args.base_url,
+                                                  course_budget=args.course_budget, hedge=hedge,
+                                                  profile=profile, browser_server=args.browser_server,
+                                                  projection=projection)
+            scraper.run(args.input, args.output, temp_file=args.temp, limit=args.limit,
+                        completed=completed, save_every=args.save_every, delay=args.delay,
+                        scheduler=scheduler)
+        else:
+            from kohi_governor import from_options
+            governor = from_options(args.workers, max_memory_mb=args.max_memory,
+                                    max_cpu=args.max_cpu, recycle_rss_mb=args.recycle_rss,
+                                    min_workers=args.min_workers)
+            engine.main(input_file=args.input, output_file=args.output, temp_file=args.temp,
+                        limit=args.limit, completed=completed, save_every=args.save_every,
+                        delay=args.delay, workers=args.workers, base_url=args.base_url,
+                        archive_file=args.archive, governor=governor,
+                        course_budget=args.course_budget, hedge=hedge, scheduler=scheduler,
+                        profile_dir=args.profile, trace_dir=args.trace_dir,
+                        browser_server=args.browser_server, projection=projection)
+
+        if args.download_assets and os.path.exists(args.output):
+            from kohi_assets import process_file
+            process_file(args.output, base_url=args.base_url, root=args.assets_dir,
+                         concurrency=args.assets_concurrency)
+    finally:
+        if hedge is not None:
+            hedge.close()
+        stop_metrics()
+    return 0
+
+
+def cmd_browserd(args):
+    """상주 브라우저 서버 실행/상태 확인/종료"""
+    import logging
+    import kohi_browserd
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return kohi_browserd.run(args)
+
+
+def _start_metrics(args):
+    """--metrics-port/--metrics-textfile 지정 시 메트릭 노출 시작"""
+    if args.metrics_port is None and not args.metrics_textfile:
+        return lambda: None
+    from kohi_metrics import start_exporters
+    return start_exporters(port=args.metrics_port, textfile=args.metrics_textfile,
+                           interval=args.metrics_interval)
+
+
+def cmd_resume(args):
+    """임시 저장 파일에서 이어서 스크래핑"""
+    return cmd_scrape(args, resume=True)
+
+
+def cmd_report(args):
+    """결과 CSV 리포트 출력"""
+    from kohi_report import report_file
+
+    path = args.path
+    if not path:
+        defaults = ENGINE_DEFAULTS[args.engine]
+        path = defaults['output'] if os.path.exists(defaults['output']) else defaults['temp']
+
+    if not os.path.exists(path):
+        print(f"결과 파일이 없습니다: {path}", file=sys.stderr)
+        return 1
+
+    print(f"📄 {path}")
+    for line in report_file(path, top_n=args.top):
+        print(line)
+    return 0
+
+
+def cmd_mock(args):
+    """로컬 대역 서버 실행"""
+    import logging
+    import kohi_mock_server
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return kohi_mock_server.serve_forever(args)
+
+
+def cmd_bench(args):
+    """대역 서버 대상 종단간 벤치마크"""
+    import kohi_bench
+    import kohi_logging
+    from kohi_io import first_column
+    from kohi_mock_server import mock_from_args
+
+    kohi_logging.setup_logging(args.log_file or None, level=args.log_level.upper())
+    course_names = first_column(args.input)[:args.limit]
+    worker_counts = [int(w) for w in str(args.workers).split(',') if w.strip()]
+
+    rows = kohi_bench.run_benchmark(course_names, worker_counts, mock_from_args(args),
+                                    delay=args.delay)
+    for line in kohi_bench.format_table(rows):
+        print(line)
+    if args.json:
+        kohi_bench.save_json(rows, args.json)
+    return 0
+
+
+def cmd_eval(args):
+    """검색 전략 오프라인 평가 (알려진 제목 색인 대상)"""
+    import logging
+    import kohi_eval
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    strategies = _split_list(args.strategies)
+    try:
+        lines = kohi_eval.run(args.input, records=args.records or ['scraped_ultimate_temp.csv'],
+                              titles=args.titles or [], strategies=strategies, match=args.match,
+                              limit=args.limit, json_file=args.json,
+                              show_failures=args.show_failures)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for line in lines:
+        print(line)
+    return 0
+
+
+def cmd_hedge(args):
+    """검색어 변형 동시 검색 후 변형별 채택률 출력 (HTTP 검색만, 브라우저 없음)"""
+    import logging
+    import kohi_hedge
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    lines = kohi_hedge.run(args.input, base_url=args.base_url, variants=_split_list(args.variants),
+                           limit=args.limit, threshold=args.threshold, timeout=args.timeout,
+                           concurrency=args.concurrency)
+    for line in lines:
+        print(line)
+    return 0
+
+
+def cmd_schedule(args):
+    """우선순위 처리 순서와 신호 출력"""
+    from kohi_io import first_column
+    from kohi_priority import preview
+
+    history = args.history or [p for p in ('scraped_ultimate_final.csv', 'scraped_ultimate_temp.csv')
+                               if os.path.exists(p)]
+    for line in preview(first_column(args.input), history, limit=args.limit):
+        print(line)
+    return 0
+
+
+def cmd_crawl(args):
+    """추천교육과정 간선을 따라 너비 우선으로 과정 수집"""
+    import kohi_crawl
+    import kohi_logging
+
+    kohi_logging.setup_logging(args.log_file or None, level=args.log_level.upper())
+    stop_metrics = _start_metrics(args)
+    try:
+        lines = kohi_crawl.run(args.input, base_url=args.base_url, records=args.records or [],
+                               depth=args.depth, concurrency=args.concurrency,
+                               max_courses=args.max_courses, limit=args.limit,
+                               output_file=args.output, edges_file=args.edges)
+    finally:
+        stop_metrics()
+    for line in lines:
+        print(line)
+    return 0
+
+
+def cmd_search(args):
+    """수집 결과 로컬 검색 서비스 (또는 --query로 한 번 검색)"""
+    import json
+    import logging
+    import kohi_search
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    paths = args.records or [ENGINE_DEFAULTS['ultimate']['output'], ENGINE_DEFAULTS['ultimate']['temp']]
+    if args.query is None:
+        return kohi_search.serve_forever(paths, args.port, args.host, args.refresh)
+
+    index = kohi_search.CourseIndex()
+    index.refresh(paths)
+    total, results = index.search(args.query, limit=args.limit)
+    print(json.dumps({'total': total, 'results': results}, ensure_ascii=False, indent=1))
+    return 0
+
+
+def cmd_normalize(args):
+    """결과 CSV에 타입 컬럼(날짜/인원/시간/교육비) 추가"""
+    import logging
+    from kohi_normalize import normalize_file
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    path = args.path or ENGINE_DEFAULTS['ultimate']['output']
+    if not os.path.exists(path):
+        print(f"결과 파일이 없습니다: {path}", file=sys.stderr)
+        return 1
+    normalize_file(path, args.output)
+    return 0
+
+
+def cmd_reextract(args):
+    """보관된 원본 HTML에서 현재 추출기로 결과 재생성 (사이트 접속 없음)"""
+    import kohi_logging
+    from kohi_archive import reextract
+
+    kohi_logging.setup_logging(args.log_file or None, level=args.log_level.upper())
+    if not os.path.exists(args.archive):
+        print(f"보관소가 없습니다: {args.archive}", file=sys.stderr)
+        return 1
+    reextract(args.archive, args.output, records_file=args.records, workers=args.workers)
+    return 0
+
+
+def cmd_assets(args):
+    """결과 CSV의 썸네일/첨부자료 다운로드"""
+    import kohi_logging
+    from kohi_assets import process_file
+
+    kohi_logging.setup_logging(args.log_file or None, level=args.log_level.upper())
+    path = args.path or ENGINE_DEFAULTS['ultimate']['output']
+    if not os.path.exists(path):
+        print(f"결과 파일이 없습니다: {path}", file=sys.stderr)
+        return 1
+
+    stats = process_file(path, output=args.output, base_url=args.base_url, root=args.dir,
+                         concurrency=args.concurrency, timeout=args.timeout)
+    return 1 if stats['failed'] else 0
+
+
+def cmd_watch(args):
+    """모집중 과정 신청현황 감시"""
+    import kohi_logging
+    import kohi_watch
+
+    kohi_logging.setup_logging(args.log_file or None, level=args.log_level.upper())
+    stop_metrics = _start_metrics(args)
+    try:
+        kohi_watch.watch(args.records, base_url=args.base_url, interval=args.interval,
+                         jsonl=args.jsonl, webhook=args.webhook, cycles=args.cycles,
+                         limit=args.limit, miss_limit=args.miss_limit)
+    finally:
+        stop_metrics()
+    return 0
+
+
+def _add_scrape_options(p):
+    """scrape/resume 공통 옵션"""
+    p.add_argument('--engine', choices=sorted(ENGINE_DEFAULTS), default='ultimate',
+                   help='스크래퍼 엔진 (기본: ultimate)')
+    p.add_argument('--input', help='입력 CSV (ultimate: work.csv, optimized: work_enhanced.csv)')
+    p.add_argument('--output', help='최종 결과 CSV')
+    p.add_argument('--temp', help='임시 저장 CSV (이어하기 기준 파일)')
+    p.add_argument('--log-file', help='로그 파일 (빈 문자열이면 콘솔만)')
+    p.add_argument('--log-format', choices=['json', 'text'], default='json',
+                   help='로그 파일 형식 (json: 한 줄 구조화 이벤트)')
+    p.add_argument('--log-level', default='info', help='로그 레벨 (debug/info/warning)')
+    p.add_argument('--debug-sample', type=float, default=0.05,
+                   help='필드 단위 디버그 로그 샘플링 비율 (0~1)')
+    p.add_argument('--metrics-port', type=int,
+                   help='Prometheus 메트릭 HTTP 포트 (127.0.0.1:PORT/metrics)')
+    p.add_argument('--metrics-textfile',
+                   help='node_exporter textfile collector용 .prom 파일 경로')
+    p.add_argument('--metrics-interval', type=float, default=15.0,
+                   help='textfile 갱신 주기(초)')
+    p.add_argument('--limit', type=int, help='앞에서부터 N개 과정만 처리 (테스트용)')
+    p.add_argument('--save-every', type=int, default=10, help='임시 저장 주기 (과정 수)')
+    p.add_argument('--delay', type=float, help='과정 사이 대기 시간(초)')
+    p.add_argument('--workers', type=int, default=1,
+                   help='동시 작업자(브라우저) 수 (ultimate 엔진, 리소스 예산을 주면 최대치)')
+    p.add_argument('--max-memory', type=float,
+                   help='playwright/chromium RSS 예산(MB), 넘으면 동시 작업자 수를 줄임')
+    p.add_argument('--max-cpu', type=float, help='playwright/chromium CPU 예산(코어 수)')
+    p.add_argument('--recycle-rss', type=float,
+                   help='작업자 하나의 드라이버+브라우저 RSS가 이 값(MB)을 넘으면 playwright 재시작')
+    p.add_argument('--min-workers', type=int, default=1, help='리소스 조절 시 최소 작업자 수')
+    p.add_argument('--hedge', action='store_true',
+                   help='원본/개선 검색어를 동시에 HTTP로 보내 맞는 결과를 먼저 준 검색어로 검색')
+    p.add_argument('--hedge-variants', default='original,advanced,basic',
+                   help='동시 검색할 변형 (쉼표 구분: original, advanced, basic)')
+    p.add_argument('--priority', action='store_true',
+                   help='입력 순서 대신 우선순위(모집상태, 신청 마감 임박, 변경 빈도, 실패 이력) 순으로 처리')
+    p.add_argument('--history', action='append',
+                   help='우선순위 신호로 쓸 이전 결과 CSV(오래된 것부터) 또는 watch 이벤트 JSONL '
+                        '(반복 가능, 기본: 출력/임시 파일)')
+    p.add_argument('--time-budget', type=float,
+                   help='전체 실행 시간 예산(초), 넘기면 남은 낮은 우선순위 과정은 제외 (--priority 포함)')
+    p.add_argument('--course-seconds', type=float, default=20.0,
+                   help='시간 예산 계산용 과정당 처리 시간 초기 추정치(초, 실행 중 실측으로 갱신)')
+    p.add_argument('--course-budget', type=float, default=60.0,
+                   help='과정당 전체 시간 예산(초), 넘으면 부분 결과를 남기고 마지막에 한 번 더 시도 (0: 무제한)')
+    p.add_argument('--base-url', default='https://edu.kohi.or.kr',
+                   help='대상 사이트 주소 (로컬 대역 서버 사용 시 http://127.0.0.1:8765)')
+    p.add_argument('--archive',
+                   help='카드/상세 원본 HTML 압축 보관소 (ultimate 엔진, reextract에서 사용)')
+    p.add_argument('--trace-dir',
+                   help='실패/부분 결과 과정의 최근 네트워크·콘솔 이벤트와 DOM을 HAR로 저장할 디렉터리 (ultimate 엔진)')
+    p.add_argument('--profile',
+                   help='실행 간 공유할 브라우저 프로필 디렉터리 (디스크 캐시/쿠키 유지, 사이트 자산 버전이 바뀌면 캐시 삭제)')
+    p.add_argument('--browser-server', nargs='?', const=BROWSERD_STATE_FILE,
+                   help='상주 브라우저 서버에 연결 (browserd 상태 파일 또는 ws:// 주소, 값 없이 쓰면 kohi_browserd.json, '
+                        '--profile과 함께 쓰면 무시)')
+    p.add_argument('--columns',
+                   help='필요한 출력 컬럼만 추출 (쉼표 구분, 끝에 *면 접두어, 예: 모집상태,검색결과_신청현황 -> '
+                        '상세 페이지 이동 생략, 설정 파일에서는 목록도 가능)')
+    p.add_argument('--download-assets', action='store_true',
+                   help='완료 후 썸네일/첨부자료를 받아 *_로컬 컬럼 추가')
+    p.add_argument('--assets-dir', default='assets', help='자산 저장 디렉터리')
+    p.add_argument('--assets-concurrency', type=int, default=8, help='동시 다운로드 수')
+
+
+def build_parser(config=None):
+    """명령행 파서 구성 (config 값은 각 하위 명령의 기본값이 됨)"""
+    config = config or {}
+    parser = argparse.ArgumentParser(prog='kohi', description='KOHI 교육과정 수집 도구')
+    parser.add_argument('--config', help=f'JSON 설정 파일 (기본: ./{DEFAULT_CONFIG_FILE})')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    p = subparsers.add_parser('enhance', help='검색어 개선 (work_enhanced.csv 생성)')
+    p.add_argument('--algorithm', choices=['advanced', 'basic'], default='advanced',
+                   help='advanced: AdvancedSearchEnhancer, basic: SearchTermEnhancer')
+    p.add_argument('--input', help='입력 CSV (기본: work.csv)')
+    p.add_argument('--output', help='출력 CSV (기본: work_enhanced.csv)')
+    p.add_argument('--memo', default='enhance_memo.json',
+                   help='교육명 -> 개선 검색어 메모 파일 (새로 추가/변경된 교육명만 다시 계산)')
+    p.add_argument('--no-memo', action='store_true', help='메모 없이 전체 다시 계산')
+    p.add_argument('--dictionary', default='segment_dictionary.json',
+                   help='붙여 쓴 단어 분리에 쓰는 고정 단어 사전 (없으면 알려진 교육명에서 모아 생성)')
+    p.add_argument('--rebuild-dictionary', action='store_true',
+                   help='단어 사전을 지금의 교육명/결과 CSV에서 다시 모음 (해당 알고리즘 메모 무효화)')
+    p.set_defaults(handler=cmd_enhance)
+
+    p = subparsers.add_parser('scrape', help='교육과정 스크래핑')
+    _add_scrape_options(p)
+    p.set_defaults(handler=cmd_scrape)
+
+    p = subparsers.add_parser('resume', help='임시 저장 파일에서 이어서 스크래핑')
+    _add_scrape_options(p)
+    p.set_defaults(handler=cmd_resume)
+
+    p = subparsers.add_parser('mock', help='로컬 KOHI 대역 서버 실행')
+    add_mock_arguments(p)
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--host', default='127.0.0.1')
+    p.set_defaults(handler=cmd_mock)
+
+    p = subparsers.add_parser('browserd', help='실행 간 재사용하는 상주 브라우저 서버 (Playwright 웹소켓)')
+    add_browserd_arguments(p)
+    p.set_defaults(handler=cmd_browserd)
+
+    p = subparsers.add_parser('bench', help='대역 서버 대상 종단간 부하 벤치마크')
+    add_mock_arguments(p)
+    p.add_argument('--workers', default='1,2,4', help='비교할 작업자 수 목록 (쉼표 구분)')
+    p.add_argument('--input', default='work.csv', help='검색할 교육과정명 CSV')
+    p.add_argument('--limit', type=int, default=20, help='측정에 쓸 과정 수')
+    p.add_argument('--delay', type=float, default=0.0, help='과정 사이 대기 시간(초)')
+    p.add_argument('--json', help='결과를 JSON으로 저장할 경로')
+    p.add_argument('--log-file', default='', help='로그 파일 (기본: 콘솔만)')
+    p.add_argument('--log-level', default='warning', help='로그 레벨')
+    p.set_defaults(handler=cmd_bench)
+
+    p = subparsers.add_parser('eval', help='검색어 전략 오프라인 평가 (성공률/요청 수/첫 결과 정답률)')
+    p.add_argument('--input', default='work.csv', help='평가할 교육명 CSV')
+    p.add_argument('--records', action='append',
+                   help='제목 색인/정답으로 쓸 스크래핑 결과 CSV (반복 가능, 기본: scraped_ultimate_temp.csv)')
+    p.add_argument('--titles', action='append',
+                   help='추가 제목 목록 (한 줄에 하나 또는 CSV 첫 컬럼, 책자에서 뽑은 목록 등, 반복 가능)')
+    p.add_argument('--strategies', default='original,basic,advanced', help='평가할 전략 (쉼표 구분)')
+    p.add_argument('--match', choices=['substring', 'and'], default='substring',
+                   help='substring: KOHI처럼 검색어 전체 부분 일치, and: 단어별 AND 일치')
+    p.add_argument('--limit', type=int, help='앞 N개 교육명만 평가')
+    p.add_argument('--show-failures', type=int, default=0, help='전략별 오답/실패 예시 N개 출력')
+    p.add_argument('--json', help='결과 JSON 저장 경로')
+    p.set_defaults(handler=cmd_eval)
+
+    p = subparsers.add_parser('hedge', help='검색어 변형 동시 검색, 변형별 채택률 (실서버/대역 서버)')
+    p.add_argument('--input', default='work.csv', help='교육명 CSV')
+    p.add_argument('--base-url', default='https://edu.kohi.or.kr')
+    p.add_argument('--variants', default='original,advanced,basic', help='변형 (쉼표 구분)')
+    p.add_argument('--limit', type=int, help='앞 N개 교육명만')
+    p.add_argument('--threshold', type=float, default=0.6,
+                   help='첫 카드 제목이 교육명 글자 바이그램을 이 비율 이상 포함하면 맞는 결과')
+    p.add_argument('--timeout', type=float, default=15.0, help='교육명당 대기 시간(초)')
+    p.add_argument('--concurrency', type=int, default=4, help='동시에 처리할 교육명 수')
+    p.set_defaults(handler=cmd_hedge)
+
+    p = subparsers.add_parser('schedule', help='우선순위 스케줄러의 처리 순서와 신호 미리보기')
+    p.add_argument('--input', default='work.csv', help='교육명 CSV')
+    p.add_argument('--history', action='append',
+                   help='이전 결과 CSV(오래된 것부터) 또는 watch 이벤트 JSONL (반복 가능, '
+                        '기본: scraped_ultimate_final.csv, scraped_ultimate_temp.csv)')
+    p.add_argument('--limit', type=int, default=30, help='출력할 순위 수')
+    p.set_defaults(handler=cmd_schedule)
+
+    p = subparsers.add_parser('crawl', help='추천교육과정 그래프 너비 우선 탐색 (work.csv 밖 과정 발견)')
+    p.add_argument('--input', default='work.csv', help='시드 교육명 CSV')
+    p.add_argument('--records', action='append',
+                   help='교육과정코드를 이미 아는 결과 CSV (해당 교육명은 검색 없이 시드로, 반복 가능)')
+    p.add_argument('--base-url', default='https://edu.kohi.or.kr')
+    p.add_argument('--depth', type=int, default=2, help='시드에서 따라갈 추천 단계 수')
+    p.add_argument('--concurrency', type=int, default=4, help='동시 요청 수')
+    p.add_argument('--max-courses', type=int, help='방문할 최대 과정 수 (시드 포함)')
+    p.add_argument('--limit', type=int, help='앞 N개 교육명만 시드로')
+    p.add_argument('--output', default='crawled_courses.csv', help='발견한 과정 CSV')
+    p.add_argument('--edges', default='crawl_edges.csv', help='추천 간선 CSV')
+    p.add_argument('--log-file', default='kohi_crawl.log', help='로그 파일')
+    p.add_argument('--log-level', default='info', help='로그 레벨')
+    p.add_argument('--metrics-port', type=int, help='Prometheus 메트릭 HTTP 포트')
+    p.add_argument('--metrics-textfile', help='node_exporter textfile 경로')
+    p.add_argument('--metrics-interval', type=float, default=15.0, help='textfile 갱신 주기(초)')
+    p.set_defaults(handler=cmd_crawl)
+
+    p = subparsers.add_parser('search', help='수집 결과 로컬 검색 서비스 (HTTP/JSON)')
+    p.add_argument('--records', action='append',
+                   help='색인할 결과 CSV (반복 가능, 기본: scraped_ultimate_final.csv, scraped_ultimate_temp.csv)')
+    p.add_argument('--port', type=int, default=8770)
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--refresh', type=float, default=10.0,
+                   help='결과 파일 변경 확인 주기(초, 바뀐 행만 다시 색인, 0이면 끔)')
+    p.add_argument('--query', help='서버 없이 한 번 검색해 JSON 출력')
+    p.add_argument('--limit', type=int, default=20, help='--query 결과 수')
+    p.set_defaults(handler=cmd_search)
+
+    p = subparsers.add_parser('normalize', help='결과 CSV 타입 정규화 (기간/신청현황/시간/교육비)')
+    p.add_argument('path', nargs='?', help='결과 CSV (기본: scraped_ultimate_final.csv)')
+    p.add_argument('--output', default='scraped_normalized.csv',
+                   help='출력 경로 (.parquet이면 타입 보존 Parquet)')
+    p.set_defaults(handler=cmd_normalize)
+
+    p = subparsers.add_parser('reextract', help='보관된 원본 HTML에서 결과 재생성 (오프라인, 병렬)')
+    p.add_argument('--archive', default='kohi_pages.db', help='원본 페이지 보관소')
+    p.add_argument('--output', default='scraped_reextracted.csv', help='결과 CSV')
+    p.add_argument('--records', help='행 순서/미보관 과정을 유지할 기존 결과 CSV')
+    p.add_argument('--workers', type=int, help='프로세스 수 (기본: CPU 수)')
+    p.add_argument('--log-file', default='', help='로그 파일 (기본: 콘솔만)')
+    p.add_argument('--log-level', default='info', help='로그 레벨')
+    p.set_defaults(handler=cmd_reextract)
+
+    p = subparsers.add_parser('assets', help='썸네일/첨부자료 다운로드 (내용 해시로 중복 제거)')
+    p.add_argument('path', nargs='?', help='결과 CSV (기본: scraped_ultimate_final.csv)')
+    p.add_argument('--output', help='로컬 경로 컬럼을 추가한 CSV (기본: 입력 파일 덮어쓰기)')
+    p.add_argument('--dir', default='assets', help='저장 디렉터리')
+    p.add_argument('--concurrency', type=int, default=8, help='동시 다운로드 수')
+    p.add_argument('--timeout', type=float, default=30.0, help='파일당 타임아웃(초)')
+    p.add_argument('--base-url', default='https://edu.kohi.or.kr', help='상대 경로 기준 주소')
+    p.add_argument('--log-file', default='', help='로그 파일 (기본: 콘솔만)')
+    p.add_argument('--log-level', default='info', help='로그 레벨')
+    p.set_defaults(handler=cmd_assets)
+
+    p = subparsers.add_parser('watch', help='모집중 과정 신청현황/모집상태 변화 감시')
+    p.add_argument('--records', default='scraped_ultimate_final.csv',
+                   help='감시 대상을 고를 결과 CSV (모집중 과정만 사용)')
+    p.add_argument('--interval', type=float, default=300.0, help='조회 주기(초)')
+    p.add_argument('--jsonl', default='watch_events.jsonl',
+                   help='변화 이벤트 JSONL 파일 (빈 문자열이면 기록 안 함)')
+    p.add_argument('--webhook', help='변화 이벤트를 POST할 주소')
+    p.add_argument('--cycles', type=int, default=0, help='반복 횟수 (0: 계속)')
+    p.add_argument('--limit', type=int, help='감시할 과정 수 상한')
+    p.add_argument('--miss-limit', type=int, default=3,
+                   help='카드가 연속 N회 안 보이면 감시 종료')
+    p.add_argument('--base-url', default='https://edu.kohi.or.kr')
+    p.add_argument('--log-file', default='kohi_watch.log', help='로그 파일')
+    p.add_argument('--log-level', default='info', help='로그 레벨')
+    p.add_argument('--metrics-port', type=int, help='Prometheus 메트릭 HTTP 포트')
+    p.add_argument('--metrics-textfile', help='node_exporter textfile 경로')
+    p.add_argument('--metrics-interval', type=float, default=15.0, help='textfile 갱신 주기(초)')
+    p.set_defaults(handler=cmd_watch)
+
+    p = subparsers.add_parser('report', help='결과 CSV 통계 출력')
+    p.add_argument('path', nargs='?', help='결과 CSV (기본: 엔진의 최종/임시 결과 파일)')
+    p.add_argument('--engine', choices=sorted(ENGINE_DEFAULTS), default='ultimate')
+    p.add_argument('--top', type=int, default=20, help='수집률 상위 필드 수')
+    p.set_defaults(handler=cmd_report)
+
+    # 설정 파일 값을 기본값으로 주입 (최상위 키 → 섹션 키 순으로 덮어씀)
+    for name, sub in subparsers.choices.items():
+        sub.add_argument('--config', help=argparse.SUPPRESS)
+        known = {action.dest for action in sub._actions}
+        values = {k: v for k, v in config.items() if not isinstance(v, dict) and k in known}
+        values.update({k: v for k, v in config.get(name, {}).items() if k in known})
+        sub.set_defaults(**values)
+
+    return parser
+
+
+def main(argv=None):
+    """명령행 진입점"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument('--config')
+    pre_args, _ = pre.parse_known_args(argv)
+
+    try:
+        config = load_config(pre_args.config)
+    except (OSError, ValueError) as e:
+        print(f"설정 파일 로드 실패: {e}", file=sys.stderr)
+        return 2
+
+    args = build_parser(config).parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
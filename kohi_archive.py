@@ -0,0 +1,291 @@
+"""
+KOHI 원본 페이지 보관소와 오프라인 재추출
+스크래핑 중 받은 검색 카드/상세 페이지 HTML을 압축해 SQLite 한 파일에 보관하고
+(교육과정코드, 가져온 시각 색인), 파서를 고친 뒤에는 사이트 재수집 없이
+보관된 HTML에 현재 추출기(kohi_spec)를 프로세스 풀로 다시 적용한다.
+
+- 압축: zstandard가 있으면 zstd + KOHI 페이지로 학습한 사전, 없으면 zlib + 공통 줄 사전
+- 처음 TRAIN_AFTER개 페이지가 쌓이면 사전을 학습하고 그때까지의 페이지도 다시 압축
+
+    python kohi.py scrape --archive kohi_pages.db
+    python kohi.py reextract --archive kohi_pages.db --records scraped_ultimate_final.csv
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE = 'kohi_pages.db'
+
+# zlib 사전은 창 크기(32KB)까지만 의미가 있음
+DICT_SIZE = 32 * 1024
+TRAIN_AFTER = 20
+TRAIN_SAMPLES = 200
+ZSTD_LEVEL = 19
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dicts (
+    id INTEGER PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    course TEXT,
+    course_name TEXT,
+    kind TEXT NOT NULL,
+    url TEXT,
+    fetched_at TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    dict_id INTEGER REFERENCES dicts(id),
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_course ON pages(course, kind, fetched_at);
+CREATE INDEX IF NOT EXISTS pages_name ON pages(course_name, kind, fetched_at);
+"""
+
+
+def default_codec():
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def compress(data, codec, dictionary=None):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd 보관소를 쓰려면 zstandard 패키지가 필요합니다")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(data)
+    compressor = (zlib.compressobj(9, zdict=dictionary) if dictionary
+                  else zlib.compressobj(9))
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(data, codec, dictionary=None):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd 보관소를 읽으려면 zstandard 패키지가 필요합니다")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def train_dictionary(samples, codec, size=DICT_SIZE):
+    """표본 페이지로 압축 사전 만들기"""
+    if codec == 'zstd':
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    # zlib: 표본 절반 이상에 나오는 줄(공통 레이아웃)을 모으되,
+    # 사전 끝에 가까울수록 짧게 참조되므로 가장 흔한 줄이 뒤에 오도록 배치
+    counts = Counter(line for sample in samples for line in set(sample.splitlines()))
+    threshold = max(2, len(samples) // 2)
+    picked = []
+    total = 0
+    for line, count in counts.most_common():
+        if count < threshold or total + len(line) + 1 > size:
+            break
+        picked.append(line)
+        total += len(line) + 1
+    return b'\n'.join(reversed(picked)) + b'\n'
+
+
+class PageArchive:
+    """압축 페이지 보관소 (스레드 안전, 작업자 스레드 여럿이 함께 기록)"""
+
+    def __init__(self, path=DEFAULT_ARCHIVE, codec=None, train_after=TRAIN_AFTER):
+        self.path = path
+        self.codec = codec or default_codec()
+        self.train_after = train_after
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._dicts = {}
+        self._current = self._latest_dict()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _dictionary(self, dict_id):
+        if dict_id is None:
+            return None
+        if dict_id not in self._dicts:
+            row = self._db.execute('SELECT codec, data FROM dicts WHERE id = ?', (dict_id,)).fetchone()
+            self._dicts[dict_id] = row[1]
+        return self._dicts[dict_id]
+
+    def _latest_dict(self):
+        row = self._db.execute('SELECT id FROM dicts WHERE codec = ? ORDER BY id DESC LIMIT 1',
+                               (self.codec,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, course, kind, html, url='', course_name='', fetched_at=None):
+        """페이지 한 개 보관 (kind: 'card' 또는 'detail')"""
+        raw = html.encode('utf-8')
+        fetched_at = fetched_at or datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            data = compress(raw, self.codec, self._dictionary(self._current))
+            self._db.execute(
+                'INSERT INTO pages (course, course_name, kind, url, fetched_at, codec, dict_id, size, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (course, course_name, kind, url, fetched_at, self.codec, self._current, len(raw), data))
+            self._db.commit()
+            if self._current is None:
+                pending = self._db.execute('SELECT COUNT(*) FROM pages WHERE dict_id IS NULL').fetchone()[0]
+                if pending >= self.train_after:
+                    self._train()
+
+    def _train(self):
+        """저장된 페이지로 사전을 학습하고, 사전 없이 저장된 페이지를 다시 압축"""
+        rows = self._db.execute('SELECT id, codec, dict_id, data FROM pages ORDER BY id DESC LIMIT ?',
+                                (TRAIN_SAMPLES,)).fetchall()
+        samples = [decompress(data, codec, self._dictionary(dict_id)) for _, codec, dict_id, data in rows]
+        try:
+            dictionary = train_dictionary(samples, self.codec)
+        except Exception as e:  # 표본이 너무 적거나 비슷하면 zstd 학습이 실패할 수 있음
+            logger.warning("압축 사전 학습 실패 (%s), 사전 없이 계속: %s", self.codec, e)
+            return
+        cursor = self._db.execute('INSERT INTO dicts (codec, data, created) VALUES (?, ?, ?)',
+                                  (self.codec, dictionary, datetime.now().isoformat(timespec='seconds')))
+        self._current = cursor.lastrowid
+        self._dicts[self._current] = dictionary
+
+        for page_id, codec, dict_id, data in self._db.execute(
+                'SELECT id, codec, dict_id, data FROM pages WHERE dict_id IS NULL').fetchall():
+            raw = decompress(data, codec)
+            self._db.execute('UPDATE pages SET codec = ?, dict_id = ?, data = ? WHERE id = ?',
+                             (self.codec, self._current,
+                              compress(raw, self.codec, dictionary), page_id))
+        self._db.commit()
+        logger.info("압축 사전 학습 완료: %s %d바이트 (표본 %d개)",
+                    self.codec, len(dictionary), len(samples))
+
+    def get(self, page_id):
+        """페이지 id -> HTML 문자열"""
+        with self._lock:
+            codec, dict_id, data = self._db.execute(
+                'SELECT codec, dict_id, data FROM pages WHERE id = ?', (page_id,)).fetchone()
+            dictionary = self._dictionary(dict_id)
+        return decompress(data, codec, dictionary).decode('utf-8')
+
+    def latest(self):
+        """과정명별 최신 카드/상세 페이지 {course_name: {'card': row, 'detail': row}}
+
+        row = (id, course, url, fetched_at)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT id, course, course_name, kind, url, fetched_at FROM pages '
+                'ORDER BY fetched_at, id').fetchall()
+        latest = {}
+        for page_id, course, course_name, kind, url, fetched_at in rows:
+            latest.setdefault(course_name or course, {})[kind] = (page_id, course, url, fetched_at)
+        return latest
+
+    def history(self, course):
+        """교육과정코드의 보관 이력 [(id, kind, fetched_at)]"""
+        with self._lock:
+            return self._db.execute('SELECT id, kind, fetched_at FROM pages WHERE course = ? '
+                                    'ORDER BY fetched_at', (course,)).fetchall()
+
+    def stats(self):
+        with self._lock:
+            pages, raw, stored = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM pages').fetchone()
+            dicts = self._db.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM dicts').fetchone()
+        return {'pages': pages, 'raw_bytes': raw, 'stored_bytes': stored + dicts[1],
+                'ratio': round(raw / (stored + dicts[1]), 1) if stored else 0.0,
+                'codec': self.codec, 'dictionaries': dicts[0]}
+
+
+# ---------------------------------------------------------------------------
+# 오프라인 재추출 (프로세스 풀)
+# ---------------------------------------------------------------------------
+
+_worker_archive = None
+
+
+def _init_worker(path):
+    global _worker_archive
+    _worker_archive = PageArchive(path)
+
+
+def _reextract_course(job):
+    """과정 하나: 보관된 카드/상세 HTML에 현재 명세 적용 (작업 프로세스에서 실행)"""
+    from kohi_html import parse_html, select
+    from kohi_scraper_ultimate import classify_result
+    from kohi_spec import CARD, CARD_SELECTOR, DETAIL
+
+    course_name, pages = job
+    card = pages.get('card')
+    detail = pages.get('detail')
+    fetched_at = (detail or card)[3]
+    result = {
+        '원본_교육과정명': course_name,
+        '스크래핑_시각': fetched_at.replace('T', ' '),
+    }
+    if card:
+        root = parse_html(_worker_archive.get(card[0]))
+        boxes = select(root, CARD_SELECTOR)
+        result.update(CARD.extract(boxes[0] if boxes else root))
+    if detail:
+        result['상세페이지_URL'] = detail[2]
+        result.update(DETAIL.extract(parse_html(_worker_archive.get(detail[0]))))
+        classify_result(result)
+    else:
+        result['스크래핑결과'] = '상세 링크 없음'
+    return result
+
+
+def reextract(archive_path, output_file, records_file=None, workers=None):
+    """보관소 전체 재추출 -> 결과 CSV
+
+    records_file을 주면 그 파일의 행 순서를 유지하고, 보관소에 있는 과정만 새 결과로 바꾼다.
+    """
+    from kohi_io import read_rows, write_rows
+    from kohi_tables import write_children
+    from kohi_report import format_report, summarize
+
+    archive = PageArchive(archive_path)
+    jobs = sorted(archive.latest().items())
+    logger.info("재추출: 과정 %d개, 보관소 %s", len(jobs), archive.stats())
+    archive.close()
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(archive_path,)) as pool:
+            fresh = list(pool.map(_reextract_course, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        _init_worker(archive_path)
+        fresh = [_reextract_course(job) for job in jobs]
+
+    if records_file and os.path.exists(records_file):
+        by_name = {row['원본_교육과정명']: row for row in fresh}
+        rows = [by_name.pop(row.get('원본_교육과정명'), row) for row in read_rows(records_file)]
+        rows.extend(by_name.values())
+    else:
+        rows = fresh
+
+    write_rows(output_file, rows)
+    write_children(output_file, rows)
+    for line in format_report(summarize(rows)):
+        logger.info(line)
+    logger.info("💾 재추출 결과: %s (%d개 과정 갱신)", output_file, len(fresh))
+    return rows
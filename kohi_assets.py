@@ -0,0 +1,175 @@
+"""
+KOHI 썸네일/첨부자료 다운로더
+결과 CSV의 썸네일_이미지, 다운로드_자료("제목: href, ...") URL을 실제 파일로 받아
+내용 해시(sha256) 기준으로 한 번만 저장하고, 로컬 경로를 *_로컬 컬럼에 기록한다.
+
+- asyncio 세마포어로 동시 다운로드 수 제한, 각 파일은 청크 단위로 스트리밍 저장
+- 저장 위치: assets/<해시 앞 2자리>/<해시><확장자> (같은 내용은 한 파일)
+- assets/index.json에 URL -> 경로를 기록해 이미 받은 URL은 다시 요청하지 않음
+
+    python kohi.py assets scraped_ultimate_final.csv --dir assets --concurrency 8
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+from kohi_io import read_rows, write_rows
+from kohi_metrics import RUN as metrics
+
+logger = logging.getLogger(__name__)
+
+# 원본 컬럼 -> 로컬 경로 컬럼
+ASSET_COLUMNS = {
+    '썸네일_이미지': '썸네일_이미지_로컬',
+    '다운로드_자료': '다운로드_자료_로컬',
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# "제목: href" 항목에서 href 부분 (href에는 공백이 없음)
+DOWNLOAD_HREF = re.compile(r':\s(\S+?)(?=,\s|$)')
+
+
+def asset_urls(row, base_url):
+    """한 행에서 (컬럼, 절대 URL) 목록 추출 (javascript: 등 받을 수 없는 링크 제외)"""
+    found = []
+    thumb = (row.get('썸네일_이미지') or '').strip()
+    if thumb:
+        found.append(('썸네일_이미지', urljoin(base_url, thumb)))
+    for href in DOWNLOAD_HREF.findall(row.get('다운로드_자료') or ''):
+        url = urljoin(base_url, href)
+        if urlsplit(url).scheme in ('http', 'https'):
+            found.append(('다운로드_자료', url))
+    return found
+
+
+class AssetStore:
+    """내용 주소 기반 저장소 (URL 색인 포함)"""
+
+    def __init__(self, root='assets'):
+        self.root = root
+        self.index_file = os.path.join(root, 'index.json')
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        try:
+            with open(self.index_file, encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def lookup(self, url):
+        """이미 받은 URL이면 로컬 경로, 아니면 None (파일이 지워졌으면 다시 받음)"""
+        path = self.index.get(url)
+        if path and os.path.exists(os.path.join(self.root, path)):
+            return path
+        return None
+
+    def fetch(self, url, timeout=30.0):
+        """URL을 청크 단위로 임시 파일에 받으며 해시 계산 후 내용 주소로 이동"""
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            request = Request(url, headers={'User-Agent': 'Mozilla/5.0 (kohi-assets)'})
+            with os.fdopen(fd, 'wb') as out, urlopen(request, timeout=timeout) as response:
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    metrics.fetched_bytes.inc(len(chunk))
+
+            name = digest.hexdigest()
+            ext = os.path.splitext(urlsplit(url).path)[1].lower()[:8]
+            path = os.path.join(name[:2], name + ext)
+            target = os.path.join(self.root, path)
+            with self._lock:
+                if os.path.exists(target):
+                    os.remove(tmp)
+                    shared = True
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(tmp, target)
+                    shared = False
+                self.index[url] = path
+            return path, shared
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def save_index(self):
+        tmp = self.index_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_file)
+
+
+async def _download_all(urls, store, concurrency, timeout):
+    """URL 집합을 동시 concurrency개까지 다운로드 -> {url: 경로 또는 None}"""
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {'cached': 0, 'downloaded': 0, 'shared': 0, 'failed': 0}
+    paths = {}
+
+    async def one(url):
+        cached = store.lookup(url)
+        if cached:
+            stats['cached'] += 1
+            paths[url] = cached
+            return
+        async with semaphore:
+            try:
+                path, shared = await asyncio.to_thread(store.fetch, url, timeout)
+            except Exception as e:
+                stats['failed'] += 1
+                logger.warning("  다운로드 실패 (%s): %s", url, e)
+                paths[url] = None
+                return
+        stats['shared' if shared else 'downloaded'] += 1
+        paths[url] = path
+
+    await asyncio.gather(*(one(url) for url in urls))
+    return paths, stats
+
+
+def download_assets(rows, base_url="https://edu.kohi.or.kr", root='assets',
+                    concurrency=8, timeout=30.0):
+    """행마다 자산을 받아 *_로컬 컬럼(여러 개면 '; '로 연결) 추가, 통계 반환"""
+    store = AssetStore(root)
+    per_row = [asset_urls(row, base_url) for row in rows]
+    unique = list(dict.fromkeys(url for found in per_row for _, url in found))
+    logger.info("자산 다운로드: URL %d개 (고유), 동시 %d개", len(unique), concurrency)
+
+    paths, stats = asyncio.run(_download_all(unique, store, concurrency, timeout))
+    store.save_index()
+
+    for row, found in zip(rows, per_row):
+        local = {}
+        for column, url in found:
+            if paths.get(url):
+                local.setdefault(ASSET_COLUMNS[column], []).append(
+                    os.path.join(root, paths[url]))
+        for column in ASSET_COLUMNS.values():
+            row[column] = '; '.join(local.get(column, []))
+
+    logger.info("자산 다운로드 완료: 신규 %(downloaded)d, 중복 내용 %(shared)d, "
+                "기존 %(cached)d, 실패 %(failed)d", stats)
+    return stats
+
+
+def process_file(path, output=None, base_url="https://edu.kohi.or.kr", root='assets',
+                 concurrency=8, timeout=30.0):
+    """결과 CSV에 로컬 경로 컬럼을 추가해 저장 (output 미지정 시 같은 파일)"""
+    rows = read_rows(path)
+    stats = download_assets(rows, base_url=base_url, root=root,
+                            concurrency=concurrency, timeout=timeout)
+    write_rows(output or path, rows)
+    return stats
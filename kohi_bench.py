@@ -0,0 +1,128 @@
+"""
+KOHI 종단간 부하 벤치마크
+로컬 대역 서버(kohi_mock_server)를 띄우고 실제 스크래퍼(run_scrape)를 작업자 수별로
+실행해 처리량(과정/분), 과정당 지연 분위수, 메모리 최대치를 비교한다.
+
+    python kohi.py bench --workers 1,2,4,8 --limit 40 --latency 0.3 --jitter 0.2
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from kohi_metrics import browser_rss_bytes, process_rss
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, pct):
+    """최근접 순위 방식 분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class PeakMemorySampler:
+    """실행 중 브라우저/파이썬 프로세스 RSS 최대치 추적 (백그라운드 스레드)"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak_browser = 0
+        self.peak_python = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak_browser = max(self.peak_browser, browser_rss_bytes())
+        self.peak_python = max(self.peak_python, process_rss(os.getpid()))
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._loop, name='kohi-bench-mem', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def bench_once(course_names, workers, search_url, workdir, delay=0.0):
+    """작업자 수 하나에 대한 측정"""
+    from kohi_scraper_ultimate import run_scrape
+
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def on_result(result, seconds):
+        with lock:
+            latencies.append(seconds)
+            statuses[(result.get('스크래핑결과') or '').split(':')[0]] += 1
+
+    output = os.path.join(workdir, f'bench_w{workers}.csv')
+    with PeakMemorySampler() as mem:
+        start = time.perf_counter()
+        run_scrape(course_names, output_file=output, temp_file=None, delay=delay,
+                   workers=workers, search_url=search_url, on_result=on_result)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'workers': workers,
+        'courses': len(latencies),
+        'elapsed_s': round(elapsed, 2),
+        'courses_per_min': round(len(latencies) / elapsed * 60, 2) if elapsed else 0.0,
+        'p50_s': round(percentile(latencies, 50), 2),
+        'p95_s': round(percentile(latencies, 95), 2),
+        'p99_s': round(percentile(latencies, 99), 2),
+        'max_s': round(max(latencies), 2) if latencies else 0.0,
+        'peak_browser_rss_mb': round(mem.peak_browser / 2**20, 1),
+        'peak_python_rss_mb': round(mem.peak_python / 2**20, 1),
+        'results': dict(statuses),
+    }
+
+
+def run_benchmark(course_names, worker_counts, mock, delay=0.0, workdir=None):
+    """대역 서버를 띄운 상태에서 작업자 수별로 반복 측정"""
+    from kohi_mock_server import search_url as mock_search_url
+
+    base_url = mock.start()
+    logger.info("대역 서버: %s (교육과정 %d개)", base_url, len(mock.catalog))
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+            for workers in worker_counts:
+                logger.info("벤치마크: 작업자 %d개, 과정 %d개", workers, len(course_names))
+                rows.append(bench_once(course_names, workers, mock_search_url(base_url),
+                                       tmp, delay=delay))
+    finally:
+        mock.stop()
+    return rows
+
+
+def format_table(rows):
+    """결과 표 (콘솔 출력용)"""
+    header = (f"{'작업자':>6} {'과정':>5} {'과정/분':>8} {'p50(s)':>7} {'p95(s)':>7} "
+              f"{'p99(s)':>7} {'브라우저MB':>10} {'파이썬MB':>8}  결과")
+    lines = [header, '-' * len(header)]
+    for r in rows:
+        outcome = ', '.join(f'{k}:{v}' for k, v in r['results'].items())
+        lines.append(f"{r['workers']:>6} {r['courses']:>5} {r['courses_per_min']:>8} "
+                     f"{r['p50_s']:>7} {r['p95_s']:>7} {r['p99_s']:>7} "
+                     f"{r['peak_browser_rss_mb']:>10} {r['peak_python_rss_mb']:>8}  {outcome}")
+    return lines
+
+
+def save_json(rows, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,389 @@
+"""
+KOHI 브라우저 서버 (실행 간 재사용하는 상주 chromium)
+스크래퍼/테스트를 실행할 때마다 chromium을 새로 띄우는 대신, chromium을 한 번 띄워 둔 로컬 데몬에
+Playwright 웹소켓(connect)으로 붙는다. 붙는 데는 수십 ms면 충분하고 브라우저 시작 비용은 데몬이 한 번만 낸다.
+
+    python kohi.py browserd --detach            # 백그라운드 시작 (준비되면 반환)
+    python kohi.py scrape --browser-server      # kohi_browserd.json의 서버에 연결
+    KOHI_BROWSER_SERVER=kohi_browserd.json python test_optimized_scraper.py
+    python kohi.py browserd --status            # 연결 시간/브라우저 버전 확인
+    python kohi.py browserd --stop
+
+- Python Playwright에는 launch_server가 없으므로, playwright 패키지에 들어 있는 node 드라이버로
+  chromium.launchServer()를 실행하고 Python 쪽은 chromium.connect(wsEndpoint)로 붙는다
+- 상태 파일(kohi_browserd.json)에 웹소켓 주소와 데몬 pid를 기록, 클라이언트는 이 파일로 서버를 찾는다
+- 실행 중인 클라이언트는 '{상태 파일}.leases/' 아래에 임대 파일을 두고, 임대가 하나도 없는 채로
+  --idle초가 지나면 데몬이 스스로 종료한다 (죽은 프로세스의 임대는 무시)
+- 데몬은 --health-interval초마다 node 프로세스와 웹소켓 포트를 확인해 응답이 없으면 서버를 다시 띄운다
+- 서버에 붙지 못하면 클라이언트는 경고만 남기고 예전처럼 브라우저를 직접 띄운다
+"""
+
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+from kohi_options import (BROWSERD_HEALTH_INTERVAL, BROWSERD_IDLE_SECONDS, BROWSERD_STATE_FILE,
+                          add_browserd_arguments)
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = BROWSERD_STATE_FILE
+
+# 상태 파일 경로 또는 ws:// 주소 (테스트 스크립트 등 옵션을 넘길 수 없는 실행용)
+ENV_VAR = 'KOHI_BROWSER_SERVER'
+
+IDLE_SECONDS = BROWSERD_IDLE_SECONDS
+
+HEALTH_INTERVAL = BROWSERD_HEALTH_INTERVAL
+
+CONNECT_TIMEOUT_MS = 5000
+
+# 서버 chromium 실행 옵션 (스크래퍼가 직접 띄울 때와 같게)
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+# node 드라이버에서 실행하는 서버 (argv: playwright-core 경로, 옵션 JSON)
+_SERVER_JS = r"""
+const { chromium } = require(process.argv[1]);
+const options = JSON.parse(process.argv[2]);
+chromium.launchServer(options).then(server => {
+  process.stdout.write(JSON.stringify({ wsEndpoint: server.wsEndpoint() }) + '\n');
+  const close = () => server.close().finally(() => process.exit(0));
+  // 감독 프로세스가 죽으면(stdin 닫힘) 브라우저도 정리
+  process.stdin.on('end', close);
+  process.stdin.resume();
+  process.on('SIGTERM', close);
+  process.on('SIGINT', close);
+}).catch(e => {
+  process.stderr.write(String(e && e.message || e) + '\n');
+  process.exit(1);
+});
+"""
+
+
+def _driver():
+    """(node 실행 파일, playwright-core 패키지 디렉터리)"""
+    from playwright._impl._driver import compute_driver_executable
+
+    driver = compute_driver_executable()
+    if isinstance(driver, tuple):          # 최근 버전: (node, package/cli.js)
+        node, cli = driver
+        return node, os.path.dirname(cli)
+    # 예전 버전: driver/playwright.sh 옆에 node와 package/
+    base = os.path.dirname(driver)
+    node = os.path.join(base, 'node')
+    return (node if os.path.exists(node) else shutil.which('node')), os.path.join(base, 'package')
+
+
+def _alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def lease_dir(state_file):
+    return f'{state_file}.leases'
+
+
+def read_state(state_file=STATE_FILE):
+    """실행 중인 데몬의 상태 (파일이 없거나 데몬이 죽었으면 None)"""
+    try:
+        with open(state_file, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _alive(state.get('pid')):
+        return None
+    state['state_file'] = state_file
+    return state
+
+
+class BrowserDaemon:
+    """chromium 서버 감독 프로세스 (상태 파일 기록, 상태 확인, 유휴 종료)"""
+
+    def __init__(self, state_file=STATE_FILE, host='127.0.0.1', port=0, idle=IDLE_SECONDS,
+                 headless=True, health_interval=HEALTH_INTERVAL, args=None):
+        self.state_file = state_file
+        self.host = host
+        self.port = port
+        self.idle = idle
+        self.headless = headless
+        self.health_interval = health_interval
+        self.args = list(LAUNCH_ARGS if args is None else args)
+        # 다시 띄워도 클라이언트가 가진 주소가 그대로 맞도록 경로를 고정
+        self.ws_path = f'/{uuid.uuid4().hex}'
+        self.endpoint = None
+        self.restarts = 0
+        self._proc = None
+        self._stop = threading.Event()
+
+    def _spawn(self):
+        node, package = _driver()
+        options = {'headless': self.headless, 'args': self.args, 'host': self.host,
+                   'port': self.port, 'wsPath': self.ws_path}
+        self._proc = subprocess.Popen([node, '-e', _SERVER_JS, package, json.dumps(options)],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE, text=True)
+        line = self._proc.stdout.readline()
+        if not line:
+            error = self._proc.stderr.read().strip()
+            self._proc.wait()
+            raise RuntimeError(f"브라우저 서버 시작 실패: {error or self._proc.returncode}")
+        self.endpoint = json.loads(line)['wsEndpoint']
+        # 포트 0이면 node가 고른 포트로 고정 (경로와 함께 재시작해도 같은 주소)
+        self.port = urlparse(self.endpoint).port
+        _write_json(self.state_file, {
+            'ws_endpoint': self.endpoint, 'pid': os.getpid(), 'server_pid': self._proc.pid,
+            'started': datetime.now().isoformat(timespec='seconds'), 'restarts': self.restarts,
+            'idle_seconds': self.idle})
+        logger.info("브라우저 서버 시작: %s (pid %d)", self.endpoint, self._proc.pid)
+
+    def _kill(self):
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def healthy(self):
+        """node 프로세스가 살아 있고 웹소켓 포트가 연결을 받는지"""
+        if self._proc is None or self._proc.poll() is not None:
+            return False
+        try:
+            with socket.create_connection((self.host, self.port), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    def active_leases(self):
+        """살아 있는 클라이언트의 임대 수 (죽은 프로세스의 임대 파일은 지움)"""
+        directory = lease_dir(self.state_file)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return 0
+        active = 0
+        for name in names:
+            if _alive(name.split('-', 1)[0]):
+                active += 1
+            else:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+        return active
+
+    def serve(self):
+        """서버를 띄우고 유휴 시간 초과/종료 신호까지 감독"""
+        self._spawn()
+        idle_since = time.monotonic()
+        try:
+            while not self._stop.wait(self.health_interval):
+                if not self.healthy():
+                    self.restarts += 1
+                    logger.warning("브라우저 서버 응답 없음, 다시 시작 (%d회째)", self.restarts)
+                    self._kill()
+                    self._spawn()
+                if self.active_leases():
+                    idle_since = time.monotonic()
+                elif self.idle and time.monotonic() - idle_since >= self.idle:
+                    logger.info("브라우저 서버 유휴 %.0f초, 종료", self.idle)
+                    break
+        finally:
+            self.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self._kill()
+        state = read_state(self.state_file)
+        if state is not None and state.get('pid') == os.getpid():
+            try:
+                os.remove(self.state_file)
+            except OSError:
+                pass
+
+
+def resolve(server=None):
+    """서버 지정(상태 파일 경로 또는 ws:// 주소, None이면 환경 변수) -> 상태 dict, 쓸 서버가 없으면 None"""
+    server = server or os.environ.get(ENV_VAR)
+    if not server:
+        return None
+    if server.startswith(('ws://', 'wss://')):
+        return {'ws_endpoint': server}
+    state = read_state(server)
+    if state is None:
+        logger.warning("브라우저 서버가 실행 중이 아님 (%s), 브라우저를 직접 띄움", server)
+    return state
+
+
+@contextmanager
+def lease(state):
+    """실행하는 동안 데몬이 유휴 종료하지 않도록 임대 (state가 None이거나 ws:// 직접 지정이면 아무것도 안 함)"""
+    state_file = (state or {}).get('state_file')
+    if not state_file:
+        yield
+        return
+    directory = lease_dir(state_file)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{os.getpid()}-{uuid.uuid4().hex[:8]}')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(' '.join(sys.argv))
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def launch(playwright, state=None, **options):
+    """서버에 연결한 Browser (state가 없거나 연결 실패면 options로 직접 띄움)
+
+    연결한 Browser의 close()는 이 클라이언트가 만든 컨텍스트만 닫고 서버 chromium은 남긴다.
+    """
+    if state:
+        try:
+            return playwright.chromium.connect(state['ws_endpoint'], timeout=CONNECT_TIMEOUT_MS)
+        except Exception as e:
+            logger.warning("브라우저 서버 연결 실패 (%s), 브라우저를 직접 띄움: %s",
+                           state['ws_endpoint'], e)
+    return playwright.chromium.launch(**options)
+
+
+def status(state_file=STATE_FILE):
+    """연결해서 확인한 서버 상태 dict (실행 중이 아니면 running=False)"""
+    state = read_state(state_file)
+    if state is None:
+        return {'running': False, 'state_file': state_file}
+    from playwright.sync_api import sync_playwright
+
+    info = dict(state, running=True)
+    with sync_playwright() as p:
+        start = time.perf_counter()
+        try:
+            browser = p.chromium.connect(state['ws_endpoint'], timeout=CONNECT_TIMEOUT_MS)
+        except Exception as e:
+            info.update(healthy=False, error=str(e))
+            return info
+        info['connect_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        info['version'] = browser.version
+        browser.close()
+    info['healthy'] = True
+    leases = lease_dir(state_file)
+    info['leases'] = len(os.listdir(leases)) if os.path.isdir(leases) else 0
+    return info
+
+
+def stop(state_file=STATE_FILE, timeout=15.0):
+    """실행 중인 데몬 종료 (종료했으면 True)"""
+    state = read_state(state_file)
+    if state is None:
+        return False
+    os.kill(state['pid'], signal.SIGTERM)
+    end = time.monotonic() + timeout
+    while time.monotonic() < end and _alive(state['pid']):
+        time.sleep(0.2)
+    return not _alive(state['pid'])
+
+
+def detach(argv, state_file=STATE_FILE, timeout=60.0):
+    """데몬을 백그라운드 프로세스로 띄우고 상태 파일이 생길 때까지 대기 (상태 dict 반환)"""
+    state = read_state(state_file)
+    if state is not None:
+        return state
+    log = open(f'{os.path.splitext(state_file)[0]}.log', 'a', encoding='utf-8')
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__)] + list(argv),
+                            stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                            start_new_session=True)
+    log.close()
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        state = read_state(state_file)
+        if state is not None and state.get('pid') == proc.pid:
+            return state
+        if proc.poll() is not None:
+            raise RuntimeError(f"브라우저 서버 시작 실패 (로그: {log.name})")
+        time.sleep(0.2)
+    raise RuntimeError(f"브라우저 서버 시작 대기 시간 초과 (로그: {log.name})")
+
+
+def _serve_argv(args):
+    return ['--state', args.state, '--host', args.host, '--port', str(args.port),
+            '--idle', str(args.idle), '--health-interval', str(args.health_interval)] + \
+           (['--headed'] if args.headed else [])
+
+
+def run(args):
+    """browserd 명령 실행"""
+    if args.status:
+        print(json.dumps(status(args.state), ensure_ascii=False, indent=1))
+        return 0
+    if args.stop:
+        if not stop(args.state):
+            print(f"실행 중인 브라우저 서버가 없습니다: {args.state}", file=sys.stderr)
+            return 1
+        return 0
+    if args.detach:
+        try:
+            state = detach(_serve_argv(args), args.state)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(state['ws_endpoint'])
+        return 0
+
+    if read_state(args.state) is not None:
+        print(f"이미 실행 중입니다: {args.state}", file=sys.stderr)
+        return 1
+    daemon = BrowserDaemon(args.state, host=args.host, port=args.port, idle=args.idle,
+                           headless=not args.headed, health_interval=args.health_interval)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='KOHI 브라우저 서버 (실행 간 chromium 재사용)')
+    add_browserd_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,17 @@
+"""
+KOHI 검색 결과 카드 HTML 파서 (브라우저 없이)
+검색 페이지 HTML 문자열에서 카드를 찾아 스크래퍼와 같은 추출 명세(kohi_spec.CARD)로 읽는다.
+"""
+
+from kohi_html import parse_html, select
+from kohi_spec import CARD, CARD_SELECTOR
+
+
+def parse_card(box):
+    """카드 노드 하나를 extract_search_result_info()와 같은 형태로 변환"""
+    return CARD.extract(box)
+
+
+def parse_cards(markup):
+    """검색 페이지 HTML에서 모든 카드 정보 추출"""
+    return [parse_card(box) for box in select(parse_html(markup), CARD_SELECTOR)]
@@ -0,0 +1,212 @@
+"""
+KOHI 추천교육과정 그래프 탐색 (crawl 모드)
+상세 페이지의 추천교육과정 표를 간선으로 보고 work.csv 교육명(시드)에서 너비 우선으로 넓혀 가며,
+수동으로 관리하는 제목 목록 없이 카탈로그를 수집한다.
+
+    python kohi.py crawl --input work.csv --depth 2 --concurrency 4
+    python kohi.py crawl --records scraped_ultimate_final.csv --depth 3   # 이미 코드를 아는 시드
+
+- 브라우저 없이 HTTP(검색 POST, 상세 페이지 POST)와 공용 추출 명세(kohi_spec.DETAIL)로 읽음
+- 탐색 대기열은 교육과정코드로 중복 제거, 깊이별로 동시 concurrency개씩 방문
+- 시드는 깊이 0, 추천으로 처음 발견된 과정은 (발견한 과정 깊이 + 1), depth를 넘는 과정은 방문하지 않음
+- --max-courses는 시드를 포함한 방문 과정 수 상한 (시드가 더 많으면 앞쪽 시드만 방문)
+  (방문한 과정의 추천 간선은 대상이 깊이 제한 밖이어도 모두 기록)
+- 결과: 발견한 과정 CSV(상세 필드 + 탐색_깊이/발견_경로)와 추천 간선 CSV
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from kohi_io import first_column, read_rows, write_rows
+from kohi_logging import log_event, stage
+from kohi_metrics import RUN as metrics
+from kohi_tables import write_children
+
+logger = logging.getLogger(__name__)
+
+COURSES_FILE = 'crawled_courses.csv'
+EDGES_FILE = 'crawl_edges.csv'
+
+DEFAULT_DEPTH = 2
+
+EDGE_COLUMNS = ['출발_교육과정코드', '출발_과정명', '도착_교육과정코드', '도착_교육그룹코드',
+                '도착_과정명', '출발_깊이']
+
+
+def parse_recommendations(value) -> List[dict]:
+    """추천교육과정 컬럼(JSON 목록) -> 교육과정코드가 있는 추천 행 ('없음'/링크 없는 행은 제외)"""
+    try:
+        items = json.loads(value or '[]')
+    except ValueError:
+        return []
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict) and item.get('교육과정코드')]
+
+
+def record_seeds(paths) -> Dict[str, dict]:
+    """이전 스크래핑 결과에서 교육명 -> {'code', 'group'} (검색 없이 바로 방문할 시드)"""
+    seeds = {}
+    for path in paths:
+        for row in read_rows(path):
+            code, group = row.get('교육과정코드'), row.get('교육그룹코드')
+            name = row.get('원본_교육과정명') or row.get('검색결과_제목')
+            if code and group and name:
+                seeds.setdefault(name, {'code': code, 'group': group})
+    return seeds
+
+
+class RecommendationCrawler:
+    """추천교육과정 간선을 따라가는 너비 우선 탐색"""
+
+    def __init__(self, base_url="https://edu.kohi.or.kr", max_depth=DEFAULT_DEPTH, concurrency=4,
+                 max_courses=None, timeout=15.0):
+        self.base_url = base_url
+        self.max_depth = max_depth
+        self.concurrency = max(1, concurrency)
+        self.max_courses = max_courses
+        self.timeout = timeout
+        self.courses = []       # 방문한 과정 행 (방문 순서)
+        self.edges = []         # 추천 간선 행
+        self.unresolved = []    # 검색으로 코드를 찾지 못한 시드 교육명
+        self._local = threading.local()
+        self._fetchers = []
+        self._lock = threading.Lock()
+
+    def _fetcher(self):
+        """스레드마다 연결 하나 (keep-alive 재사용)"""
+        from kohi_watch import CardFetcher
+
+        fetcher = getattr(self._local, 'fetcher', None)
+        if fetcher is None:
+            fetcher = self._local.fetcher = CardFetcher(self.base_url, timeout=self.timeout)
+            with self._lock:
+                self._fetchers.append(fetcher)
+        return fetcher
+
+    def close(self):
+        for fetcher in self._fetchers:
+            fetcher.close()
+
+    def resolve(self, course_name) -> Optional[dict]:
+        """교육명 검색 후 제목이 맞는 카드의 코드 (현재 결과 페이지에 없으면 다음 페이지, 끝까지 없으면 None)"""
+        from kohi_hedge import MATCH_THRESHOLD
+        from kohi_paging import find_matching_cards
+
+        try:
+            pages = ([c for c in cards if c.get('교육과정코드') and c.get('교육그룹코드')]
+                     for cards in self._fetcher().pages(course_name))
+            best, _, score = find_matching_cards(pages, course_name)
+        except Exception as e:
+            logger.warning("  시드 검색 실패 (%s): %s", course_name, e)
+            return None
+        if best is None or score < MATCH_THRESHOLD:
+            return None
+        return {'code': best['교육과정코드'], 'group': best['교육그룹코드']}
+
+    def visit(self, node) -> dict:
+        """상세 페이지 하나를 읽어 결과 행으로 (실패하면 '오류: ...' 행)"""
+        from kohi_html import parse_html
+        from kohi_scraper_ultimate import classify_result
+        from kohi_spec import DETAIL
+
+        row = {'교육과정코드': node['code'], '교육그룹코드': node['group'],
+               '탐색_깊이': node['depth'], '발견_경로': node['via']}
+        if node.get('name'):
+            row['원본_교육과정명'] = node['name']
+        with stage(logger, 'crawl', course=node['code'], depth=node['depth']):
+            try:
+                html = self._fetcher().detail_html(node['code'], node['group'])
+                row.update(DETAIL.extract(parse_html(html)))
+                classify_result(row)
+            except Exception as e:
+                logger.warning("  상세 페이지 실패 (%s): %s", node['code'], e)
+                row['스크래핑결과'] = f'오류: {str(e)[:100]}'
+        metrics.course_finished(row.get('스크래핑결과'))
+        return row
+
+    def crawl(self, seeds: List[dict]):
+        """seeds: [{'code', 'group', 'name'}] -> 깊이별로 방문하며 과정/간선 수집"""
+        seen = set()
+        frontier = []
+        for seed in seeds:
+            if self.max_courses and len(seen) >= self.max_courses:
+                logger.info("시드 %d개 중 %d개만 방문 (--max-courses)", len(seeds), len(frontier))
+                break
+            if seed['code'] not in seen:
+                seen.add(seed['code'])
+                frontier.append(dict(seed, depth=0, via='시드'))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='kohi-crawl') as pool:
+            depth = 0
+            while frontier:
+                logger.info("깊이 %d: %d개 과정 방문", depth, len(frontier))
+                next_frontier = []
+                for row in pool.map(self.visit, frontier):
+                    self.courses.append(row)
+                    source = row['교육과정코드']
+                    for reco in parse_recommendations(row.get('추천교육과정')):
+                        code = reco['교육과정코드']
+                        self.edges.append({
+                            '출발_교육과정코드': source,
+                            '출발_과정명': row.get('교육과정명', ''),
+                            '도착_교육과정코드': code,
+                            '도착_교육그룹코드': reco.get('교육그룹코드', ''),
+                            '도착_과정명': reco.get('과정명', ''),
+                            '출발_깊이': depth,
+                        })
+                        if code in seen or depth >= self.max_depth or not reco.get('교육그룹코드'):
+                            continue
+                        if self.max_courses and len(seen) >= self.max_courses:
+                            continue
+                        seen.add(code)
+                        next_frontier.append({'code': code, 'group': reco['교육그룹코드'],
+                                              'depth': depth + 1, 'via': source})
+                log_event(logger, 'crawl_level', depth=depth, visited=len(frontier),
+                          discovered=len(next_frontier), edges=len(self.edges))
+                frontier = next_frontier
+                depth += 1
+        return self.courses, self.edges
+
+    def seeds(self, course_names, known=None) -> List[dict]:
+        """교육명 -> 시드 (known에 있으면 그 코드, 없으면 검색, 찾지 못한 교육명은 unresolved)"""
+        known = known or {}
+        missing = [name for name in course_names if name not in known]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            found = dict(zip(missing, pool.map(self.resolve, missing)))
+        seeds = []
+        for name in course_names:
+            node = known.get(name) or found.get(name)
+            if node is None:
+                self.unresolved.append(name)
+            else:
+                seeds.append(dict(node, name=name))
+        return seeds
+
+
+def run(input_file='work.csv', base_url="https://edu.kohi.or.kr", records=(), depth=DEFAULT_DEPTH,
+        concurrency=4, max_courses=None, limit=None, output_file=COURSES_FILE,
+        edges_file=EDGES_FILE, timeout=15.0):
+    """시드 확인 -> 너비 우선 탐색 -> 과정/간선 CSV 저장, 출력 줄 목록 반환"""
+    course_names = first_column(input_file)[:limit]
+    crawler = RecommendationCrawler(base_url, max_depth=depth, concurrency=concurrency,
+                                    max_courses=max_courses, timeout=timeout)
+    try:
+        seeds = crawler.seeds(course_names, record_seeds(records))
+        logger.info("시드 %d개 (코드 확인 실패 %d개)", len(seeds), len(crawler.unresolved))
+        courses, edges = crawler.crawl(seeds)
+    finally:
+        crawler.close()
+
+    write_rows(output_file, courses)
+    write_children(output_file, courses)
+    write_rows(edges_file, edges, fieldnames=EDGE_COLUMNS)
+
+    discovered = sum(1 for row in courses if row['탐색_깊이'] > 0)
+    failed = sum(1 for row in courses if str(row.get('스크래핑결과', '')).startswith('오류'))
+    return [f"교육명 {len(course_names)}개 -> 시드 {len(seeds)}개 (코드 확인 실패 {len(crawler.unresolved)}개)",
+            f"방문 {len(courses)}개 (추천으로 새로 발견 {discovered}개, 실패 {failed}개), 간선 {len(edges)}개",
+            f"과정: {output_file}, 간선: {edges_file}"]
@@ -0,0 +1,64 @@
+"""
+KOHI 과정별 시간 예산 (데드라인 전파)
+과정 하나에 전체 시간 예산을 주고, goto/대기/클릭 같은 각 단계는 고정 타임아웃 대신
+'원래 상한과 남은 예산 중 작은 값'만 쓴다. 예산을 다 쓴 과정은 그 자리에서 멈추고
+모은 필드만 담아 '타임아웃'으로 반환되며, 실행 끝에 새 예산으로 다시 시도된다.
+
+    deadline = Deadline(60)
+    page.goto(url, timeout=deadline.ms(30000))   # 남은 예산이 12초면 12000
+    deadline.sleep(3)                            # 남은 예산보다 길게 자지 않음
+"""
+
+import math
+import time
+
+# 과정 하나의 기본 시간 예산(초) - 기존 단계별 타임아웃을 모두 쓰면 80초를 넘음
+DEFAULT_COURSE_BUDGET = 60.0
+
+
+class DeadlineExceeded(Exception):
+    """과정 시간 예산 소진"""
+
+
+class Deadline:
+    """monotonic 시계 기준 남은 시간 (budget이 None/0이면 무제한)"""
+
+    def __init__(self, budget=DEFAULT_COURSE_BUDGET):
+        self.budget = budget or None
+        self.started = time.monotonic()
+        self.expires = self.started + budget if budget else None
+
+    def remaining(self):
+        """남은 시간(초), 무제한이면 inf"""
+        if self.expires is None:
+            return math.inf
+        return max(0.0, self.expires - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def expired(self):
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self):
+        """예산이 남아 있지 않으면 DeadlineExceeded"""
+        if self.expired:
+            raise DeadlineExceeded(f"시간 예산 {self.budget:g}초 소진")
+
+    def ms(self, cap=None):
+        """playwright timeout 인자 (밀리초): 단계 상한 cap과 남은 예산 중 작은 값
+
+        playwright에서 0은 '무제한'이므로 예산이 없으면 0을 주지 않고 DeadlineExceeded를 낸다.
+        무제한 데드라인에 cap도 없으면 0(playwright 무제한)을 반환한다.
+        """
+        self.check()
+        remaining = self.remaining()
+        if cap is None:
+            return 0 if remaining == math.inf else max(1, int(remaining * 1000))
+        return max(1, int(min(cap, remaining * 1000)))
+
+    def sleep(self, seconds):
+        """남은 예산 안에서만 대기"""
+        self.check()
+        time.sleep(min(seconds, self.remaining()))
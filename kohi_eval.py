@@ -0,0 +1,211 @@
+"""
+KOHI 검색 전략 오프라인 평가
+알려진 교육과정 제목 색인(이전 스크래핑 결과, 교육안내책자에서 뽑은 제목 목록)을 대상으로
+KOHI 검색(제목 부분 문자열 일치)을 흉내 내어, 검색어 전략별로 실서버 없이
+
+    - 검색 성공률 (결과가 1건 이상, 전체 / 색인에 정답이 있는 과정)
+    - 과정당 검색 요청 수 (재시도 포함)
+    - 첫 번째 결과가 정답 과정인 비율 (정답을 아는 과정만)
+
+을 계산한다. analysis_report.md의 추정식 대신 실측에 가까운 비교값을 얻기 위한 도구.
+
+    python kohi.py eval --records scraped_ultimate_temp.csv --titles booklet_titles.txt
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+from kohi_io import first_column, read_rows
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ['original', 'basic', 'advanced']
+
+# 'substring': 검색어 전체가 제목의 부분 문자열 (KOHI/대역 서버와 동일)
+# 'and': 띄어쓰기로 나눈 검색어가 모두 제목에 포함 (검색어 개선기가 가정하는 AND 조건)
+MATCH_MODES = ['substring', 'and']
+
+_NON_WORD = re.compile(r'[^0-9A-Za-z가-힣]')
+
+
+def _normalize(title):
+    """공백/괄호/특수문자 차이를 무시한 비교용 제목"""
+    return _NON_WORD.sub('', title or '')
+
+
+class TitleIndex:
+    """알려진 교육과정 제목 색인 (검색 결과 순서 = 색인에 추가된 순서)"""
+
+    def __init__(self):
+        self.entries = []      # [{'title': ..., 'code': ...}]
+        self._by_code = {}
+        self._by_norm = {}
+        self._by_source = {}   # 원본_교육과정명 -> 색인 항목 (이전 스크래핑에서 확인된 정답)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, title, code=None, source=None):
+        title = (title or '').strip()
+        if not title:
+            return None
+        entry = self._by_code.get(code) if code else self._by_norm.get(_normalize(title))
+        if entry is None:
+            entry = {'title': title, 'code': code}
+            self.entries.append(entry)
+            if code:
+                self._by_code[code] = entry
+            self._by_norm.setdefault(_normalize(title), entry)
+        if source:
+            self._by_source[source.strip()] = entry
+        return entry
+
+    def add_records(self, path):
+        """스크래핑 결과 CSV: 교육과정코드가 있는 행의 검색결과 제목 (원본_교육과정명은 정답으로 기록)"""
+        for row in read_rows(path):
+            code = row.get('교육과정코드')
+            if code:
+                title = row.get('검색결과_제목') or row.get('교육과정명') or row.get('원본_교육과정명')
+                self.add(title, code, source=row.get('원본_교육과정명'))
+
+    def add_titles(self, path):
+        """제목 목록 (한 줄에 하나, .csv면 첫 번째 컬럼) - 책자 PDF에서 뽑은 목록 등"""
+        if path.endswith('.csv'):
+            titles = first_column(path)
+        else:
+            with open(path, encoding='utf-8-sig') as f:
+                titles = [line.strip() for line in f if line.strip()]
+        for title in titles:
+            self.add(title)
+
+    def truth(self, course_name):
+        """교육명의 정답 색인 항목 (이전 스크래핑 기록 우선, 없으면 정규화 제목 일치)"""
+        return self._by_source.get(course_name) or self._by_norm.get(_normalize(course_name))
+
+    def search(self, query, match='substring'):
+        query = (query or '').strip()
+        if not query:
+            return []
+        if match == 'and':
+            terms = query.split()
+            return [e for e in self.entries if all(t in e['title'] for t in terms)]
+        return [e for e in self.entries if query in e['title']]
+
+
+def query_plan(strategy, terms):
+    """스크래퍼가 실제로 보내는 검색어 순서
+
+    original: 교육명 그대로 한 번 (ultimate 스크래퍼)
+    basic/advanced: 개선 검색어, 결과가 없으면 뒤에서부터 단어를 하나씩 뺀 검색어로 재시도
+    (kohi_scraper_optimized.search_with_enhanced_terms와 같이 첫 재시도는 전체 검색어를 다시 보냄)
+    """
+    if strategy == 'original':
+        return [terms]
+    words = terms.split()
+    return [terms] + [' '.join(words[:i]) for i in range(len(words), 0, -1)]
+
+
+def query_maker(strategy, course_names):
+    """전략 이름 -> 교육명을 첫 검색어로 바꾸는 함수"""
+    if strategy == 'original':
+        return lambda name: name
+    if strategy == 'basic':
+        from enhance_search_terms import SearchTermEnhancer
+        return SearchTermEnhancer(titles=course_names).split_by_meaning_units
+    if strategy == 'advanced':
+        from enhance_search_terms_v2 import AdvancedSearchEnhancer
+        return AdvancedSearchEnhancer(titles=course_names).smart_split
+    raise ValueError(f"알 수 없는 전략: {strategy}")
+
+
+def evaluate(course_names: List[str], index: TitleIndex, strategies=STRATEGIES,
+             match='substring') -> Dict[str, dict]:
+    """전략별 성공률/요청 수/첫 결과 정확도"""
+    report = {}
+    for strategy in strategies:
+        make_query = query_maker(strategy, course_names)
+        hits = requests = judged = judged_hits = correct = 0
+        failures = []
+        for name in course_names:
+            truth = index.truth(name)
+            plan = query_plan(strategy, make_query(name))
+            results = []
+            for sent, query in enumerate(plan, 1):
+                results = index.search(query, match)
+                if results:
+                    break
+            requests += sent
+            if results:
+                hits += 1
+            if truth is not None:
+                judged += 1
+                judged_hits += bool(results)
+                if results and results[0] is truth:
+                    correct += 1
+                else:
+                    failures.append({'course_name': name, 'query': plan[0],
+                                     'first_result': results[0]['title'] if results else None})
+        total = max(1, len(course_names))
+        report[strategy] = {
+            'courses': len(course_names),
+            'hit_rate': hits / total,
+            'requests_per_course': requests / total,
+            'judged': judged,
+            'judged_hit_rate': judged_hits / judged if judged else None,
+            'top1': correct / judged if judged else None,
+            'failures': failures,
+        }
+    return report
+
+
+def _percent(value):
+    return f"{value * 100:.1f}%" if value is not None else '-'
+
+
+def format_report(report, index_size, match):
+    """터미널 출력용 표"""
+    lines = [f"색인 {index_size}개 제목, 일치 방식: {match}",
+             f"{'전략':<10} {'성공률':>8} {'요청/과정':>10} {'판정 수':>8} {'판정 성공률':>10} {'첫결과 정답':>10}"]
+    for strategy, r in report.items():
+        judged_hits = _percent(r['judged_hit_rate'])
+        top1 = _percent(r['top1'])
+        lines.append(f"{strategy:<10} {_percent(r['hit_rate']):>8} {r['requests_per_course']:>10.2f} "
+                     f"{r['judged']:>8} {judged_hits:>10} {top1:>10}")
+    return lines
+
+
+def build_index(records=(), titles=()):
+    index = TitleIndex()
+    for path in records:
+        if os.path.exists(path):
+            index.add_records(path)
+        else:
+            logger.warning("결과 파일 없음 (건너뜀): %s", path)
+    for path in titles:
+        index.add_titles(path)
+    return index
+
+
+def run(input_file='work.csv', records=('scraped_ultimate_temp.csv',), titles=(),
+        strategies=STRATEGIES, match='substring', limit=None, json_file: Optional[str] = None,
+        show_failures=0):
+    """평가 실행 후 출력 줄 목록 반환"""
+    course_names = first_column(input_file)[:limit]
+    index = build_index(records, titles)
+    if not len(index):
+        raise ValueError("색인이 비어 있습니다 (--records 또는 --titles 지정)")
+
+    report = evaluate(course_names, index, strategies, match)
+    lines = format_report(report, len(index), match)
+    for strategy, r in report.items():
+        for failure in r['failures'][:show_failures]:
+            lines.append(f"  [{strategy}] {failure['course_name']} | 검색어: {failure['query']}"
+                         f" -> {failure['first_result'] or '결과 없음'}")
+    if json_file:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({'index_size': len(index), 'match': match, 'strategies': report},
+                      f, ensure_ascii=False, indent=2)
+    return lines
@@ -0,0 +1,190 @@
+"""
+KOHI 스크래핑 리소스 조절기
+playwright 드라이버와 chromium 프로세스의 RSS/CPU를 주기적으로 재서
+설정한 메모리/CPU 예산 안에서 동시에 일하는 작업자 수를 늘리거나 줄이고,
+메모리가 임계치를 넘은 작업자의 playwright 인스턴스(드라이버 + 브라우저)를 새로 띄운다.
+
+    python kohi.py scrape --workers 8 --max-memory 6000 --max-cpu 3 --recycle-rss 1500
+
+- 작업자 스레드는 --workers개 만들어 두고, 과정을 하나 처리할 때마다 슬롯을 얻는다
+- 허용 작업자 수는 1개(--min-workers)에서 시작해 예산의 LOW_WATER 미만이면 1씩 늘리고,
+  예산을 넘으면 1씩 줄인다 (처리 중인 과정은 끝까지 진행)
+- 결정은 kohi_governor_* 메트릭과 'governor' 로그 이벤트로 남긴다
+"""
+
+import logging
+import threading
+import time
+
+from kohi_logging import log_event
+from kohi_metrics import RUN as metrics, child_pids, process_cpu_seconds, process_rss
+
+logger = logging.getLogger(__name__)
+
+# 예산 대비 이 비율 미만일 때만 작업자를 늘림 (경계에서 늘었다 줄었다 반복하지 않도록)
+LOW_WATER = 0.7
+
+MB = 1024 * 1024
+
+
+class ResourceGovernor:
+    """메모리/CPU 예산에 맞춰 동시 작업자 수를 조절"""
+
+    def __init__(self, max_workers, memory_budget=None, cpu_budget=None, recycle_rss=None,
+                 min_workers=1, interval=2.0):
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.memory_budget = memory_budget      # 바이트
+        self.cpu_budget = cpu_budget            # 코어 수
+        self.recycle_rss = recycle_rss          # 작업자 하나의 드라이버+브라우저 RSS 임계치 (바이트)
+        self.interval = interval
+        # 예산 없이 재시작 임계치만 주면 작업자 수는 조절하지 않음
+        self.allowed = self.min_workers if (memory_budget or cpu_budget) else self.max_workers
+        self.active = 0
+        self.rss = 0
+        self.cpu = 0.0
+        self._cond = threading.Condition()
+        self._spawn_lock = threading.Lock()
+        self._cpu_seen = {}                     # pid -> 마지막 누적 CPU 시간
+        self._sampled_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        metrics.governor_workers.set(self.allowed, state='allowed')
+
+    def cap(self, max_workers):
+        """실제로 만든 작업자 스레드 수로 최대치 제한"""
+        with self._cond:
+            self.max_workers = max(1, min(self.max_workers, max_workers))
+            self.min_workers = min(self.min_workers, self.max_workers)
+            self.allowed = min(self.allowed, self.max_workers)
+        metrics.governor_workers.set(self.allowed, state='allowed')
+
+    # --- 작업자 슬롯 ---
+
+    def acquire(self):
+        """허용 작업자 수 안에서 슬롯 얻기 (자리가 날 때까지 대기)"""
+        with self._cond:
+            while self.active >= self.allowed:
+                self._cond.wait()
+            self.active += 1
+            metrics.governor_workers.set(self.active, state='active')
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            metrics.governor_workers.set(self.active, state='active')
+            self._cond.notify_all()
+
+    def _set_allowed(self, allowed, action):
+        with self._cond:
+            self.allowed = allowed
+            self._cond.notify_all()
+        metrics.governor_decision(action, allowed)
+        log_event(logger, 'governor', action=action, allowed=allowed, active=self.active,
+                  rss_mb=round(self.rss / MB, 1), cpu_cores=round(self.cpu, 2))
+
+    # --- 측정과 결정 ---
+
+    def sample(self):
+        """하위 프로세스 전체 RSS(바이트)와 직전 표본 이후 CPU 사용량(코어 수)"""
+        pids = child_pids()
+        now = time.monotonic()
+        cpu_seconds = 0.0
+        seen = {}
+        for pid in pids:
+            total = process_cpu_seconds(pid)
+            # 이번 주기에 새로 뜬 프로세스는 시작 이후 사용량 전체를 이번 주기 몫으로 봄
+            cpu_seconds += max(0.0, total - self._cpu_seen.get(pid, 0.0))
+            seen[pid] = total
+        elapsed = now - self._sampled_at if self._sampled_at is not None else None
+        self._cpu_seen = seen
+        self._sampled_at = now
+
+        self.rss = sum(process_rss(pid) for pid in pids)
+        self.cpu = cpu_seconds / elapsed if elapsed else 0.0
+        metrics.browser_cpu.set(round(self.cpu, 3))
+        return self.rss, self.cpu
+
+    def _usage(self):
+        """예산 대비 사용률 중 큰 값 (예산이 없으면 0)"""
+        ratios = [0.0]
+        if self.memory_budget:
+            ratios.append(self.rss / self.memory_budget)
+        if self.cpu_budget:
+            ratios.append(self.cpu / self.cpu_budget)
+        return max(ratios)
+
+    def step(self):
+        """표본 하나를 재고 허용 작업자 수 조정, 결정(action 또는 None) 반환"""
+        self.sample()
+        usage = self._usage()
+        if usage > 1.0 and self.allowed > self.min_workers:
+            self._set_allowed(self.allowed - 1, 'scale_down')
+            return 'scale_down'
+        if usage < LOW_WATER and self.allowed < self.max_workers and self.active >= self.allowed:
+            # 작업자 하나가 더 쓸 메모리 추정치(현재 평균)를 더해도 예산 안일 때만 늘림
+            per_worker = self.rss / max(1, self.active)
+            if not self.memory_budget or self.rss + per_worker <= self.memory_budget * LOW_WATER:
+                self._set_allowed(self.allowed + 1, 'scale_up')
+                return 'scale_up'
+        return None
+
+    def _loop(self):
+        self.sample()
+        while not self._stop.wait(self.interval):
+            try:
+                self.step()
+            except Exception as e:
+                logger.warning("리소스 조절기 표본 실패: %s", e)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name='kohi-governor', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # --- 작업자별 playwright 인스턴스 ---
+
+    def launch(self, start_playwright):
+        """playwright 시작 후 (인스턴스, 드라이버 pid) 반환
+
+        드라이버는 이 프로세스의 직계 자식이므로 시작 전후 자식 목록 차이로 찾는다
+        (동시에 시작하면 구분할 수 없어 직렬화).
+        """
+        with self._spawn_lock:
+            before = set(child_pids(recursive=False))
+            instance = start_playwright()
+            spawned = set(child_pids(recursive=False)) - before
+        return instance, (min(spawned) if spawned else None)
+
+    def tree_rss(self, pid):
+        """드라이버와 그 하위 브라우저 프로세스 RSS 합계"""
+        return process_rss(pid) + sum(process_rss(child) for child in child_pids(pid))
+
+    def should_recycle(self, pid):
+        """작업자의 드라이버/브라우저 메모리가 임계치를 넘었는지 (넘었으면 결정 기록)"""
+        if not self.recycle_rss or pid is None:
+            return False
+        rss = self.tree_rss(pid)
+        if rss <= self.recycle_rss:
+            return False
+        metrics.governor_decision('recycle')
+        log_event(logger, 'governor', action='recycle', pid=pid, rss_mb=round(rss / MB, 1))
+        return True
+
+
+def from_options(max_workers, max_memory_mb=None, max_cpu=None, recycle_rss_mb=None,
+                 min_workers=1, interval=2.0):
+    """명령행 옵션으로 조절기 생성 (예산이 하나도 없으면 None = 조절 안 함)"""
+    if not (max_memory_mb or max_cpu or recycle_rss_mb):
+        return None
+    return ResourceGovernor(max_workers,
+                            memory_budget=max_memory_mb * MB if max_memory_mb else None,
+                            cpu_budget=max_cpu or None,
+                            recycle_rss=recycle_rss_mb * MB if recycle_rss_mb else None,
+                            min_workers=min_workers, interval=interval)
@@ -0,0 +1,274 @@
+"""
+KOHI 동시(헤지) 검색
+어려운 교육명은 개선 검색어 -> 단어를 하나씩 뺀 검색어 순으로 몇 초씩 기다리며 차례로 재시도하는 대신,
+원본 교육명 / AdvancedSearchEnhancer / SearchTermEnhancer 검색어를 동시에 HTTP로 보내고
+(변형마다 자기 재시도 순서를 대기 없이 진행) 첫 번째 카드 제목이 교육명과 맞는 결과를
+가장 먼저 돌려준 변형을 채택, 나머지 요청은 취소한다.
+
+    python kohi.py hedge --input work.csv --base-url http://127.0.0.1:8765
+    python kohi.py scrape --hedge                  # 채택된 카드의 상세 페이지로 바로 이동
+
+- 한 교육명 안에서 이미 받았거나 받는 중인 검색어 결과는 변형끼리 공유 (같은 검색어를 다시 보내지 않음)
+- 스크래퍼는 채택된 카드(카드 필드 + 교육과정코드/교육그룹코드)를 받아 브라우저 검색을 건너뛰고
+  상세 페이지로 바로 이동한다 (open_detail, 맞는 결과가 없으면 예전처럼 브라우저 검색)
+- 변형별 결과(win/match/miss/empty/error/cancelled)는 실행 끝 요약과 kohi_hedge_requests_total 메트릭으로 남김
+  (한 번도 이기지 못하는 변형은 --hedge-variants에서 빼면 됨)
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from kohi_eval import STRATEGIES, query_maker, query_plan
+from kohi_logging import log_event
+from kohi_metrics import RUN as metrics
+from kohi_watch import DETAIL_PATH, CardFetcher
+
+logger = logging.getLogger(__name__)
+
+# 동시에 보낼 검색어 변형 (kohi_eval 전략 이름과 같음)
+VARIANTS = list(STRATEGIES)
+
+# 첫 카드 제목이 교육명 글자 바이그램의 이 비율 이상을 포함하면 '맞는 결과'
+MATCH_THRESHOLD = 0.6
+
+_NON_WORD = re.compile(r'[^0-9A-Za-z가-힣]')
+
+# 상세 페이지로 가는 POST 폼 전송 (사이트의 btn_selectPaa0040(crseCd, grnoCd)과 같은 요청, 빈 페이지에서도 동작)
+_OPEN_DETAIL_JS = r"""
+([url, code, group]) => {
+  const form = document.createElement('form');
+  form.method = 'post';
+  form.action = url;
+  for (const [name, value] of [['crseCd', code], ['grnoCd', group]]) {
+    const input = document.createElement('input');
+    input.type = 'hidden';
+    input.name = name;
+    input.value = value;
+    form.appendChild(input);
+  }
+  (document.body || document.documentElement).appendChild(form);
+  form.submit();
+}
+"""
+
+
+def _bigrams(text):
+    text = _NON_WORD.sub('', text or '')
+    return {text[i:i + 2] for i in range(len(text) - 1)} or ({text} if text else set())
+
+
+def title_score(course_name, title):
+    """교육명 바이그램 중 카드 제목에 있는 비율 (0~1)"""
+    wanted = _bigrams(course_name)
+    if not wanted:
+        return 0.0
+    return len(wanted & _bigrams(title)) / len(wanted)
+
+
+class HedgeStats:
+    """변형별 결과 집계 (스레드 안전)"""
+
+    def __init__(self, variants):
+        self.variants = list(variants)
+        self.outcomes = {variant: Counter() for variant in self.variants}
+        self.win_seconds = {variant: 0.0 for variant in self.variants}
+        self.searches = 0
+        self.unmatched = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcomes: Dict[str, str], winner=None, seconds=0.0):
+        with self._lock:
+            self.searches += 1
+            if winner is None:
+                self.unmatched += 1
+            else:
+                self.win_seconds[winner] += seconds
+            for variant, outcome in outcomes.items():
+                self.outcomes[variant][outcome] += 1
+        for variant, outcome in outcomes.items():
+            metrics.hedge_outcome(variant, outcome)
+
+    def win_rates(self):
+        """변형 -> 채택 비율 (전체 검색 수 대비)"""
+        total = max(1, self.searches)
+        return {variant: self.outcomes[variant]['win'] / total for variant in self.variants}
+
+    def format_report(self):
+        """변형별 채택률/정답 결과율/평균 채택 지연 표"""
+        total = max(1, self.searches)
+        lines = [f"동시 검색 {self.searches}회, 맞는 결과 없음 {self.unmatched}회",
+                 f"{'변형':<10} {'채택':>6} {'채택률':>8} {'정답결과율':>10} {'평균지연':>8} {'오류':>6}"]
+        for variant in self.variants:
+            counts = self.outcomes[variant]
+            wins = counts['win']
+            latency = f"{self.win_seconds[variant] / wins:.2f}s" if wins else '-'
+            lines.append(f"{variant:<10} {wins:>6} {wins / total * 100:>7.1f}% "
+                         f"{(wins + counts['match']) / total * 100:>9.1f}% {latency:>8} {counts['error']:>6}")
+        return lines
+
+
+class HedgedSearch:
+    """교육명 하나에 대해 검색어 변형을 동시에 보내고 가장 먼저 맞는 결과를 채택"""
+
+    def __init__(self, base_url="https://edu.kohi.or.kr", variants=VARIANTS, titles=(),
+                 threshold=MATCH_THRESHOLD, timeout=15.0, max_parallel=4):
+        self.base_url = base_url
+        self.variants = list(variants)
+        self.makers = {variant: query_maker(variant, list(titles)) for variant in self.variants}
+        self.threshold = threshold
+        self.timeout = timeout
+        self.stats = HedgeStats(self.variants)
+        # 검색 max_parallel개(스크래핑 작업자 수)가 동시에 변형 수만큼 요청
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_parallel) * len(self.variants),
+                                        thread_name_prefix='kohi-hedge')
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def plans(self, course_name) -> Dict[str, List[str]]:
+        """변형 -> 보낼 검색어 순서 (kohi_eval.query_plan: 개선 검색어 다음 단어를 하나씩 뺀 검색어)"""
+        plans = {}
+        for variant, make in self.makers.items():
+            query = (make(course_name) or '').strip() or course_name
+            plans[variant] = list(dict.fromkeys(query_plan(variant, query)))
+        return plans
+
+    def _passes(self, course_name, cards):
+        return bool(cards) and title_score(course_name, cards[0].get('검색결과_제목')) >= self.threshold
+
+    def _run_plan(self, course_name, plan, fetcher, shared, stop):
+        """한 변형의 검색어를 대기 없이 차례로 보내 첫 맞는 결과 반환 -> (결과, 검색어, 카드)
+
+        다른 변형이 이미 보냈거나 보내는 중인 검색어는 shared의 Future를 기다려 재사용하고,
+        stop이 켜지면(다른 변형 채택) 중단한다.
+        """
+        outcome, last_query, last_cards = 'empty', plan[0], []
+        for query in plan:
+            if stop.is_set():
+                raise CancelledError(query)
+            with shared['lock']:
+                pending = shared['cards'].get(query)
+                if pending is None:
+                    pending = shared['cards'][query] = Future()
+                    owner = True
+                else:
+                    owner = False
+            if owner:
+                try:
+                    pending.set_result(fetcher.fetch(query))
+                except BaseException as e:
+                    pending.set_exception(e)
+            cards = pending.result()
+            if self._passes(course_name, cards):
+                return 'win', query, cards
+            if cards:
+                outcome, last_query, last_cards = 'miss', query, cards
+        return outcome, last_query, last_cards
+
+    def search(self, course_name) -> Optional[dict]:
+        """채택 결과 {'variant', 'query', 'cards', 'seconds'} (맞는 결과가 없으면 None)"""
+        start = time.perf_counter()
+        plans = self.plans(course_name)
+        fetchers = {variant: CardFetcher(self.base_url, timeout=self.timeout) for variant in plans}
+        shared = {'lock': threading.Lock(), 'cards': {}}
+        stop = threading.Event()
+        futures = {self._pool.submit(self._run_plan, course_name, plan, fetchers[variant], shared, stop):
+                   variant for variant, plan in plans.items()}
+        outcomes = {}
+        winner = None
+
+        pending = set(futures)
+        deadline = start + self.timeout
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                variant = futures[future]
+                try:
+                    outcome, query, cards = future.result()
+                except CancelledError:
+                    outcomes[variant] = 'cancelled'
+                    continue
+                except Exception as e:
+                    logger.debug("  동시 검색 실패 (%s): %s", variant, e)
+                    outcomes[variant] = 'error'
+                    continue
+                if outcome == 'win' and winner is not None:
+                    outcome = 'match'  # 맞는 결과지만 다른 변형이 먼저 채택됨
+                elif outcome == 'win':
+                    winner = {'variant': variant, 'query': query, 'cards': cards}
+                outcomes[variant] = outcome
+            if winner is not None:
+                break
+
+        # 남은 요청 취소 (시작 전이면 대기열에서 빼고, 진행 중이면 소켓을 끊음)
+        stop.set()
+        running = {futures[future] for future in pending}
+        for future in pending:
+            future.cancel()
+        for variant, fetcher in fetchers.items():
+            if variant in running:
+                fetcher.cancel()
+                outcomes[variant] = 'cancelled'
+            else:
+                fetcher.close()
+
+        seconds = time.perf_counter() - start
+        self.stats.record(outcomes, winner and winner['variant'], seconds)
+        log_event(logger, 'hedge', course_name=course_name, duration=seconds,
+                  winner=winner and winner['variant'], outcomes=outcomes)
+        if winner is not None:
+            winner['seconds'] = seconds
+        return winner
+
+    def pick(self, course_name, fallback=None):
+        """-> (검색어, 채택된 카드)
+
+        카드는 맞는 결과의 첫 카드(kohi_spec.CARD 필드)로, 교육과정코드/교육그룹코드가 있으면 스크래퍼가
+        브라우저 검색 없이 상세 페이지로 바로 간다. 맞는 결과가 없거나 오류면 (fallback 또는 교육명, None).
+        """
+        try:
+            result = self.search(course_name)
+        except Exception as e:
+            logger.warning("  동시 검색 오류 (%s): %s", course_name, e)
+            result = None
+        if not result:
+            return fallback or course_name, None
+        card = result['cards'][0]
+        if not (card.get('교육과정코드') and card.get('교육그룹코드')):
+            card = None
+        return result['query'], card
+
+    def log_report(self):
+        for line in self.stats.format_report():
+            logger.info(line)
+
+
+def open_detail(page, base_url, card, timeout=30000):
+    """채택된 카드의 상세 페이지로 바로 이동 (검색 페이지를 열지 않고 현재 페이지에서 폼 POST)"""
+    url = base_url.rstrip('/') + DETAIL_PATH
+    with page.expect_navigation(timeout=timeout, wait_until='domcontentloaded'):
+        page.evaluate(_OPEN_DETAIL_JS, [url, card['교육과정코드'], card['교육그룹코드']])
+
+
+def run(input_file='work.csv', base_url="https://edu.kohi.or.kr", variants=VARIANTS, limit=None,
+        threshold=MATCH_THRESHOLD, timeout=15.0, concurrency=4):
+    """교육명 목록 전체를 동시 검색하고 변형별 채택률 표(출력 줄 목록) 반환"""
+    from kohi_io import first_column
+
+    course_names = first_column(input_file)[:limit]
+    hedge = HedgedSearch(base_url, variants, titles=course_names, threshold=threshold,
+                         timeout=timeout, max_parallel=concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            list(pool.map(hedge.search, course_names))
+    finally:
+        hedge.close()
+    return hedge.stats.format_report()
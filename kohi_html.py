@@ -0,0 +1,181 @@
+"""
+브라우저 없이 HTML을 다루는 최소 DOM
+표준 라이브러리 html.parser로 가벼운 트리를 만들고, 추출 명세(kohi_spec)에 쓰이는
+CSS 셀렉터 부분집합(태그, #id, .class, [attr], [attr*=v], 자손 결합자, 쉼표 묶음)을 지원한다.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# 닫는 태그가 없는 요소
+_VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+         'param', 'source', 'track', 'wbr'}
+
+# innerText에서 줄/칸이 나뉘는 요소 (텍스트 사이에 공백을 넣음)
+_BLOCK = {'address', 'article', 'br', 'caption', 'dd', 'div', 'dl', 'dt', 'footer', 'form',
+          'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'ol', 'p', 'section',
+          'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'}
+
+_SIMPLE = re.compile(r'([a-zA-Z][\w-]*|\*)|#([\w-]+)|\.([\w-]+)'
+                     r'|\[([\w-]+)(?:([*^$]?=)\s*["\']?([^"\'\]]*)["\']?)?\]')
+
+
+class Node:
+    """최소 DOM 노드"""
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.children = []
+        self.parent = parent
+
+    @property
+    def classes(self):
+        return (self.attrs.get('class') or '').split()
+
+    def get(self, name, default=None):
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    def text(self):
+        """하위 텍스트 (innerText처럼 블록/셀 경계는 공백으로 구분, 공백 정규화)"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in ('script', 'style'):
+                if node.tag in _BLOCK:
+                    parts.append(' ')
+                    stack.append(' ')
+                stack.extend(reversed(node.children))
+        return ' '.join(''.join(parts).split())
+
+    def iter(self):
+        """깊이 우선 하위 요소 순회 (자신 포함)"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    def find_all(self, tag=None, cls=None):
+        return [n for n in self.iter() if n is not self
+                and (tag is None or n.tag == tag)
+                and (cls is None or cls in n.classes)]
+
+    def find(self, tag=None, cls=None):
+        for n in self.iter():
+            if n is not self and (tag is None or n.tag == tag) and (cls is None or cls in n.classes):
+                return n
+        return None
+
+    def next_element(self):
+        """다음 형제 요소 (nextElementSibling)"""
+        if self.parent is None:
+            return None
+        siblings = self.parent.children
+        for node in siblings[siblings.index(self) + 1:]:
+            if isinstance(node, Node):
+                return node
+        return None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, attrs, self.current)
+        self.current.children.append(node)
+        if tag not in _VOID:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Node(tag, attrs, self.current))
+
+    def handle_endtag(self, tag):
+        # 짝이 맞지 않는 닫는 태그는 가장 가까운 같은 태그까지 거슬러 올라가 닫음
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(markup):
+    """HTML 문자열을 Node 트리로 변환"""
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+def _compile_compound(text):
+    """'a.b[c*="d"]' -> 조건 함수 목록"""
+    tests = []
+    pos = 0
+    for match in _SIMPLE.finditer(text):
+        if match.start() != pos:
+            raise ValueError(f"지원하지 않는 셀렉터: {text}")
+        pos = match.end()
+        tag, id_, cls, attr, op, value = match.groups()
+        if tag and tag != '*':
+            tests.append(lambda n, t=tag.lower(): n.tag == t)
+        elif id_:
+            tests.append(lambda n, v=id_: n.attrs.get('id') == v)
+        elif cls:
+            tests.append(lambda n, v=cls: v in n.classes)
+        elif attr:
+            if not op:
+                tests.append(lambda n, a=attr: a in n.attrs)
+            elif op == '*=':
+                tests.append(lambda n, a=attr, v=value: v in (n.attrs.get(a) or ''))
+            elif op == '^=':
+                tests.append(lambda n, a=attr, v=value: (n.attrs.get(a) or '').startswith(v))
+            elif op == '$=':
+                tests.append(lambda n, a=attr, v=value: (n.attrs.get(a) or '').endswith(v))
+            else:
+                tests.append(lambda n, a=attr, v=value: n.attrs.get(a) == v)
+    if pos != len(text):
+        raise ValueError(f"지원하지 않는 셀렉터: {text}")
+    return tests
+
+
+def _compile(selector):
+    """쉼표 묶음 -> [자손 결합 단계별 조건 목록]"""
+    return [[_compile_compound(part) for part in group.split()]
+            for group in selector.split(',') if group.strip()]
+
+
+_compiled = {}
+
+
+def _matches(node, steps):
+    """오른쪽 단계부터 맞춰 보고 나머지는 조상에서 차례로 찾기 (브라우저와 같은 의미)"""
+    if not all(test(node) for test in steps[-1]):
+        return False
+    ancestor = node.parent
+    for tests in reversed(steps[:-1]):
+        while ancestor is not None and not all(test(ancestor) for test in tests):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+
+def select(root, selector):
+    """root 하위에서 셀렉터와 맞는 요소 목록 (문서 순서, querySelectorAll과 동일)"""
+    groups = _compiled.get(selector)
+    if groups is None:
+        groups = _compiled[selector] = _compile(selector)
+    return [node for node in root.iter() if node is not root and node.tag != '#document'
+            and any(_matches(node, steps) for steps in groups)]
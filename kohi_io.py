@@ -0,0 +1,65 @@
+"""
+KOHI CSV 입출력 유틸리티
+pandas 없이 표준 라이브러리 csv만 사용하여 빠르게 읽고 쓴다
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, List, Optional
+
+
+def read_rows(path: str) -> List[Dict[str, str]]:
+    """CSV 파일을 dict 행 목록으로 읽기 (BOM 유무 무관)"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+def column_order(rows: Iterable[dict]) -> List[str]:
+    """행들에 등장한 컬럼을 처음 나타난 순서대로 합치기 (pd.DataFrame과 동일한 순서)"""
+    columns = {}
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+def write_rows(path: str, rows: List[dict], fieldnames: Optional[List[str]] = None):
+    """dict(또는 kohi_record.CourseRecord) 행 목록을 CSV로 저장 (엑셀 호환 utf-8-sig)
+
+    임시 파일에 먼저 쓴 뒤 교체하므로 중단되어도 기존 파일이 깨지지 않는다.
+    fieldnames가 없으면 행을 컬럼 버퍼에 바로 이어 붙여 쓴다 (컬럼 순서는 kohi_record.FIELDS 중 값이 있는 컬럼, 그 다음 나머지 컬럼이 처음 나타난 순서).
+    """
+    if fieldnames is None:
+        from kohi_record import ColumnBuffer
+        ColumnBuffer(rows).write_csv(path)
+        return
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ('' if v is None else v) for k, v in row.items()})
+    os.replace(tmp_path, path)
+
+
+def first_column(path: str) -> List[str]:
+    """CSV 첫 번째 컬럼 값 목록 (work.csv의 교육명 등)"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return [row[0].strip() for row in reader if row and row[0].strip()]
+
+
+def load_completed(temp_file: Optional[str]) -> List[Dict[str, str]]:
+    """이어하기용: 임시 저장 파일에서 이미 처리된 결과 로드 (오류/시간 예산 소진 건은 다시 시도)
+
+    실행 내내 결과 목록에 남으므로 CourseRecord로 바꿔 담는다 (CSV의 빈 칸은 값 없음).
+    """
+    from kohi_record import CourseRecord
+
+    if not temp_file or not os.path.exists(temp_file):
+        return []
+    return [CourseRecord({k: v for k, v in row.items() if v != ''}) for row in read_rows(temp_file)
+            if row.get('스크래핑결과') and not row['스크래핑결과'].startswith(('오류', '타임아웃'))]
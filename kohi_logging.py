@@ -0,0 +1,172 @@
+"""
+KOHI 비동기 구조화 로깅
+스크래핑 스레드는 로그 레코드를 큐에 넣기만 하고, 포맷팅과 파일/콘솔 쓰기는
+별도 리스너 스레드가 담당한다 (핸들러 락/디스크 쓰기 경합 제거).
+
+    setup_logging('scraper_ultimate.log')
+    with stage(logger, 'search', course_name=name):
+        ...
+    log_event(logger, 'detail', course='A2511069', duration=1.23, fields=31)
+    debug_sampled(logger, "필드 %s = %s", key, value)
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import queue
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# 구조화 이벤트로 JSON에 그대로 싣는 extra 필드
+EVENT_FIELDS = ('course', 'course_name', 'stage', 'duration_ms', 'data')
+
+_listener = None
+_stage_observers = []
+_debug_every = 20
+_debug_counter = itertools.count()
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 이벤트 (리스너 스레드에서만 호출됨)"""
+
+    def format(self, record):
+        event = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage().strip(),
+        }
+        for key in EVENT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                event[key] = value
+        if record.exc_info:
+            event['exc'] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    %-스타일 인자를 보존한 채 넘겨 포맷 비용을 리스너 스레드로 옮긴다.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(log_file=None, level=logging.INFO, log_format='json',
+                  console=True, debug_sample_rate=0.05):
+    """큐 기반 로깅 파이프라인 구성 (중복 호출 시 기존 리스너 교체)
+
+    log_file: 파일 경로 (None이면 파일 로그 없음)
+    log_format: 파일 로그 형식 'json'(한 줄 JSON 이벤트) 또는 'text'
+    debug_sample_rate: debug_sampled() 호출 중 실제로 기록할 비율 (0~1)
+    """
+    global _listener, _debug_every
+
+    shutdown_logging()
+
+    handlers = []
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter() if log_format == 'json'
+                                  else logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _debug_every = max(1, round(1 / debug_sample_rate)) if debug_sample_rate > 0 else 0
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """리스너 스레드 종료 (큐에 남은 레코드는 모두 기록한 뒤 종료)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def log_event(logger, stage_name, course=None, course_name=None, duration=None,
+              level=logging.INFO, **data):
+    """구조화 이벤트 기록 (단계, 과정 코드, 소요시간)
+
+    비활성 레벨이면 dict 생성 비용도 들지 않도록 먼저 확인한다.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    duration_ms = round(duration * 1000, 1) if duration is not None else None
+    logger.log(level, "  [%s] %s %s", stage_name, course or course_name or '',
+               _LazySuffix(duration_ms, data),
+               extra={'stage': stage_name, 'course': course, 'course_name': course_name,
+                      'duration_ms': duration_ms, 'data': data or None})
+
+
+class _LazySuffix:
+    """소요시간/부가정보 표시 문자열 (메시지가 실제로 포맷될 때만 계산)"""
+    __slots__ = ('ms', 'data')
+
+    def __init__(self, ms, data):
+        self.ms = ms
+        self.data = data
+
+    def __str__(self):
+        parts = [f"{k}={v}" for k, v in self.data.items()]
+        if self.ms is not None:
+            parts.insert(0, f"({self.ms:.0f}ms)")
+        return ' '.join(parts)
+
+
+@contextmanager
+def stage(logger, stage_name, course=None, course_name=None, **data):
+    """블록 소요시간을 측정해 단계 이벤트로 기록
+
+    블록 안에서 yield된 dict에 값을 넣으면 이벤트 data에 함께 실린다
+    ('course' 키는 블록 안에서 알게 된 과정 코드로 취급).
+    """
+    start = time.perf_counter()
+    try:
+        yield data
+    finally:
+        duration = time.perf_counter() - start
+        course = data.pop('course', course)
+        for observer in _stage_observers:
+            observer(stage_name, duration, course)
+        log_event(logger, stage_name, course=course, course_name=course_name,
+                  duration=duration, **data)
+
+
+def add_stage_observer(callback):
+    """stage() 블록이 끝날 때마다 callback(stage_name, seconds, course) 호출 (메트릭 연동)"""
+    _stage_observers.append(callback)
+
+
+def debug_sampled(logger, msg, *args):
+    """필드 단위 디버그 로그를 debug_sample_rate 비율로만 기록"""
+    if not _debug_every or not logger.isEnabledFor(logging.DEBUG):
+        return
+    if next(_debug_counter) % _debug_every == 0:
+        logger.debug(msg, *args)
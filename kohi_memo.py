@@ -0,0 +1,97 @@
+"""
+검색어 개선 메모 (교육명 -> 개선 검색어)
+work.csv에 과정이 몇 개 추가되어도 전체를 다시 분리하지 않도록, 이전 실행의 결과를
+알고리즘별로 JSON 파일에 보관하고 새로 나타난(또는 바뀐) 교육명만 계산한다.
+
+알고리즘 버전은 분리기 클래스 소스와 분리기가 memo_key()로 선언한 값(복합명사, 조사 목록,
+고정 단어 사전 버전 등)의 해시이므로 사전이나 분리 규칙을 고치면 해당 알고리즘의 메모는 자동으로 무효화된다.
+
+    {"AdvancedSearchEnhancer": {"version": "3f2a...", "entries": {"교육명": "개선 검색어"}}}
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+MEMO_FILE = 'enhance_memo.json'
+
+
+def source_digest(cls):
+    """클래스 소스 해시 (소스를 읽을 수 없는 배포 형태에서는 이름만)"""
+    digest = hashlib.sha256(cls.__qualname__.encode('utf-8'))
+    try:
+        digest.update(inspect.getsource(cls).encode('utf-8'))
+    except (OSError, TypeError):
+        pass
+    return digest.hexdigest()[:16]
+
+
+def algorithm_version(enhancer):
+    """분리기 클래스 소스 + enhancer.memo_key()로 만든 버전 해시
+
+    memo_key()는 분리 결과를 정하는 값(사전, 규칙, 단어 사전 버전)만 돌려준다.
+    인스턴스 상태 전체를 해시하면 결과와 상관없는 값이 바뀌어도 메모 전체가 무효화된다.
+    """
+    key = json.dumps(enhancer.memo_key(), ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(source_digest(type(enhancer)).encode('utf-8'))
+    digest.update(key.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class EnhanceMemo:
+    """알고리즘 하나의 교육명 -> 개선 검색어 메모"""
+
+    def __init__(self, path, enhancer):
+        self.path = path
+        self.name = type(enhancer).__name__
+        self.version = algorithm_version(enhancer)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._state = {}
+        self.load()
+
+    def load(self):
+        """메모 파일 로드 (버전이 다르면 이 알고리즘 항목만 버림)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("검색어 메모를 읽지 못해 새로 만듭니다 (%s): %s", self.path, e)
+            self._state = {}
+            return
+
+        section = self._state.get(self.name) or {}
+        if section.get('version') == self.version:
+            self.entries = dict(section.get('entries') or {})
+        elif section:
+            logger.info("%s 사전/알고리즘 변경 -> 메모 %d건 무효화",
+                        self.name, len(section.get('entries') or {}))
+
+    def get(self, title, compute):
+        """메모에 있으면 그대로, 없으면 compute(title) 결과를 기록 후 반환"""
+        enhanced = self.entries.get(title)
+        if enhanced is not None:
+            self.hits += 1
+            return enhanced
+        self.misses += 1
+        enhanced = self.entries[title] = compute(title)
+        return enhanced
+
+    def save(self):
+        """메모 저장 (다른 알고리즘 항목은 유지, 원자적 교체)"""
+        if not self.path:
+            return
+        state = dict(self._state)
+        state[self.name] = {'version': self.version, 'entries': self.entries}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._state = state
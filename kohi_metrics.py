@@ -0,0 +1,451 @@
+"""
+KOHI 스크래핑 실행 메트릭 (Prometheus/OpenMetrics 텍스트 형식)
+
+    python kohi.py scrape --metrics-port 9108              # http://127.0.0.1:9108/metrics
+    python kohi.py scrape --metrics-textfile kohi.prom     # node_exporter textfile collector
+
+외부 의존성 없이 표준 라이브러리만 사용한다. 수집은 항상 켜져 있고(값 갱신은
+락 한 번), 노출(HTTP/텍스트 파일)만 옵션으로 켠다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import kohi_logging
+
+logger = logging.getLogger(__name__)
+
+# 단계별 소요시간 히스토그램 버킷 (초)
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    """라벨 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """라벨별 값을 가진 메트릭 공통부"""
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def samples(self):
+        """(접미사, 라벨값, 추가라벨, 값) 목록"""
+        with self._lock:
+            return [('', key, None, value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for suffix, key, extra, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(self.label_names, key, extra)} '
+                         f'{_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        if not self.label_names:
+            self._values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labels=(), callback=None):
+        super().__init__(name, help_text, labels)
+        self._callback = callback
+        if not self.label_names:
+            self._values[()] = 0
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        # 콜백 게이지는 노출 시점에만 계산 (RSS 등 비싼 값)
+        if self._callback is not None:
+            try:
+                self.set(self._callback())
+            except Exception as e:
+                logger.debug("게이지 %s 계산 실패: %s", self.name, e)
+        return super().samples()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=STAGE_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                cumulative = 0
+                for bound, c in zip(self.buckets, counts):
+                    cumulative += c
+                    out.append(('_bucket', key, ('le', _format_value(float(bound))), cumulative))
+                out.append(('_sum', key, None, total))
+                out.append(('_count', key, None, count))
+        return out
+
+
+class Registry:
+    """메트릭 모음과 텍스트 노출"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def _read_ppid_map():
+    """/proc에서 pid -> ppid 매핑 (psutil이 없을 때)"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+            # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 파싱
+            fields = stat[stat.rfind(b')') + 2:].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+
+def child_pids(root_pid=None, recursive=True):
+    """현재 프로세스의 하위 프로세스 pid (playwright 드라이버, chromium 등)
+
+    recursive=False면 직계 자식만 (작업자별 playwright 드라이버 식별용).
+    """
+    root_pid = root_pid or os.getpid()
+    try:
+        import psutil
+        try:
+            return [p.pid for p in psutil.Process(root_pid).children(recursive=recursive)]
+        except psutil.Error:
+            return []
+    except ImportError:
+        pass
+    if not os.path.isdir('/proc'):
+        return []
+
+    children = {}
+    for pid, ppid in _read_ppid_map().items():
+        children.setdefault(ppid, []).append(pid)
+    if not recursive:
+        return children.get(root_pid, [])
+    result, stack = [], [root_pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def process_rss(pid):
+    """프로세스 RSS (바이트), 읽을 수 없으면 0"""
+    try:
+        import psutil
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    except ImportError:
+        pass
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def process_cpu_seconds(pid):
+    """프로세스 누적 CPU 시간 (user + system, 초), 읽을 수 없으면 0"""
+    try:
+        import psutil
+        try:
+            times = psutil.Process(pid).cpu_times()
+            return times.user + times.system
+        except psutil.Error:
+            return 0.0
+    except ImportError:
+        pass
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        fields = stat[stat.rfind(b')') + 2:].split()
+        # state(0) 이후 utime, stime은 11, 12번째 (man proc의 14, 15번 필드)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def browser_rss_bytes():
+    """playwright 드라이버와 chromium 프로세스들의 RSS 합계"""
+    return sum(process_rss(pid) for pid in child_pids())
+
+
+def _result_category(status):
+    """스크래핑결과 값을 라벨용 범주로 축약 ('오류: Timeout ...' -> '오류')"""
+    if not status:
+        return '미분류'
+    return status.split(':', 1)[0].strip()
+
+
+class RunMetrics:
+    """스크래핑 실행 메트릭
+
+    스크래퍼는 이 객체의 메서드만 호출하고, 노출 방식은 serve()/write_textfile()이 정한다.
+    """
+
+    def __init__(self, throughput_window=60.0):
+        self.registry = Registry()
+        r = self.registry
+        self.started = time.time()
+        self._window = throughput_window
+        self._finished_at = deque()
+        self._lock = threading.Lock()
+
+        self.courses = r.register(Counter(
+            'kohi_courses_total', '처리 완료된 교육과정 수 (스크래핑결과 범주별)', ['result']))
+        self.failures = r.register(Counter(
+            'kohi_failures_total', '성공이 아닌 교육과정 수 (스크래핑결과 범주별)', ['result']))
+        self.retries = r.register(Counter(
+            'kohi_retries_total', '재시도 횟수 (단계별)', ['stage']))
+        self.throughput = r.register(Gauge(
+            'kohi_courses_per_second', f'최근 {int(throughput_window)}초 처리량 (과정/초)',
+            callback=self._throughput))
+        self.inflight = r.register(Gauge(
+            'kohi_inflight_pages', '현재 열려 있는 페이지 수'))
+        self.stage_seconds = r.register(Histogram(
+            'kohi_stage_duration_seconds', '단계별 소요시간', ['stage']))
+        self.fetched_bytes = r.register(Counter(
+            'kohi_fetched_bytes_total', '응답 본문 크기 합계 (Content-Length 기준)'))
+        self.cache_requests = r.register(Counter(
+            'kohi_cache_requests_total', '캐시 조회 수', ['cache', 'result']))
+        self.cache_ratio = r.register(Gauge(
+            'kohi_cache_hit_ratio', '캐시 적중률', ['cache']))
+        self.selector_coverage = r.register(Gauge(
+            'kohi_selector_coverage', '추출 명세 필드별 최근 적중률', ['field']))
+        self.selector_drift = r.register(Counter(
+            'kohi_selector_drift_total', '셀렉터 드리프트 경고 횟수', ['field']))
+        self.browser_rss = r.register(Gauge(
+            'kohi_browser_rss_bytes', 'playwright/chromium 프로세스 RSS 합계',
+            callback=browser_rss_bytes))
+        self.browser_cpu = r.register(Gauge(
+            'kohi_browser_cpu_cores', 'playwright/chromium 프로세스 CPU 사용량 (코어 수, 리소스 조절기 표본)'))
+        self.governor_workers = r.register(Gauge(
+            'kohi_governor_workers', '리소스 조절기 작업자 수 (allowed: 허용, active: 처리 중)', ['state']))
+        self.governor_decisions = r.register(Counter(
+            'kohi_governor_decisions_total', '리소스 조절기 결정 (scale_up/scale_down/recycle)', ['action']))
+        self.hedge_requests = r.register(Counter(
+            'kohi_hedge_requests_total', '동시 검색 변형별 결과 (win/match/miss/empty/error/cancelled)',
+            ['variant', 'outcome']))
+        self.uptime = r.register(Gauge(
+            'kohi_run_uptime_seconds', '실행 경과 시간', callback=lambda: time.time() - self.started))
+
+    # --- 스크래퍼 훅 ---
+
+    def observe_stage(self, stage_name, seconds, course=None):
+        self.stage_seconds.observe(seconds, stage=stage_name)
+
+    def course_finished(self, status):
+        category = _result_category(status)
+        self.courses.inc(result=category)
+        if category != '성공':
+            self.failures.inc(result=category)
+        with self._lock:
+            self._finished_at.append(time.monotonic())
+
+    def retry(self, stage_name):
+        self.retries.inc(stage=stage_name)
+
+    def governor_decision(self, action, allowed=None):
+        self.governor_decisions.inc(action=action)
+        if allowed is not None:
+            self.governor_workers.set(allowed, state='allowed')
+
+    def hedge_outcome(self, variant, outcome):
+        self.hedge_requests.inc(variant=variant, outcome=outcome)
+
+    def cache_lookup(self, cache, hit):
+        self.cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+        hits = self.cache_requests.value(cache=cache, result='hit')
+        total = hits + self.cache_requests.value(cache=cache, result='miss')
+        self.cache_ratio.set(hits / total if total else 0.0, cache=cache)
+
+    def attach_page(self, page):
+        """페이지 응답 이벤트로 전송량과 브라우저 캐시 적중 집계
+
+        Playwright는 디스크 캐시 적중을 직접 알려주지 않으므로 304 재검증과
+        서비스워커 응답을 적중으로 센다.
+        """
+        def on_response(response):
+            length = response.headers.get('content-length')
+            if length and length.isdigit():
+                self.fetched_bytes.inc(int(length))
+            self.cache_lookup('browser', response.status == 304 or response.from_service_worker)
+
+        self.inflight.inc()
+        page.on('response', on_response)
+        page.on('close', lambda _: self.inflight.dec())
+
+    def _throughput(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._finished_at and now - self._finished_at[0] > self._window:
+                self._finished_at.popleft()
+            count = len(self._finished_at)
+        elapsed = min(self._window, max(1e-9, time.time() - self.started))
+        return count / elapsed
+
+    # --- 노출 ---
+
+    def render(self):
+        return self.registry.render()
+
+    def serve(self, port, addr='127.0.0.1'):
+        """/metrics HTTP 엔드포인트 시작 (데몬 스레드)"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name='kohi-metrics', daemon=True)
+        thread.start()
+        logger.info("메트릭 엔드포인트: http://%s:%d/metrics", addr, server.server_port)
+        return server
+
+    def write_textfile(self, path):
+        """textfile collector용 파일을 원자적으로 기록"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_textfile(self, path, interval=15.0):
+        """주기적으로 textfile 기록 (데몬 스레드, stop 이벤트 반환)"""
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    logger.warning("메트릭 파일 기록 실패: %s", e)
+
+        threading.Thread(target=loop, name='kohi-metrics-textfile', daemon=True).start()
+        return stop
+
+
+# 프로세스 전역 실행 메트릭 (스크래퍼가 직접 갱신)
+RUN = RunMetrics()
+kohi_logging.add_stage_observer(RUN.observe_stage)
+
+
+def start_exporters(port=None, textfile=None, interval=15.0, addr='127.0.0.1'):
+    """옵션에 따라 HTTP/텍스트 파일 노출 시작, 종료 함수 반환"""
+    server = RUN.serve(port, addr) if port is not None else None
+    stop = RUN.start_textfile(textfile, interval) if textfile else None
+
+    def shutdown():
+        if stop is not None:
+            stop.set()
+            RUN.write_textfile(textfile)
+        if server is not None:
+            server.shutdown()
+
+    return shutdown
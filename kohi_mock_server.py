@@ -0,0 +1,542 @@
+"""
+KOHI 로컬 대역 서버
+이전 스크래핑 결과(CSV)나 저장해 둔 상세 페이지 HTML로 edu.kohi.or.kr의
+검색/상세 화면을 재현한다. 지연과 오류를 주입해 동시성, 타임아웃, 속도 제한을
+실제 서버에 부담 없이 조정할 수 있다.
+
+    python kohi_mock_server.py --records scraped_ultimate_temp.csv --port 8765 \\
+        --latency 0.3 --jitter 0.2 --error-rate 0.02
+    python kohi.py scrape --base-url http://127.0.0.1:8765
+
+재현 범위:
+- BD_paa0010l.do: #planngCrseNm 입력폼과 searchList(), .curriculum__box 카드
+  (--page-size N이면 pageIndex로 N개씩 나누고 .pagination의 fn_link_page(n) 번호 링크)
+- btn_selectPaa0040(crseCd, grnoCd): BD_paa0040d.do로 POST 이동
+- BD_paa0040d.do: h3.tit 제목, h4 섹션, 신청정보/교육구성/수료기준/추천교육과정 표
+  (--recommend N이면 추천교육과정 표에 btn_selectPaa0040 링크가 달린 다른 과정 N개)
+- /static/* 자산, /data/* 이미지, /__stats 요청 통계(JSON)
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from kohi_io import read_rows
+from kohi_options import add_mock_arguments
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = '/pt/pa/paa/BD_paa0010l.do'
+DETAIL_PATH = '/pt/pa/paa/BD_paa0040d.do'
+INDEX_PATH = '/index.do'
+
+# 1x1 투명 GIF (경로별로 다른 내용을 만들기 위해 주석 블록을 덧붙임)
+_GIF_HEADER = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01'
+               b'\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00')
+
+
+class MockConfig:
+    """지연/오류 주입 설정"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, hang_rate=0.0,
+                 hang_seconds=60.0, asset_version='20250101', seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.asset_version = asset_version
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """이번 요청의 (지연초, 동작) 결정: 동작은 'ok' | 'error' | 'hang'"""
+        with self._lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            roll = self.random.random()
+        if roll < self.hang_rate:
+            return delay, 'hang'
+        if roll < self.hang_rate + self.error_rate:
+            return delay, 'error'
+        return delay, 'ok'
+
+
+def load_catalog(records_file):
+    """이전 스크래핑 결과에서 교육과정코드가 있는 행만 카탈로그로 사용"""
+    catalog = []
+    seen = set()
+    for row in read_rows(records_file):
+        code = row.get('교육과정코드')
+        if not code or code in seen:
+            continue
+        seen.add(code)
+        row = {k: v for k, v in row.items() if v}
+        row.setdefault('검색결과_제목', row.get('교육과정명') or row.get('원본_교육과정명', ''))
+        catalog.append(row)
+    return catalog
+
+
+def _e(value):
+    return html.escape(str(value or ''), quote=True)
+
+
+def _caption_headers(caption):
+    """'OO에 관한 표로 A, B, C에 대한 내용을...' 캡션에서 컬럼명 추출"""
+    match = re.search(r'표로\s*(.+?)에\s*대한', caption or '')
+    if not match:
+        return []
+    return [h.strip() for h in match.group(1).split(',') if h.strip()]
+
+
+def _section_parts(text):
+    """'기타_교육구성(이러닝)' 등 기록된 섹션 텍스트를 (캡션, 본문)으로 분리"""
+    if not text:
+        return '', ''
+    match = re.match(r'(.+?(?:담고\s*있다|담고있다)\.)\s*(.*)', text)
+    if not match:
+        return '', text
+    return match.group(1), match.group(2)
+
+
+def _curriculum_rows(headers, body):
+    """교육구성 본문 텍스트를 행으로 복원 (차시/차시명/학습시간 형태)"""
+    # 본문 앞의 헤더 나열 제거
+    header_text = ' '.join(headers)
+    if body.startswith(header_text):
+        body = body[len(header_text):].strip()
+    if len(headers) != 3:
+        return [[body]] if body else []
+    pattern = r'(\d+)\s+(.+?)\s+(\d+\s*(?:분|시간)(?:\s*\d+\s*(?:초|분))?)(?=\s+\d+\s|$)'
+    return [list(m) for m in re.findall(pattern, body)] or ([[body]] if body else [])
+
+
+def render_card(course):
+    """검색 결과 카드 (.curriculum__box) - work.md에 기록된 실제 마크업 구조"""
+    code = _e(course.get('교육과정코드'))
+    group = _e(course.get('교육그룹코드'))
+    onclick = f"btn_selectPaa0040('{code}','{group}');"
+    thumb = course.get('썸네일_이미지') or '/images/common/no_img.gif'
+
+    badge_cls = {'대면': 'face', '라이브': 'live', '하이브리드': 'hybrid',
+                 '이러닝': 'e-learning', 'B/L': 'bl'}.get(course.get('교육형태_구분'), '')
+    status_cls = 'yellow' if course.get('모집상태_구분') == '진행중' else 'gray'
+
+    platforms = course.get('지원플랫폼', '')
+    info_icons = ''.join([
+        '<span class="info--pc">PC</span>' if 'PC' in platforms else '',
+        '<span class="info--mobile">Mobile</span>' if 'Mobile' in platforms else '',
+        '<span class="info--sign">수어</span>' if '수어' in platforms else '',
+    ])
+    teaser = ('<a href="#none" class="slide__link--teaser">맛보기</a>'
+              if course.get('맛보기영상') else '')
+    categories = ''.join(f'<span>{_e(c.strip())}</span>'
+                         for c in (course.get('교육분야') or '').split(',') if c.strip())
+
+    details = []
+    for label, key in [('신청기간', '검색결과_신청기간'), ('교육기간', '검색결과_교육기간'),
+                       ('교육시간', '검색결과_교육시간'), ('신청인원/정원', '검색결과_신청현황')]:
+        if course.get(key):
+            details.append(f'<p>{label} : {_e(course[key])}</p>')
+
+    return f'''<div class="curriculum__box">
+    <div class="curriculum__thumbnail">
+        <a href="#none" onclick="{onclick}">
+            <div class="change-ico-box"><span class="ico charge">{_e(course.get('교육비_구분'))}</span></div>
+            <img src="{_e(thumb)}" alt="{_e(course.get('검색결과_제목'))}">
+        </a>
+        {teaser}
+    </div>
+    <div class="curriculum__info">
+        <div class="curriculum__info--badge">
+            <i class="badge {badge_cls}">{_e(course.get('교육형태'))}</i>
+            {categories}
+        </div>
+        <div class="curriculum__info--badge">
+            <em class="{status_cls}">{_e(course.get('모집상태'))}</em>
+            <em class="gray">{_e(course.get('교육대상_표시'))}</em>
+        </div>
+        <div class="curriculum__info--info">{info_icons}</div>
+        <p class="curriculum__info--title">{_e(course.get('검색결과_제목'))}</p>
+        <div class="curriculum__info--detail">{''.join(details)}</div>
+        <a href="#none" class="btn solid" onclick="{onclick}">수강신청</a>
+    </div>
+</div>'''
+
+
+def _page(title, body, asset_version):
+    return f'''<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{_e(title)}</title>
+<meta property="og:title" content="{_e(title)}">
+<link rel="stylesheet" href="/static/css/common.css?v={asset_version}">
+<script src="/static/js/common.js?v={asset_version}"></script>
+<script>
+function btn_selectPaa0040(crseCd, grnoCd) {{
+    var f = document.getElementById('detailForm');
+    f.crseCd.value = crseCd; f.grnoCd.value = grnoCd; f.submit();
+}}
+function searchList() {{ fn_link_page(1); }}
+function fn_link_page(pageIndex) {{
+    var f = document.getElementById('searchForm');
+    f.pageIndex.value = pageIndex; f.submit();
+}}
+</script></head>
+<body>
+<form id="detailForm" method="post" action="{DETAIL_PATH}">
+<input type="hidden" name="crseCd"><input type="hidden" name="grnoCd"></form>
+{body}
+</body></html>'''
+
+
+def _pagination(page_index, page_count):
+    """eGov 형식 페이지 번호 링크 (현재 페이지는 strong)"""
+    if page_count <= 1:
+        return ''
+    links = [f'<strong class="is-active">{n}</strong>' if n == page_index else
+             f'<a href="#" onclick="fn_link_page({n}); return false;">{n}</a>'
+             for n in range(1, page_count + 1)]
+    return f'<div class="pagination">{"".join(links)}</div>'
+
+
+def render_search_page(query, courses, asset_version, page_index=1, page_count=1):
+    """검색 페이지 (검색어가 있으면 결과 카드 포함, 여러 페이지면 페이지 번호 링크)"""
+    cards = '\n'.join(render_card(c) for c in courses)
+    if query and not courses:
+        cards = '<p class="no-data">검색 결과가 없습니다.</p>'
+    body = f'''<form id="searchForm" method="post" action="{SEARCH_PATH}" onsubmit="return false;">
+<input type="hidden" name="pageIndex" value="{page_index}">
+<input type="text" id="planngCrseNm" name="planngCrseNm" maxlength="50" value="{_e(query)}"
+ onkeydown="if(event.key === 'Enter') searchList();" class="search-filtering__input"
+ title="교육과정명 입력" placeholder="교육과정명을 입력하세요.">
+</form>
+<div class="curriculum">{cards}</div>
+{_pagination(page_index, page_count)}'''
+    return _page('교육과정 검색', body, asset_version)
+
+
+def render_index_page(asset_version):
+    """메인 페이지 (통합 검색창 #srchWord는 교육과정 검색으로 연결)"""
+    body = f'''<form id="mainSearch" method="post" action="{SEARCH_PATH}">
+<input type="text" id="srchWord" name="planngCrseNm" title="통합검색">
+</form>'''
+    return _page('한국보건복지인재원', body, asset_version)
+
+
+def _table(caption, headers, rows, with_thead=True):
+    head = ''
+    if headers:
+        cells = ''.join(f'<th scope="col">{_e(h)}</th>' for h in headers)
+        head = f'<thead><tr>{cells}</tr></thead>' if with_thead else f'<tr>{cells}</tr>'
+    body = ''.join('<tr>' + ''.join(f'<td>{_e(c)}</td>' for c in row) + '</tr>' for row in rows)
+    return f'<table class="tbl"><caption>{_e(caption)}</caption>{head}<tbody>{body}</tbody></table>'
+
+
+def _reco_row(headers, course):
+    """추천교육과정 표 한 행 (과정명 칸에 상세 페이지 링크)"""
+    values = {'구분': '추천', '교육구분': course.get('교육형태', ''),
+              '과정분류': course.get('교육분야', ''),
+              '신청기간': course.get('검색결과_신청기간', ''),
+              '교육기간': course.get('검색결과_교육기간', '')}
+    cells = []
+    for header in headers:
+        if header == '과정명':
+            onclick = f"btn_selectPaa0040('{_e(course.get('교육과정코드'))}','{_e(course.get('교육그룹코드'))}');"
+            cells.append(f'<td><a href="#none" onclick="{onclick}">{_e(course.get("검색결과_제목"))}</a></td>')
+        else:
+            cells.append(f'<td>{_e(values.get(header, ""))}</td>')
+    return '<tr>' + ''.join(cells) + '</tr>'
+
+
+def render_detail_page(course, asset_version, recommended=()):
+    """상세 페이지 (기록된 필드로 섹션과 표 재구성, recommended: 추천교육과정 표에 넣을 과정)"""
+    title = course.get('교육과정명') or course.get('검색결과_제목', '')
+    parts = [f'<h3 class="tit">{_e(title)}</h3>']
+
+    if course.get('교육소개'):
+        parts.append(f'<h4>교육소개</h4><div class="view-data"><p>{_e(course["교육소개"])}</p></div>')
+
+    # 신청정보: th/td 쌍
+    apply_caption, _ = _section_parts(course.get('기타_신청정보', ''))
+    apply_rows = ''.join(
+        f'<tr><th scope="row">{_e(k[3:])}</th><td>{_e(v)}</td></tr>'
+        for k, v in course.items() if k.startswith('신청_'))
+    if apply_rows:
+        parts.append(f'<h4>신청정보</h4><table class="tbl"><caption>{_e(apply_caption)}</caption>'
+                     f'<tbody>{apply_rows}</tbody></table>')
+
+    # 교육구성: '기타_교육구성(...)' 섹션 텍스트에서 표 복원
+    for key, value in course.items():
+        if key.startswith('기타_교육구성'):
+            caption, body = _section_parts(value)
+            headers = _caption_headers(caption)
+            parts.append(f'<h4>{_e(key[3:])}</h4>' +
+                         _table(caption, headers, _curriculum_rows(headers, body)))
+
+    # 수료기준: 헤더 행 + 값 행
+    completion = [(k[3:], v) for k, v in course.items() if k.startswith('수료_')]
+    if completion:
+        caption, _ = _section_parts(course.get('기타_수료기준', ''))
+        parts.append('<h4>수료기준</h4>' + _table(
+            caption, [k for k, _ in completion], [[v for _, v in completion]], with_thead=False))
+
+    # 추천교육과정
+    reco_caption, _ = _section_parts(course.get('기타_추천교육과정', ''))
+    reco_headers = _caption_headers(reco_caption) or ['구분', '교육구분', '과정분류', '과정명',
+                                                      '신청기간', '교육기간']
+    if '과정명' not in reco_headers:
+        reco_headers = reco_headers + ['과정명']
+    cols = len(reco_headers)
+    reco_body = (''.join(_reco_row(reco_headers, c) for c in recommended) or
+                 f'<tr><td colspan="{cols}">추천 교육과정이 없습니다.</td></tr>')
+    reco_table = (f'<table class="tbl"><caption>{_e(reco_caption or "추천교육과정")}</caption>'
+                  '<thead><tr>' + ''.join(f'<th>{_e(h)}</th>' for h in reco_headers) +
+                  f'</tr></thead><tbody>{reco_body}</tbody></table>')
+    parts.append('<h4>추천교육과정</h4>' + reco_table)
+
+    # 개인정보 제3자 제공 안내 (실제 페이지에 있는 표, 기록된 '교육구성' 값)
+    try:
+        privacy = json.loads(course.get('교육구성') or '[]')
+    except ValueError:
+        privacy = []
+    if privacy and isinstance(privacy, list) and isinstance(privacy[0], dict):
+        headers = list(privacy[0])
+        parts.append('<div class="privacy">' + _table(
+            '개인정보 제3자 제공 안내', headers, [[r.get(h, '') for h in headers] for r in privacy]) +
+            '</div>')
+
+    return _page(title, '\n'.join(parts), asset_version)
+
+
+class MockKOHI:
+    """대역 서버 상태 (카탈로그, 주입 설정, 요청 통계)"""
+
+    def __init__(self, catalog, config=None, pages_dir=None, page_size=None, recommend=0):
+        self.catalog = catalog
+        self.recommend = recommend
+        self.by_code = {c['교육과정코드']: c for c in catalog}
+        self.config = config or MockConfig()
+        self.pages_dir = pages_dir
+        self.page_size = page_size
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.server = None
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def search(self, query):
+        """KOHI 검색과 같은 부분 문자열 일치"""
+        query = (query or '').strip()
+        if not query:
+            return []
+        return [c for c in self.catalog if query in c.get('검색결과_제목', '')]
+
+    def recommendations(self, course):
+        """추천 과정 recommend개 (같은 교육분야 우선, 순서는 코드 해시로 고정 - 실행마다 같은 그래프)"""
+        if not self.recommend:
+            return []
+        code = course.get('교육과정코드', '')
+        fields = {f.strip() for f in (course.get('교육분야') or '').split(',') if f.strip()}
+
+        def rank(other):
+            shared = fields & {f.strip() for f in (other.get('교육분야') or '').split(',')}
+            digest = hashlib.sha1(f"{code}>{other.get('교육과정코드')}".encode('utf-8')).hexdigest()
+            return (not shared, digest)
+
+        others = [c for c in self.catalog if c.get('교육과정코드') != code]
+        return sorted(others, key=rank)[:self.recommend]
+
+    def detail_html(self, code):
+        if self.pages_dir:
+            path = os.path.join(self.pages_dir, f'{code}.html')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    return f.read()
+        course = self.by_code.get(code)
+        if course is None:
+            return None
+        return render_detail_page(course, self.config.asset_version, self.recommendations(course))
+
+    # --- 서버 수명 ---
+
+    def start(self, port=0, addr='127.0.0.1'):
+        """백그라운드 스레드에서 서버 시작, base URL 반환"""
+        self.server = ThreadingHTTPServer((addr, port), _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='kohi-mock', daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def _make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug("mock %s", format % args)
+
+        def _params(self):
+            parsed = urlparse(self.path)
+            params = parse_qs(parsed.query)
+            if self.command == 'POST':
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ''
+                params.update(parse_qs(body))
+            return parsed.path, {k: v[-1] for k, v in params.items()}
+
+        def _send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+            data = body if isinstance(body, bytes) else body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(data)
+
+        def _inject(self):
+            """지연/오류 주입, 응답을 이미 보냈으면 True"""
+            delay, action = mock.config.draw()
+            if delay:
+                time.sleep(delay)
+            if action == 'hang':
+                mock.count('injected_hang')
+                time.sleep(mock.config.hang_seconds)
+            elif action == 'error':
+                mock.count('injected_error')
+                self._send(500, '<h1>500 Internal Server Error</h1>')
+                return True
+            return False
+
+        def do_HEAD(self):
+            self.do_GET()
+
+        def do_POST(self):
+            self.do_GET()
+
+        def do_GET(self):
+            path, params = self._params()
+            mock.count(path)
+
+            if path == '/__stats':
+                self._send(200, json.dumps(mock.stats, ensure_ascii=False),
+                           'application/json; charset=utf-8')
+                return
+
+            if path.startswith('/static/'):
+                etag = f'"{mock.config.asset_version}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', headers={'ETag': etag})  # 캐시 재검증
+                    return
+                kind = 'text/css' if path.endswith('.css') else 'application/javascript'
+                self._send(200, f'/* {path} v{mock.config.asset_version} */\n',
+                           f'{kind}; charset=utf-8',
+                           {'Cache-Control': 'public, max-age=31536000',
+                            'ETag': etag})
+                return
+
+            if path.startswith('/data/') or path.startswith('/images/'):
+                # 같은 경로는 항상 같은 바이트 (공유 이미지 재현)
+                digest = hashlib.sha1(path.encode('utf-8')).digest()
+                self._send(200, _GIF_HEADER + digest + b';', 'image/gif',
+                           {'Cache-Control': 'public, max-age=86400'})
+                return
+
+            if path in (SEARCH_PATH, DETAIL_PATH, INDEX_PATH) and self._inject():
+                return
+
+            version = mock.config.asset_version
+            if path == SEARCH_PATH:
+                query = params.get('planngCrseNm', '')
+                courses = mock.search(query)
+                page_index, page_count = 1, 1
+                if mock.page_size:
+                    try:
+                        page_index = max(1, int(params.get('pageIndex') or 1))
+                    except ValueError:
+                        page_index = 1
+                    page_count = max(1, -(-len(courses) // mock.page_size))
+                    start = (page_index - 1) * mock.page_size
+                    courses = courses[start:start + mock.page_size]
+                self._send(200, render_search_page(query, courses, version, page_index, page_count))
+            elif path == DETAIL_PATH:
+                page = mock.detail_html(params.get('crseCd', ''))
+                if page is None:
+                    self._send(404, '<h1>교육과정을 찾을 수 없습니다.</h1>')
+                else:
+                    self._send(200, page)
+            elif path in (INDEX_PATH, '/'):
+                self._send(200, render_index_page(version))
+            else:
+                self._send(404, '<h1>404</h1>')
+
+    return Handler
+
+
+def search_url(base_url, query=None):
+    """대역/실서버 공통 검색 URL (query가 있으면 GET 파라미터 포함)"""
+    url = base_url.rstrip('/') + SEARCH_PATH
+    return f'{url}?{urlencode({"planngCrseNm": query})}' if query else url
+
+
+def build_mock(records_file='scraped_ultimate_temp.csv', pages_dir=None, recommend=0, page_size=None,
+               **config):
+    """기록 파일로 대역 서버 객체 생성"""
+    return MockKOHI(load_catalog(records_file), MockConfig(**config), pages_dir=pages_dir,
+                    page_size=page_size, recommend=recommend)
+
+
+def mock_from_args(args):
+    return build_mock(args.records, pages_dir=args.pages, recommend=args.recommend,
+                      page_size=args.page_size,
+                      latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      hang_rate=args.hang_rate, hang_seconds=args.hang_seconds, seed=args.seed,
+                      asset_version=args.asset_version)
+
+
+def serve_forever(args):
+    """명령행 옵션으로 대역 서버를 띄우고 Ctrl+C까지 대기"""
+    mock = mock_from_args(args)
+    mock.start(args.port, args.host)
+    logger.info("대역 서버 시작: %s (교육과정 %d개)", mock.base_url, len(mock.catalog))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='KOHI 로컬 대역 서버')
+    add_mock_arguments(parser)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--host', default='127.0.0.1')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return serve_forever(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""
+KOHI 결과 정규화 (문자열 컬럼 -> 타입 컬럼)
+기간/신청현황/시간/교육비처럼 텍스트로 저장된 값을 행 단위 re.findall 대신
+pandas 문자열 연산(str.extract)과 NumPy 연산으로 한 번에 변환해 타입 컬럼을 덧붙인다.
+
+    "2025-01-13 ~ 2025-12-12" -> <컬럼>_시작, <컬럼>_종료 (datetime64)
+    "신청일로부터 21 일"      -> <컬럼>_일수 (Int64)
+    "11 / 25 명"              -> <컬럼>_신청인원, <컬럼>_정원 (Int64), <컬럼>_충원율 (float)
+    "1 시간 30 분"            -> <컬럼>_시간수 (float, 1.5)
+    "유료 (5,000원)" / "무료" -> <컬럼>_원 (Int64)
+
+    python kohi.py normalize scraped_ultimate_final.csv --output scraped_normalized.csv
+"""
+
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PERIOD_COLUMNS = ['검색결과_신청기간', '검색결과_교육기간', '신청_신청기간', '신청_교육기간']
+COUNT_COLUMNS = ['검색결과_신청현황', '신청_신청인원_정원']
+HOURS_COLUMNS = ['검색결과_교육시간', '신청_교육시간', '신청_사회복지인정시간']
+FEE_COLUMNS = ['신청_교육비']
+
+# 이러닝 과정은 정원 999999 = 제한 없음 (충원율 계산에서 제외)
+UNLIMITED_CAPACITY = 999999
+
+# 교육구성 JSON 항목에서 학습시간을 읽을 키 (앞쪽 우선)
+CURRICULUM_HOUR_KEYS = ['학습시간', '교육시간', '시간']
+
+PERIOD_PATTERN = r'(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})'
+DAYS_PATTERN = r'(\d+)\s*일'
+COUNT_PATTERN = r'([\d,]+)\s*/\s*([\d,]+)'
+HOURS_PATTERN = r'^\s*(?:(\d+(?:\.\d+)?)\s*시간)?\s*(?:(\d+)\s*분)?'
+FEE_PATTERN = r'(\d+)\s*원'
+
+
+def _text(series):
+    """결측/숫자가 섞인 컬럼을 문자열로 통일"""
+    return series.astype('string').fillna('')
+
+
+def _number(series):
+    """문자열 숫자 -> float64 (해석 불가/결측은 NaN, nullable NA가 섞이지 않도록 NumPy 배열로)"""
+    values = pd.to_numeric(series, errors='coerce')
+    return pd.Series(values.to_numpy(dtype=float, na_value=np.nan), index=series.index)
+
+
+def parse_periods(series):
+    """기간 문자열 -> (시작, 종료, 일수) 컬럼"""
+    text = _text(series)
+    parts = text.str.extract(PERIOD_PATTERN)
+    days = text.str.extract(DAYS_PATTERN)[0]
+    return pd.DataFrame({
+        '시작': pd.to_datetime(parts[0], format='%Y-%m-%d', errors='coerce'),
+        '종료': pd.to_datetime(parts[1], format='%Y-%m-%d', errors='coerce'),
+        # "신청일로부터 N 일"처럼 날짜 범위가 아닌 경우에만 일수로 해석
+        '일수': _number(days.where(parts[0].isna())).astype('Int64'),
+    }, index=series.index)
+
+
+def parse_counts(series):
+    """'11 / 25 명' -> (신청인원, 정원, 충원율)"""
+    parts = _text(series).str.extract(COUNT_PATTERN)
+    enrolled = _number(parts[0].str.replace(',', '', regex=False))
+    capacity = _number(parts[1].str.replace(',', '', regex=False))
+    limited = (capacity > 0) & (capacity < UNLIMITED_CAPACITY)
+    ratio = np.where(limited, enrolled / capacity.where(limited, 1.0), np.nan)
+    return pd.DataFrame({
+        '신청인원': enrolled.astype('Int64'),
+        '정원': capacity.astype('Int64'),
+        '충원율': ratio,
+    }, index=series.index)
+
+
+def parse_hours(series):
+    """'1 시간 30 분', '7시간', '30분' -> 1.5, 7.0, 0.5 ('없음'은 0, 해석 불가는 NaN)"""
+    text = _text(series)
+    parts = text.str.extract(HOURS_PATTERN)
+    hours = _number(parts[0])
+    minutes = _number(parts[1])
+    total = hours.fillna(0) + minutes.fillna(0) / 60
+    total = total.where(hours.notna() | minutes.notna())
+    return total.mask((text.str.strip() == '없음').to_numpy(dtype=bool), 0.0)
+
+
+def parse_fee(series):
+    """'무료' -> 0, '유료 (5,000원)' -> 5000"""
+    text = _text(series).str.replace(',', '', regex=False)
+    fee = _number(text.str.extract(FEE_PATTERN)[0])
+    free = text.str.contains('무료', regex=False).to_numpy(dtype=bool)
+    return fee.mask(free, 0.0).astype('Int64')
+
+
+def curriculum_hours(series):
+    """교육구성 JSON 열 -> 과정별 학습시간 합계 (float 시간)
+
+    JSON 해석만 행 단위이고, 항목을 한 프레임으로 펼친 뒤 시간 변환/합계는 한 번에 처리한다.
+    """
+    records = []
+    for idx, raw in _text(series).items():
+        if not raw.startswith('['):
+            continue
+        try:
+            items = json.loads(raw)
+        except ValueError:
+            continue
+        records.extend((idx, item) for item in items if isinstance(item, dict))
+    if not records:
+        return pd.Series(np.nan, index=series.index, dtype=float)
+
+    items = pd.DataFrame([item for _, item in records],
+                         index=pd.Index([idx for idx, _ in records]))
+    hours = pd.Series(np.nan, index=items.index, dtype=float)
+    for key in CURRICULUM_HOUR_KEYS:
+        if key in items.columns:
+            hours = hours.fillna(parse_hours(items[key]))
+    totals = hours.groupby(level=0).sum(min_count=1)
+    return totals.reindex(series.index)
+
+
+def normalize_frame(df):
+    """타입 컬럼을 덧붙인 DataFrame (원본 문자열 컬럼은 그대로 둠)"""
+    out = df.copy()
+    typed = {}
+
+    for column in PERIOD_COLUMNS:
+        if column in df:
+            parsed = parse_periods(df[column])
+            for part in parsed:
+                if parsed[part].notna().any():
+                    typed[f'{column}_{part}'] = parsed[part]
+    for column in COUNT_COLUMNS:
+        if column in df:
+            parsed = parse_counts(df[column])
+            for part in parsed:
+                typed[f'{column}_{part}'] = parsed[part]
+    for column in HOURS_COLUMNS:
+        if column in df:
+            typed[f'{column}_시간수'] = parse_hours(df[column])
+    for column in FEE_COLUMNS:
+        if column in df:
+            typed[f'{column}_원'] = parse_fee(df[column])
+    if '교육구성' in df:
+        typed['교육구성_학습시간수'] = curriculum_hours(df['교육구성'])
+    if '교육구성_총시간' in df:
+        out['교육구성_총시간'] = _number(df['교육구성_총시간'])
+
+    return pd.concat([out, pd.DataFrame(typed, index=df.index)], axis=1)
+
+
+def read_results(path):
+    """결과 CSV를 문자열 그대로 읽기 (빈 칸은 '')"""
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+
+
+def load_typed(path):
+    """결과 CSV를 읽어 타입 컬럼까지 붙인 DataFrame 반환 (분석/필터링용)"""
+    return normalize_frame(read_results(path))
+
+
+def normalize_file(path, output):
+    """결과 CSV 정규화 후 저장 (.parquet 확장자면 타입을 보존하는 Parquet, 그 외 CSV)"""
+    raw = read_results(path)
+    df = normalize_frame(raw)
+    if output.endswith('.parquet'):
+        df.to_parquet(output, index=False)
+    else:
+        df.to_csv(output, index=False, encoding='utf-8-sig', date_format='%Y-%m-%d')
+    logger.info("정규화 완료: %d행, 타입 컬럼 %d개 -> %s",
+                len(df), len(df.columns) - len(raw.columns), output)
+    return df
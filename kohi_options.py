@@ -0,0 +1,48 @@
+"""
+KOHI 서버 명령 옵션 정의 (kohi.py와 각 모듈의 단독 실행 공용)
+kohi.py는 하위 명령과 상관없이 파서 전체를 만들므로, 옵션 정의를 서버 모듈(http.server 등을 import)에
+두면 report --help 같은 명령도 그 import 비용을 낸다. 옵션 정의만 표준 라이브러리 의존 없이 여기 둔다.
+"""
+
+
+def add_mock_arguments(p):
+    """대역 서버 옵션 (kohi.py mock/bench, kohi_mock_server 단독 실행 공용, kohi_mock_server.mock_from_args가 읽음)"""
+    p.add_argument('--records', default='scraped_ultimate_temp.csv',
+                   help='카탈로그로 쓸 이전 스크래핑 결과 CSV')
+    p.add_argument('--pages', help='기록된 상세 페이지 HTML 디렉터리 (<교육과정코드>.html)')
+    p.add_argument('--latency', type=float, default=0.0, help='요청당 기본 지연(초)')
+    p.add_argument('--jitter', type=float, default=0.0, help='지연 변동 폭(초, ±)')
+    p.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    p.add_argument('--hang-rate', type=float, default=0.0, help='응답 지연(행) 비율 (0~1)')
+    p.add_argument('--hang-seconds', type=float, default=60.0, help='행 주입 시 대기(초)')
+    p.add_argument('--seed', type=int, help='주입 난수 시드')
+    p.add_argument('--recommend', type=int, default=0,
+                   help='상세 페이지 추천교육과정 표에 링크로 넣을 다른 과정 수 (crawl 확인용)')
+    p.add_argument('--page-size', type=int,
+                   help='검색 결과 페이지당 카드 수 (주면 pageIndex로 페이지를 나누고 페이지 번호 링크 표시)')
+    p.add_argument('--asset-version', default='20250101',
+                   help='CSS/JS 주소의 ?v= 버전 (바꿔서 띄우면 --profile 캐시 무효화 확인)')
+
+
+# 상주 브라우저 서버 (kohi_browserd) 기본값: 클라이언트가 서버를 찾는 상태 파일
+BROWSERD_STATE_FILE = 'kohi_browserd.json'
+
+# 임대가 없는 채로 이만큼(초) 지나면 종료
+BROWSERD_IDLE_SECONDS = 900
+
+BROWSERD_HEALTH_INTERVAL = 10.0
+
+
+def add_browserd_arguments(parser):
+    """browserd 명령 옵션 (kohi.py와 kohi_browserd 단독 실행 공용)"""
+    parser.add_argument('--state', default=BROWSERD_STATE_FILE, help='상태 파일 (클라이언트가 서버를 찾는 경로)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='웹소켓 포트 (0: 빈 포트)')
+    parser.add_argument('--idle', type=float, default=BROWSERD_IDLE_SECONDS,
+                        help='연결한 실행이 없는 채로 이만큼(초) 지나면 종료 (0: 계속)')
+    parser.add_argument('--health-interval', type=float, default=BROWSERD_HEALTH_INTERVAL,
+                        help='서버 상태 확인 주기(초)')
+    parser.add_argument('--headed', action='store_true', help='브라우저 창 표시')
+    parser.add_argument('--detach', action='store_true', help='백그라운드로 시작하고 준비되면 반환')
+    parser.add_argument('--status', action='store_true', help='실행 중인 서버에 연결해 상태 출력')
+    parser.add_argument('--stop', action='store_true', help='실행 중인 서버 종료')
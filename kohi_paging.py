@@ -0,0 +1,125 @@
+"""
+KOHI 검색 결과 페이지 순회 (지연 반복자)
+스크래퍼는 첫 결과 페이지의 카드만 보지만, 단어를 줄여 가는 재시도처럼 넓은 검색어는 맞는 과정을 뒷페이지로 밀어낼 수 있다.
+결과 페이지를 필요할 때만 하나씩 넘기는 반복자로 카드 제목을 교육명과 비교해,
+현재 페이지에 확실히 맞는 카드가 있으면 바로 멈추고 없을 때만 다음 페이지를 연다.
+
+- 브라우저: 페이지 번호 링크(.pagination/.paging 안의 숫자 n+1)를 눌러 이동, 링크가 없으면 마지막 페이지
+- HTTP: kohi_watch.CardFetcher.pages()가 pageIndex를 늘려 가며 같은 방식으로 순회
+- 끝까지 맞는 카드가 없으면 1페이지 첫 카드 (기존 동작)
+"""
+
+import logging
+import re
+
+from kohi_deadline import Deadline, DeadlineExceeded
+from kohi_hedge import MATCH_THRESHOLD, title_score
+from kohi_spec import CARD_FIELDS, CARD_SELECTOR
+
+logger = logging.getLogger(__name__)
+
+# 검색어당 최대로 볼 결과 페이지 수
+MAX_PAGES = 5
+
+PAGE_PARAM = 'pageIndex'
+
+PAGE_LINK_SELECTOR = '.pagination a, .paging a, .board-paging a'
+
+TITLE_SELECTORS = next(f['selectors'] for f in CARD_FIELDS if f['name'] == '검색결과_제목')
+
+# 페이지의 모든 카드 제목을 한 번의 호출로
+_TITLES_JS = """
+([roots, selectors]) => Array.from(document.querySelectorAll(roots)).map(card => {
+  for (const sel of selectors) {
+    const el = card.querySelector(sel);
+    if (el) return el.textContent.trim();
+  }
+  return '';
+})
+"""
+
+
+def best_match(course_name, titles):
+    """제목 목록에서 교육명과 가장 잘 맞는 (번호, 점수) (같으면 앞 카드, 비어 있으면 (None, 0))"""
+    best, best_score = None, 0.0
+    for index, title in enumerate(titles):
+        score = title_score(course_name, title)
+        if best is None or score > best_score:
+            best, best_score = index, score
+    return best, best_score
+
+
+def card_titles(page):
+    return page.evaluate(_TITLES_JS, [CARD_SELECTOR, TITLE_SELECTORS])
+
+
+def go_to_page(page, number, deadline=None):
+    """결과 페이지 번호 링크로 이동 (링크가 없으면 False)"""
+    deadline = deadline or Deadline(None)
+    link = page.locator(PAGE_LINK_SELECTOR).filter(has_text=re.compile(rf'^\s*{number}\s*$')).first
+    if link.count() == 0:
+        return False
+    try:
+        with page.expect_navigation(timeout=deadline.ms(30000), wait_until="domcontentloaded"):
+            link.click()
+    except DeadlineExceeded:
+        raise
+    except Exception:
+        # 비동기(ajax) 페이지 이동이면 네트워크가 조용해질 때까지
+        page.wait_for_load_state("networkidle", timeout=deadline.ms(10000))
+    try:
+        page.wait_for_selector(CARD_SELECTOR, timeout=deadline.ms(5000))
+    except DeadlineExceeded:
+        raise
+    except Exception:
+        logger.debug("  %d페이지 카드 대기 시간 초과", number)
+    return True
+
+
+def iter_result_pages(page, deadline=None, max_pages=MAX_PAGES):
+    """(페이지 번호, 카드 제목 목록)을 지연 생성 (다음 페이지는 소비자가 더 요청할 때만 연다)"""
+    number = 1
+    while True:
+        titles = card_titles(page)
+        if not titles:
+            return
+        yield number, titles
+        if number >= max_pages or not go_to_page(page, number + 1, deadline):
+            return
+        number += 1
+
+
+def find_matching_card(page, course_name, deadline=None, threshold=MATCH_THRESHOLD,
+                       max_pages=MAX_PAGES):
+    """교육명과 맞는 카드 -> (카드 locator, 페이지 번호, 점수), 카드가 하나도 없으면 (None, 0, 0)
+
+    맞는 카드가 있는 페이지에서 멈추고, 끝까지 없으면 1페이지로 돌아가 첫 카드를 반환한다.
+    """
+    current = 0
+    for number, titles in iter_result_pages(page, deadline, max_pages):
+        current = number
+        index, score = best_match(course_name, titles)
+        if score >= threshold:
+            if number > 1:
+                logger.info("  %d페이지에서 맞는 결과 발견: %s", number, titles[index])
+            return page.locator(CARD_SELECTOR).nth(index), number, score
+    if current == 0:
+        return None, 0, 0.0
+    if current > 1:
+        go_to_page(page, 1, deadline)
+    titles = card_titles(page)
+    return page.locator(CARD_SELECTOR).first, 1, title_score(course_name, titles[0] if titles else '')
+
+
+def find_matching_cards(pages, course_name, threshold=MATCH_THRESHOLD):
+    """HTTP 카드 페이지 반복자 -> (카드 dict, 페이지 번호, 점수) (규칙은 find_matching_card와 같음)"""
+    first = None
+    for number, cards in enumerate(pages, 1):
+        index, score = best_match(course_name, [c.get('검색결과_제목') for c in cards])
+        if index is None:
+            break
+        if first is None:
+            first = (cards[0], 1, title_score(course_name, cards[0].get('검색결과_제목')))
+        if score >= threshold:
+            return cards[index], number, score
+    return first or (None, 0, 0.0)
@@ -0,0 +1,232 @@
+"""
+KOHI 스크래핑 우선순위 스케줄러
+work.csv 행 순서 대신, 이전 결과(스냅샷)에서 읽은 신호로 과정마다 우선순위를 매겨
+급하고 자주 바뀌는 과정부터 처리한다. 시간 예산을 주면 예산 안에서 우선순위가 높은 과정만 처리하고
+나머지는 이번 실행에서 제외한다 (제외된 과정은 임시 파일에 없으므로 resume 때 다시 대상이 됨).
+
+    python kohi.py scrape --priority --history scraped_ultimate_final.csv --history watch_events.jsonl \\
+        --time-budget 3600
+    python kohi.py schedule --history scraped_ultimate_final.csv      # 처리 순서와 신호만 출력
+
+신호 (각 0~1, WEIGHTS로 가중합):
+- status:  모집중 1, 모집예정 0.6, 기록 없음 0.5, 그 외(마감, 신청기간 지남 등) 0
+- urgency: 모집중이고 신청 마감까지 남은 일수가 적을수록 1에 가까움 (URGENCY_DAYS일 이상이면 0)
+- change:  연속 스냅샷 사이 모집상태/신청현황이 바뀐 비율 + watch 변경 이벤트
+- failure: 마지막 시도가 실패(오류/타임아웃)면 1을 실패 횟수로 나눈 값 (반복 실패는 점점 뒤로)
+같은 실행에서 다시 대기열에 들어온 과정(시간 예산 소진 재시도 등)은 시도 횟수만큼 우선순위가 낮아진다.
+"""
+
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List
+
+from kohi_io import read_rows
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = {'status': 3.0, 'urgency': 4.0, 'change': 2.0, 'failure': 1.0}
+
+STATUS_SCORES = {'모집중': 1.0, '모집예정': 0.6}
+UNKNOWN_STATUS = 0.5
+
+# 신청 마감까지 이 일수 이상 남았으면 급하지 않음
+URGENCY_DAYS = 30
+
+# 과정 하나 처리 시간 초기 추정치(초, 실행 중 실제 소요시간으로 갱신)
+DEFAULT_COURSE_SECONDS = 20.0
+
+# 같은 실행에서 다시 들어온 과정의 시도당 감점
+RETRY_PENALTY = 1.0
+
+# 비교할 카드 필드 (kohi_watch.WATCH_FIELDS와 같은 의미)
+CHANGE_FIELDS = ('검색결과_신청현황', '모집상태')
+
+_PERIOD = re.compile(r'(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})')
+
+
+def _failed(status):
+    return (status or '').startswith(('오류', '타임아웃'))
+
+
+def _period_end(text):
+    match = _PERIOD.search(text or '')
+    return date.fromisoformat(match.group(2)) if match else None
+
+
+class CourseHistory:
+    """교육명별 과거 스냅샷 행과 watch 변경 이벤트 수"""
+
+    def __init__(self):
+        self.snapshots: Dict[str, List[dict]] = {}
+        self.events: Dict[str, int] = {}
+        self._names_by_code = {}
+
+    def add_snapshot(self, rows):
+        """결과 CSV 행 목록 하나 (오래된 스냅샷부터 추가)"""
+        for row in rows:
+            name = row.get('원본_교육과정명') or row.get('교육명')
+            if not name:
+                continue
+            self.snapshots.setdefault(name, []).append(row)
+            # 교육과정_코드: 이전 최적화 스크래퍼가 쓰던 컬럼명 (예전 결과 파일 읽기용)
+            code = row.get('교육과정코드') or row.get('교육과정_코드')
+            if code:
+                self._names_by_code[code] = name
+
+    def add_events(self, path):
+        """watch 이벤트 JSONL에서 과정별 변경 이벤트 수 (과정코드 -> 교육명은 스냅샷 기준)"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                name = self._names_by_code.get(event.get('course'))
+                if name and event.get('event') == 'change':
+                    self.events[name] = self.events.get(name, 0) + 1
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]):
+        """CSV는 스냅샷, .jsonl은 watch 이벤트 (CSV를 먼저 모두 읽어 코드 -> 교육명 매핑)"""
+        history = cls()
+        paths = list(paths)
+        for path in paths:
+            if not path.endswith('.jsonl'):
+                history.add_snapshot(read_rows(path))
+        for path in paths:
+            if path.endswith('.jsonl'):
+                history.add_events(path)
+        return history
+
+    def signals(self, name, today=None) -> Dict[str, float]:
+        """교육명 하나의 우선순위 신호 (각 0~1)"""
+        today = today or date.today()
+        rows = self.snapshots.get(name, [])
+        # 가장 최근의 성공한 스냅샷에서 모집상태/신청기간
+        latest = next((r for r in reversed(rows) if r.get('모집상태') or r.get('검색결과_신청기간')), None)
+        status = (latest or {}).get('모집상태', '')
+        signals = {'status': STATUS_SCORES.get(status, 0.0) if latest else UNKNOWN_STATUS,
+                   'urgency': 0.0, 'change': 0.0, 'failure': 0.0}
+
+        end = _period_end((latest or {}).get('검색결과_신청기간') or (latest or {}).get('신청_신청기간'))
+        if end is not None and end < today:
+            signals['status'] = 0.0  # 기록 당시 모집중이어도 신청기간이 지났으면 마감
+        elif status == '모집중' and end is not None:
+            signals['urgency'] = max(0.0, 1.0 - (end - today).days / URGENCY_DAYS)
+
+        states = [tuple(r.get(f, '') for f in CHANGE_FIELDS) for r in rows if not _failed(r.get('스크래핑결과'))]
+        changes = sum(1 for a, b in zip(states, states[1:]) if a != b) + self.events.get(name, 0)
+        if changes:
+            signals['change'] = min(1.0, changes / max(1, len(states) - 1 + self.events.get(name, 0)))
+
+        failures = sum(1 for r in rows if _failed(r.get('스크래핑결과')))
+        if rows and _failed(rows[-1].get('스크래핑결과')):
+            signals['failure'] = 1.0 / failures
+        return signals
+
+
+class PriorityScheduler:
+    """신호 가중합으로 과정 순서를 정하고 시간 예산을 관리"""
+
+    def __init__(self, history=None, weights=None, budget=None,
+                 course_seconds=DEFAULT_COURSE_SECONDS, today=None):
+        self.history = history or CourseHistory()
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.budget = budget or None        # 초, None이면 제한 없음
+        self.estimate = course_seconds      # 과정당 처리 시간 추정 (EWMA)
+        self.today = today
+        self.started = None
+        self.processed = 0
+        self.dropped = []
+        self._lock = threading.Lock()
+
+    def priority(self, name, attempts=0) -> float:
+        signals = self.history.signals(name, self.today)
+        score = sum(self.weights.get(key, 0.0) * value for key, value in signals.items())
+        return score - RETRY_PENALTY * attempts
+
+    def order(self, names) -> List[str]:
+        """우선순위 내림차순 (같으면 입력 순서)"""
+        return sorted(names, key=lambda n: -self.priority(n))
+
+    def observe(self, seconds):
+        """과정 하나의 실제 소요시간으로 추정치 갱신"""
+        with self._lock:
+            self.processed += 1
+            self.estimate = 0.8 * self.estimate + 0.2 * seconds
+
+    def exhausted(self):
+        """다음 과정을 시작하면 예산을 넘길지 (추정 소요시간 기준)"""
+        if self.budget is None or self.started is None:
+            return False
+        return time.monotonic() - self.started + self.estimate > self.budget
+
+    def queue(self, items, key=lambda item: item[1]):
+        """deque처럼 쓰는 우선순위 대기열 (key: 항목 -> 교육명)"""
+        self.started = time.monotonic()
+        return ScheduledQueue(self, items, key)
+
+    def log_summary(self):
+        if self.dropped:
+            logger.info("⏱️ 시간 예산(%ds) 소진으로 %d개 과정 제외 (resume 시 다시 대상): %s",
+                        self.budget, len(self.dropped), ', '.join(self.dropped[:10]) +
+                        (' ...' if len(self.dropped) > 10 else ''))
+
+
+class ScheduledQueue:
+    """run_scrape의 작업 대기열 (popleft/append/len, 스레드 안전)
+
+    popleft는 우선순위가 가장 높은 항목을 꺼내고, 시간 예산이 끝났으면 남은 항목을 모두
+    제외 목록으로 옮긴 뒤 IndexError(빈 대기열)를 낸다. append로 다시 넣은 항목은
+    시도 횟수만큼 감점된 우선순위로 들어간다.
+    """
+
+    def __init__(self, scheduler: PriorityScheduler, items, key):
+        self.scheduler = scheduler
+        self.key = key
+        self._heap = []
+        self._seq = 0
+        self._attempts = {}
+        self._lock = threading.Lock()
+        for item in items:
+            self._push(item)
+
+    def _push(self, item):
+        name = self.key(item)
+        attempts = self._attempts.get(name, 0)
+        heapq.heappush(self._heap, (-self.scheduler.priority(name, attempts), self._seq, item))
+        self._seq += 1
+
+    def append(self, item):
+        with self._lock:
+            name = self.key(item)
+            self._attempts[name] = self._attempts.get(name, 0) + 1
+            self._push(item)
+
+    def popleft(self):
+        with self._lock:
+            if self._heap and self.scheduler.exhausted():
+                self.scheduler.dropped.extend(self.key(item) for _, _, item in sorted(self._heap))
+                self._heap.clear()
+            if not self._heap:
+                raise IndexError('pop from an empty queue')
+            return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def preview(names, history_files=(), today=None, limit=None) -> List[str]:
+    """처리 순서와 신호 표 (kohi.py schedule)"""
+    scheduler = PriorityScheduler(CourseHistory.from_files(history_files), today=today)
+    lines = [f"{'순위':>4} {'점수':>6} {'모집':>5} {'마감':>5} {'변경':>5} {'실패':>5}  교육명"]
+    for rank, name in enumerate(scheduler.order(names)[:limit], 1):
+        s = scheduler.history.signals(name, today)
+        lines.append(f"{rank:>4} {scheduler.priority(name):>6.2f} {s['status']:>5.2f} {s['urgency']:>5.2f} "
+                     f"{s['change']:>5.2f} {s['failure']:>5.2f}  {name}")
+    return lines
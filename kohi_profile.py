@@ -0,0 +1,160 @@
+"""
+KOHI 브라우저 프로필 / 자산 캐시 (실행 간 공유)
+과정마다 빈 프로필로 chromium.launch()를 하면 매번 사이트 CSS/JS 번들을 다시 받고 첫 방문 리다이렉트를 다시 거친다.
+프로필을 쓰면 작업자마다 디스크 HTTP 캐시가 있는 chromium 사용자 데이터 디렉터리(launch_persistent_context)를
+유지하고, 쿠키/localStorage(storageState)를 state.json에 저장해 새 작업자 디렉터리에도 심는다.
+
+    python kohi.py scrape --profile kohi_profile
+
+    kohi_profile/
+        meta.json          # 대상 사이트와 자산 버전 지문
+        state.json         # 마지막으로 닫힌 컨텍스트의 storageState
+        chromium-1/ ...    # 작업자(스레드)별 사용자 데이터 디렉터리 (동시에 같은 디렉터리를 쓸 수 없음)
+
+- 실행 시작 시 index.do의 CSS/JS 주소(?v= 버전 포함)로 지문을 만들어, 바뀌었으면 디스크 캐시만 비움 (쿠키는 유지)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = 'kohi_profile'
+
+INDEX_PATH = '/index.do'
+
+# 자산 버전이 바뀌면 지우는 chromium 캐시 디렉터리 (사용자 데이터 디렉터리 기준)
+CACHE_DIRS = [os.path.join('Default', 'Cache'), os.path.join('Default', 'Code Cache'),
+              os.path.join('Default', 'Service Worker', 'CacheStorage')]
+
+_ASSET = re.compile(r'''(?:href|src)=["']([^"']+\.(?:css|js)(?:\?[^"']*)?)["']''')
+
+# localStorage 시드 (아직 없는 키만, 현재 origin 항목만)
+_SEED_STORAGE_JS = """
+(() => {
+  const origins = %s;
+  const entry = origins.find(o => o.origin === location.origin);
+  if (!entry) return;
+  for (const item of entry.localStorage || []) {
+    if (localStorage.getItem(item.name) === null) localStorage.setItem(item.name, item.value);
+  }
+})();
+"""
+
+
+def _write_json(path, data):
+    """임시 파일에 쓴 뒤 교체 (중단되어도 기존 파일 유지)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def asset_fingerprint(markup):
+    """페이지가 불러오는 CSS/JS 주소 목록의 해시 (주소의 ?v= 버전이 바뀌면 달라짐)"""
+    assets = sorted(set(_ASSET.findall(markup or '')))
+    return hashlib.sha256('\n'.join(assets).encode('utf-8')).hexdigest()[:16], assets
+
+
+class BrowserProfile:
+    """작업자별 영속 chromium 프로필 + 공유 storageState"""
+
+    def __init__(self, root=PROFILE_DIR):
+        self.root = root
+        self.state_file = os.path.join(root, 'state.json')
+        self.meta_file = os.path.join(root, 'meta.json')
+        self._local = threading.local()
+        self._slots = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _read_json(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # --- 자산 버전 확인 ---
+
+    def prepare(self, base_url, timeout=10.0):
+        """사이트 자산 지문 확인, 바뀌었으면 작업자 디렉터리의 디스크 캐시 삭제 (바뀌었는지 반환)"""
+        url = base_url.rstrip('/') + INDEX_PATH
+        try:
+            request = Request(url, headers={'User-Agent': 'Mozilla/5.0 (kohi-profile)'})
+            with urlopen(request, timeout=timeout) as response:
+                charset = response.headers.get_content_charset() or 'utf-8'
+                markup = response.read().decode(charset, errors='replace')
+        except OSError as e:
+            logger.warning("자산 버전 확인 실패 (캐시 유지): %s", e)
+            return False
+
+        fingerprint, assets = asset_fingerprint(markup)
+        meta = self._read_json(self.meta_file) or {}
+        changed = meta.get('base_url') != base_url or meta.get('assets') != fingerprint
+        if changed and meta:
+            removed = self.clear_cache()
+            logger.info("사이트 자산 버전 변경 (%s -> %s): 디스크 캐시 %d개 삭제",
+                        meta.get('assets'), fingerprint, removed)
+        if changed:
+            _write_json(self.meta_file, {'base_url': base_url, 'assets': fingerprint, 'urls': assets})
+        return changed
+
+    def slot_dirs(self):
+        return sorted(os.path.join(self.root, name) for name in os.listdir(self.root)
+                      if name.startswith('chromium-'))
+
+    def clear_cache(self):
+        """모든 작업자 디렉터리의 HTTP/코드 캐시 삭제 (쿠키와 localStorage는 유지)"""
+        removed = 0
+        for slot_dir in self.slot_dirs():
+            for cache_dir in CACHE_DIRS:
+                path = os.path.join(slot_dir, cache_dir)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+        return removed
+
+    # --- 컨텍스트 ---
+
+    def user_data_dir(self):
+        """현재 스레드의 작업자 디렉터리 (스레드마다 chromium-1, chromium-2, ... 고정)"""
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            with self._lock:
+                self._slots += 1
+                slot = self._local.slot = self._slots
+        return os.path.join(self.root, f'chromium-{slot}')
+
+    def open(self, playwright_instance, **options):
+        """영속 컨텍스트 실행 (새 작업자 디렉터리면 저장된 storageState를 심음)"""
+        user_data_dir = self.user_data_dir()
+        fresh = not os.path.isdir(user_data_dir)
+        context = playwright_instance.chromium.launch_persistent_context(user_data_dir, **options)
+        state = self._read_json(self.state_file) if fresh else None
+        if state:
+            if state.get('cookies'):
+                context.add_cookies(state['cookies'])
+            if state.get('origins'):
+                context.add_init_script(_SEED_STORAGE_JS % json.dumps(state['origins'], ensure_ascii=False))
+        return context
+
+    def page(self, context):
+        """영속 컨텍스트는 빈 페이지 하나를 열어 둔 상태로 시작"""
+        return context.pages[0] if context.pages else context.new_page()
+
+    def close(self, context):
+        """storageState 저장 후 컨텍스트 종료 (저장 실패가 스크래핑을 막지 않도록)"""
+        try:
+            state = context.storage_state()
+            with self._lock:
+                _write_json(self.state_file, state)
+        except Exception as e:
+            logger.warning("storageState 저장 실패: %s", e)
+        context.close()
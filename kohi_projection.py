@@ -0,0 +1,98 @@
+"""
+KOHI 컬럼 투영 (실행에 필요한 출력 컬럼만 추출)
+모집상태/신청현황만 필요한 감시성 실행이나 교육소개만 필요한 실행에서도 상세 페이지의 h4 섹션, 모든 표,
+첨부자료, 메타 태그를 다 읽지 않도록, 실행이 필요로 하는 컬럼을 선언하면 추출 명세(kohi_spec)의
+필드별 'columns' 선언과 맞춰 필요한 필드만 실행한다.
+
+    python kohi.py scrape --columns 모집상태,검색결과_신청현황     # 카드만, 상세 페이지 이동 없음
+    python kohi.py scrape --columns 교육소개                       # 상세 페이지의 h4 섹션만
+    python kohi.py scrape --columns '교육과정명,신청_*'            # 끝에 *면 접두어
+
+- 상세 명세에서 필요한 필드가 없으면 상세 페이지 이동(btn_selectPaa0040) 자체를 건너뜀
+- 결과 행은 요청 컬럼과 실행 기록 컬럼(ALWAYS_COLUMNS: 과정 식별, 스크래핑결과 등)만 남김
+- 스크래핑결과는 요청 컬럼 중 찾은 비율로 판정 (절반 이상 성공, 하나라도 부분 성공)
+"""
+
+import logging
+
+from kohi_spec import CARD_FIELDS, DETAIL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 투영과 상관없이 항상 남기는 컬럼 (이어하기/우선순위/자식 CSV/보관소가 쓰는 식별·기록 컬럼)
+ALWAYS_COLUMNS = (
+    '원본_교육과정명', '스크래핑_시각', '검색어', '스크래핑결과', '수집_필드수',
+    '교육과정코드', '교육그룹코드',
+    '검색결과_페이지', '검색결과수', '상세페이지_URL',
+)
+
+
+def _overlaps(a, b):
+    """컬럼 이름/접두어 패턴(끝이 *) 두 개가 같은 컬럼을 가리킬 수 있는지"""
+    a_prefix, b_prefix = a.endswith('*'), b.endswith('*')
+    a, b = a.rstrip('*'), b.rstrip('*')
+    if a_prefix and b_prefix:
+        return a.startswith(b) or b.startswith(a)
+    if a_prefix:
+        return b.startswith(a)
+    if b_prefix:
+        return a.startswith(b)
+    return a == b
+
+
+def _field_columns(fields):
+    return [column for f in fields for column in (f.get('columns') or [f['name']])]
+
+
+class Projection:
+    """실행이 필요로 하는 출력 컬럼 (kohi_spec.ExtractionProgram.extract에 넘김)"""
+
+    def __init__(self, columns):
+        self.columns = tuple(dict.fromkeys(c.strip() for c in columns if c and c.strip()))
+        self._wanted = self.columns + ALWAYS_COLUMNS
+
+    def wants(self, produced):
+        """명세 필드가 만드는 컬럼 목록 중 하나라도 필요한지"""
+        return any(_overlaps(column, want) for column in produced for want in self._wanted)
+
+    def keeps(self, column):
+        return any(_overlaps(column, want) for want in self._wanted)
+
+    @property
+    def needs_detail(self):
+        """상세 페이지 명세에서 읽을 필드가 있는지 (없으면 상세 페이지로 이동하지 않음)"""
+        return self.wants(_field_columns(DETAIL_FIELDS))
+
+    def unknown(self):
+        """어떤 명세 필드도 만들지 않는 요청 컬럼 (오타 확인용)"""
+        produced = _field_columns(CARD_FIELDS) + _field_columns(DETAIL_FIELDS) + list(ALWAYS_COLUMNS)
+        return [c for c in self.columns if not any(_overlaps(c, p) for p in produced)]
+
+    def trim(self, record):
+        """요청하지 않은 컬럼 제거 (같은 레코드 반환)"""
+        for column in [c for c in record.keys() if not self.keeps(c)]:
+            del record[column]
+        return record
+
+    def found(self, record):
+        """요청 컬럼 중 값이 있는 수 (접두어는 맞는 컬럼이 하나라도 있으면 1)"""
+        return sum(1 for want in self.columns if any(_overlaps(c, want) for c in record.keys()))
+
+    def __repr__(self):
+        return f"Projection({', '.join(self.columns)})"
+
+
+def from_option(value):
+    """--columns 값(쉼표 구분 문자열 또는 설정 파일의 목록) -> Projection, 비어 있으면 None"""
+    if not value:
+        return None
+    columns = value.split(',') if isinstance(value, str) else value
+    projection = Projection(columns)
+    if not projection.columns:
+        return None
+    unknown = projection.unknown()
+    if unknown:
+        logger.warning("추출 명세에 없는 컬럼 (무시됨): %s", ', '.join(unknown))
+    logger.info("컬럼 투영: %s (상세 페이지 %s)", ', '.join(projection.columns),
+                '읽음' if projection.needs_detail else '건너뜀')
+    return projection
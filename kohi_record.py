@@ -0,0 +1,198 @@
+"""
+KOHI 과정 결과 레코드 (__slots__, 고정 컬럼 값 배열 + 드문 필드 저장소)
+과정마다 dict를 만들면 행마다 한국어 문자열 키(f'신청_{key}', f'수료_{h}' 등)를 새로 만들고 키 해시 테이블을 따로 갖는다.
+CourseRecord는 거의 모든 행에 있는 컬럼(FIELDS)을 키 없이 위치로만 담고, 드문 컬럼만 작은 dict(키는 sys.intern으로 공유)에 담는다.
+dict와 같은 매핑 인터페이스(get/update/items/[] ...)라 스크래퍼/후처리 코드는 그대로 쓴다.
+
+ColumnBuffer는 레코드의 값 배열을 그대로 모아 한 번에 컬럼으로 전치하므로, 행 dict마다 키를 맞추지 않고
+CSV/DataFrame을 만든다.
+
+- 반복/컬럼 순서는 FIELDS 순서(기존 결과 CSV 컬럼 순서) 다음 드문 필드가 처음 나타난 순서
+"""
+
+import csv
+import os
+import sys
+from collections.abc import MutableMapping
+
+# 위치로 담는 컬럼 (기존 결과 CSV의 컬럼 순서)
+FIELDS = (
+    '원본_교육과정명', '스크래핑_시각', '검색어', '스크래핑결과',
+    '썸네일_이미지', '교육비_구분', '교육형태', '교육형태_구분', '교육분야', '모집상태', '모집상태_구분',
+    '교육대상_표시', '지원플랫폼', '맛보기영상',
+    '검색결과_신청기간', '검색결과_교육기간', '검색결과_교육시간', '검색결과_신청현황',
+    '교육과정코드', '교육그룹코드', '검색결과_제목', '검색결과_페이지', '검색결과수',
+    '상세페이지_URL', '교육과정명', '교육소개',
+    '기타_신청정보', '기타_교육구성(이러닝)', '기타_수료기준', '기타_추천교육과정',
+    '신청_교육대상', '신청_기수', '신청_신청기간', '신청_교육기간', '신청_교육비', '신청_교육시간',
+    '신청_신청인원_정원', '신청_사회복지인정시간', '신청_교육장소', '신청_숙박여부',
+    '교육구성', '교육구성_과목수', '교육구성_총시간',
+    '수료_학습진도', '수료_시험', '수료_과제', '수료_토론', '수료_설문조사', '수료_수료기준점수',
+    '추천교육과정', '추천교육과정_수', '다운로드_자료', '메타_설명', '메타_이미지',
+    '수집_필드수',
+)
+
+_INDEX = {name: i for i, name in enumerate(FIELDS)}
+_WIDTH = len(FIELDS)
+
+
+class CourseRecord(MutableMapping):
+    """과정 결과 한 행 (dict처럼 쓰는 슬롯 레코드)
+
+    _values: FIELDS 순서의 고정 길이 값 목록, _extras: 드문 컬럼 dict 또는 None.
+    None 값은 컬럼이 없는 것과 같다 (CSV에서는 어차피 빈 칸, DataFrame에서는 NaN).
+    """
+
+    __slots__ = ('_values', '_extras')
+
+    def __init__(self, data=(), **fields):
+        self._values = [None] * _WIDTH
+        self._extras = None
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+    def __getitem__(self, key):
+        i = _INDEX.get(key)
+        value = self._extras.get(key) if i is None and self._extras else (
+            None if i is None else self._values[i])
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        i = _INDEX.get(key)
+        if i is not None:
+            self._values[i] = value
+        elif value is not None:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[sys.intern(key)] = value
+        elif self._extras:
+            self._extras.pop(key, None)
+
+    def __delitem__(self, key):
+        self[self._check(key)] = None
+
+    def _check(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return key
+
+    def update(self, data=(), **fields):
+        """dict.update와 같음 (매핑이면 items()로 한 번에)"""
+        pairs = data.items() if hasattr(data, 'items') else data
+        for key, value in pairs:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def items(self):
+        """(컬럼, 값) 목록 (FIELDS 순서 다음 드문 컬럼 추가 순서)"""
+        pairs = [(name, value) for name, value in zip(FIELDS, self._values) if value is not None]
+        if self._extras:
+            pairs.extend(self._extras.items())
+        return pairs
+
+    def keys(self):
+        return [name for name, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return _WIDTH - self._values.count(None) + len(self._extras or ())
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        i = _INDEX.get(key)
+        if i is None:
+            return self._extras.get(key, default) if self._extras else default
+        value = self._values[i]
+        return default if value is None else value
+
+    def copy(self):
+        return CourseRecord(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (CourseRecord, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f'CourseRecord({dict(self.items())!r})'
+
+    def __reduce__(self):
+        # 프로세스 풀(reextract)로 주고받을 때
+        return (CourseRecord, (dict(self.items()),))
+
+
+def as_records(rows):
+    """dict 행 목록 -> CourseRecord 목록 (이미 레코드면 그대로)"""
+    return [row if isinstance(row, CourseRecord) else CourseRecord(row) for row in rows]
+
+
+class ColumnBuffer:
+    """레코드의 값 배열을 모아 두었다가 컬럼 단위로 DataFrame/CSV를 만드는 버퍼
+
+    고정 컬럼은 값 배열을 zip으로 한 번에 전치하고, 드문 컬럼만 행 번호로 채운다.
+    컬럼 순서는 FIELDS 중 값이 있는 컬럼, 그 다음 드문 컬럼이 처음 나타난 순서.
+    """
+
+    def __init__(self, rows=()):
+        self.values = []        # 행마다 CourseRecord._values
+        self.extras = []        # (행 번호, 드문 컬럼 dict)
+        self.extend(rows)
+
+    def append(self, row):
+        if not isinstance(row, CourseRecord):
+            row = CourseRecord(row)
+        if row._extras:
+            self.extras.append((len(self.values), row._extras))
+        self.values.append(row._values)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.values)
+
+    def columns(self):
+        n = len(self.values)
+        columns = {}
+        if n:
+            for name, column in zip(FIELDS, zip(*self.values)):
+                if column.count(None) < n:
+                    columns[name] = column
+        rare = {}
+        for index, extras in self.extras:
+            for key, value in extras.items():
+                column = rare.get(key)
+                if column is None:
+                    column = rare[key] = [None] * n
+                column[index] = value
+        columns.update(rare)
+        return columns
+
+    def to_frame(self):
+        """빈 칸은 None (pd.DataFrame(행 dict 목록)처럼 NaN)"""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns())
+
+    def write_csv(self, path):
+        """kohi_io.write_rows와 같은 형식(utf-8-sig, 임시 파일 후 교체, None은 빈 칸)"""
+        columns = self.columns()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(list(columns))
+            writer.writerows(zip(*columns.values()))
+        os.replace(tmp_path, path)
@@ -0,0 +1,75 @@
+"""
+KOHI 스크래핑 결과 리포트
+결과 CSV(또는 결과 dict 목록)에서 처리 통계와 필드별 수집률 계산
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+from kohi_io import column_order, read_rows
+
+# 검색 결과/상세 페이지 확장으로 새로 추가된 주요 필드 키워드
+NEW_FIELD_KEYWORDS = ['썸네일', '교육형태', '모집상태', '교육비_구분', '플랫폼', '교육목표',
+                      '학습방법', '평가방법', '강사', '교육분야', '맛보기']
+
+
+def _filled(value) -> bool:
+    """pandas notna()와 같은 기준으로 값 존재 여부 판단 (CSV 빈 문자열은 결측)"""
+    if value is None:
+        return False
+    if isinstance(value, float) and value != value:
+        return False
+    return str(value) != ''
+
+
+def summarize(rows: List[dict]) -> Dict:
+    """결과 행 목록의 통계 계산"""
+    columns = column_order(rows)
+
+    status_counts = Counter(row.get('스크래핑결과') for row in rows
+                            if _filled(row.get('스크래핑결과')))
+
+    field_counts = {}
+    for col in columns:
+        count = sum(1 for row in rows if _filled(row.get(col)))
+        if count > 0:
+            field_counts[col] = count
+
+    new_fields = [col for col in columns if any(keyword in col for keyword in NEW_FIELD_KEYWORDS)]
+
+    return {
+        'total': len(rows),
+        'columns': columns,
+        'status_counts': status_counts,
+        'field_counts': field_counts,
+        'new_fields': {f: field_counts[f] for f in new_fields if f in field_counts},
+    }
+
+
+def format_report(summary: Dict, top_n: int = 20) -> List[str]:
+    """통계를 출력용 문자열 목록으로 변환"""
+    total = summary['total']
+    lines = ["=" * 50, f"총 처리: {total}개"]
+
+    for status, count in summary['status_counts'].most_common():
+        lines.append(f"  {status}: {count}개")
+
+    lines.append(f"\n총 수집 필드 종류: {len(summary['columns'])}개")
+
+    lines.append(f"\n📊 주요 수집 필드 (상위 {top_n}개):")
+    ranked = sorted(summary['field_counts'].items(), key=lambda x: x[1], reverse=True)
+    for field, count in ranked[:top_n]:
+        percentage = (count / total) * 100 if total else 0.0
+        lines.append(f"  {field}: {count}개 ({percentage:.1f}%)")
+
+    if summary['new_fields']:
+        lines.append("\n✨ 새로 추가된 주요 필드:")
+        for field, count in summary['new_fields'].items():
+            lines.append(f"  {field}: {count}개")
+
+    return lines
+
+
+def report_file(path: str, top_n: int = 20) -> List[str]:
+    """결과 CSV 파일 리포트"""
+    return format_report(summarize(read_rows(path)), top_n=top_n)
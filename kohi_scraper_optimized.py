@@ -4,152 +4,139 @@ KOHI 교육과정 스크래퍼 - 검색어 최적화 버전
 """
 
 import time
-import json
+from collections import deque
 import logging
-import pandas as pd
 from datetime import datetime
-from playwright.sync_api import sync_playwright, TimeoutError
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper_optimized.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+
+import kohi_logging
+from kohi_browserd import launch as launch_browser, lease as server_lease, resolve as resolve_server
+from kohi_deadline import DEFAULT_COURSE_BUDGET, Deadline, DeadlineExceeded
+from kohi_hedge import open_detail
+from kohi_io import read_rows, write_rows
+from kohi_logging import log_event, stage
+from kohi_metrics import RUN as metrics
+from kohi_paging import find_matching_card
+from kohi_record import ColumnBuffer, CourseRecord
+from kohi_report import summarize
+from kohi_spec import CARD, CARD_SELECTOR, DETAIL, LEARNED_FILE, LEARNER
+from kohi_tables import write_children
+
+# pandas/playwright는 실제 스크래핑 시에만 지연 import (CLI 기동 속도)
+logger = logging.getLogger(__name__)
+
+def setup_logging(log_file='scraper_optimized.log', level=logging.INFO, log_format='json',
+                  debug_sample_rate=0.05):
+    """로깅 설정 (import 시점이 아닌 실행 시점에 호출, 큐 기반 비동기 파이프라인)"""
+    return kohi_logging.setup_logging(log_file, level=level, log_format=log_format,
+                                      debug_sample_rate=debug_sample_rate)
 
 class KOHIScraperOptimized:
-    def __init__(self):
-        self.base_url = "https://edu.kohi.or.kr"
+    def __init__(self, base_url="https://edu.kohi.or.kr", course_budget=DEFAULT_COURSE_BUDGET,
+                 hedge=None, profile=None, browser_server=None, projection=None):
+        self.base_url = base_url.rstrip('/')
+        self.course_budget = course_budget  # 과정당 시간 예산(초), None/0이면 무제한
+        self.hedge = hedge                  # kohi_hedge.HedgedSearch (검색어 변형 동시 검색)
+        self.profile = profile              # kohi_profile.BrowserProfile (영속 프로필, 디스크 캐시)
+        # 상주 브라우저 서버 (상태 파일/ws:// 주소, 없으면 환경 변수 KOHI_BROWSER_SERVER, 프로필을 쓰면 무시)
+        self.server = None if profile is not None else resolve_server(browser_server)
+        self.projection = projection        # kohi_projection.Projection (요청 컬럼만 추출)
         self.results = []
         self.failed_courses = []
 
-    def search_with_enhanced_terms(self, page, enhanced_terms):
-        """개선된 검색어로 검색 수행"""
+    def search_with_enhanced_terms(self, page, enhanced_terms, deadline=None):
+        """개선된 검색어로 검색 수행 (deadline을 넘기면 대기/재시도가 남은 예산 안에서만 진행)"""
+        deadline = deadline or Deadline(None)
         try:
             # 검색 페이지로 이동
-            page.goto(f"{self.base_url}/index.do")
-            page.wait_for_load_state('networkidle')
-            time.sleep(2)
+            page.goto(f"{self.base_url}/index.do", timeout=deadline.ms(30000))
+            page.wait_for_load_state('networkidle', timeout=deadline.ms(30000))
+            deadline.sleep(2)
 
             # 검색창 찾기 및 검색어 입력
             search_input = page.locator('#srchWord, input[name="srchWord"]').first
             search_input.click()
             search_input.fill(enhanced_terms)
 
-            logging.info(f"검색어 입력: {enhanced_terms}")
+            logger.debug("검색어 입력: %s", enhanced_terms)
 
             # 엔터키로 검색
             search_input.press('Enter')
 
             # 검색 결과 대기
-            page.wait_for_load_state('networkidle')
-            time.sleep(3)
+            page.wait_for_load_state('networkidle', timeout=deadline.ms(30000))
+            deadline.sleep(3)
 
             # 검색 결과 확인
-            results = page.locator('.curriculum__item')
+            results = page.locator(CARD_SELECTOR)
             count = results.count()
 
             if count == 0:
                 # 검색 결과가 없으면 단어를 하나씩 제거하며 재시도
                 terms = enhanced_terms.split()
                 for i in range(len(terms), 0, -1):
+                    deadline.check()
                     retry_terms = ' '.join(terms[:i])
-                    logging.info(f"재시도 검색: {retry_terms}")
+                    logger.info("재시도 검색: %s", retry_terms)
+                    metrics.retry('search')
 
                     search_input.fill(retry_terms)
                     search_input.press('Enter')
-                    page.wait_for_load_state('networkidle')
-                    time.sleep(2)
+                    page.wait_for_load_state('networkidle', timeout=deadline.ms(30000))
+                    deadline.sleep(2)
 
-                    results = page.locator('.curriculum__item')
+                    results = page.locator(CARD_SELECTOR)
                     count = results.count()
                     if count > 0:
-                        logging.info(f"검색 성공 (재시도): {count}개 결과")
+                        logger.info("검색 성공 (재시도): %d개 결과", count)
                         return True, count
 
-            logging.info(f"검색 결과: {count}개")
             return count > 0, count
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            logging.error(f"검색 중 오류: {e}")
+            if deadline.expired:
+                raise DeadlineExceeded(str(e)) from e
+            logger.error("검색 중 오류: %s", e)
             return False, 0
 
-    def extract_course_info(self, page, result_box):
-        """교육과정 정보 추출 (검색 결과 + 상세 페이지)"""
-        info = {}
-
-        try:
-            # 1. 검색 결과 페이지에서 메타데이터 추출
-            # 썸네일 이미지
-            try:
-                thumbnail = result_box.locator('.curriculum__thumbnail img').first
-                info['썸네일_이미지'] = thumbnail.get_attribute('src')
-            except:
-                info['썸네일_이미지'] = ''
-
-            # 교육비 구분
-            try:
-                price_badge = result_box.locator('.badge--price').first
-                info['교육비_구분'] = price_badge.inner_text().strip()
-            except:
-                info['교육비_구분'] = ''
-
-            # 교육형태
-            try:
-                type_badge = result_box.locator('.badge--type').first
-                info['교육형태'] = type_badge.inner_text().strip()
-            except:
-                info['교육형태'] = ''
-
-            # 모집상태
-            try:
-                status_badge = result_box.locator('.badge--status').first
-                info['모집상태'] = status_badge.inner_text().strip()
-            except:
-                info['모집상태'] = ''
+    def extract_course_info(self, page, result_box, deadline=None, picked=None):
+        """교육과정 정보 추출 (검색 결과 + 상세 페이지, 예산 소진 시 그때까지 모은 정보 반환)
 
-            # 교육분야
-            try:
-                category = result_box.locator('.curriculum__category').first
-                info['교육분야'] = category.inner_text().strip()
-            except:
-                info['교육분야'] = ''
+        picked(kohi_hedge.HedgedSearch.pick이 채택한 카드)를 주면 result_box 대신 그 필드를 쓰고
+        검색 페이지 없이 상세 페이지로 바로 이동한다.
+        """
+        deadline = deadline or Deadline(None)
+        info = CourseRecord()
 
-            # 지원플랫폼
-            try:
-                platform = result_box.locator('.curriculum__platform').first
-                info['지원플랫폼'] = platform.inner_text().strip()
-            except:
-                info['지원플랫폼'] = ''
-
-            # 2. 교육과정명과 코드 추출
-            course_title = result_box.locator('.curriculum__title').first
-            title_text = course_title.inner_text().strip()
-            info['교육과정명'] = title_text
-
-            # onclick 속성에서 코드 추출
-            onclick = course_title.get_attribute('onclick')
-            if onclick and 'btn_selectPaa0040' in onclick:
-                codes = onclick.split("'")
-                if len(codes) >= 4:
-                    info['교육과정_코드'] = codes[1]
-                    info['그룹_코드'] = codes[3]
-
-                    # 3. 상세 페이지로 이동
-                    page.evaluate(f"btn_selectPaa0040('{codes[1]}', '{codes[3]}')")
-                    page.wait_for_load_state('networkidle')
-                    time.sleep(3)
-
-                    # 4. 상세 정보 추출
-                    info.update(self.extract_detail_info(page))
+        try:
+            # 1. 검색 결과 카드 메타데이터 (공용 추출 명세, 구 마크업은 대체 셀렉터로 처리)
+            card = dict(picked) if picked is not None else CARD.extract(result_box, self.projection)
+            info.update(card)
+
+            # 2. 상세 페이지는 카드의 교육과정코드/교육그룹코드로 이동
+            code, group = card.get('교육과정코드'), card.get('교육그룹코드')
+            if code and group:
+                # 카드 컬럼만 요청했으면 상세 페이지로 가지 않음
+                if self.projection is not None and not self.projection.needs_detail:
+                    return info
+
+                # 3. 상세 페이지로 이동 (채택 카드는 열린 검색 페이지가 없으므로 상세 주소로 직접)
+                if picked is not None:
+                    open_detail(page, self.base_url, picked, timeout=deadline.ms(30000))
+                else:
+                    page.evaluate(f"btn_selectPaa0040('{code}', '{group}')")
+                page.wait_for_load_state('networkidle', timeout=deadline.ms(30000))
+                deadline.sleep(3)
+
+                # 4. 상세 정보 추출
+                page.set_default_timeout(deadline.ms(30000))
+                info.update(self.extract_detail_info(page))
 
             return info
 
         except Exception as e:
-            logging.error(f"정보 추출 중 오류: {e}")
+            logger.error("정보 추출 중 오류: %s", e)
             return info
 
     def extract_detail_info(self, page):
@@ -157,195 +144,241 @@ class KOHIScraperOptimized:
         details = {}
 
         try:
-            # 교육소개
-            intro_elem = page.locator('#curri_intro .view-data')
-            if intro_elem.count() > 0:
-                details['교육소개'] = intro_elem.first.inner_text().strip()
-
-            # 신청정보 테이블
-            apply_table = page.locator('.apply-info-table')
-            if apply_table.count() > 0:
-                rows = apply_table.locator('tr')
-                for i in range(rows.count()):
-                    row = rows.nth(i)
-                    ths = row.locator('th')
-                    tds = row.locator('td')
-
-                    for j in range(ths.count()):
-                        key = ths.nth(j).inner_text().strip().replace(':', '')
-                        value = tds.nth(j).inner_text().strip() if j < tds.count() else ''
-                        details[f'신청_{key}'] = value
-
-            # 수료기준 테이블
-            completion_table = page.locator('.completion-table')
-            if completion_table.count() > 0:
-                rows = completion_table.locator('tr')
-                for i in range(rows.count()):
-                    row = rows.nth(i)
-                    ths = row.locator('th')
-                    tds = row.locator('td')
-
-                    for j in range(ths.count()):
-                        key = ths.nth(j).inner_text().strip().replace(':', '')
-                        value = tds.nth(j).inner_text().strip() if j < tds.count() else ''
-                        details[f'수료_{key}'] = value
-
-            # 교육구성
-            curriculum_section = page.locator('#curriculum_section')
-            if curriculum_section.count() > 0:
-                curriculum_data = []
-                items = curriculum_section.locator('.curriculum-item')
-                for i in range(min(items.count(), 10)):
-                    item = items.nth(i)
-                    item_data = {
-                        'title': item.locator('.item-title').inner_text().strip() if item.locator('.item-title').count() > 0 else '',
-                        'duration': item.locator('.item-duration').inner_text().strip() if item.locator('.item-duration').count() > 0 else ''
-                    }
-                    curriculum_data.append(item_data)
-                details['교육구성'] = json.dumps(curriculum_data, ensure_ascii=False)
+            # 제목, h4 섹션, 표(신청정보/수료기준/교육구성/추천교육과정, 병합 셀 포함), 첨부자료, 메타 정보를
+            # 공용 추출 명세로 한 번에 (표 셀마다 왕복하지 않음)
+            details.update(DETAIL.extract(page, self.projection))
 
         except Exception as e:
-            logging.error(f"상세 정보 추출 중 오류: {e}")
+            logger.error("상세 정보 추출 중 오류: %s", e)
 
         return details
 
+    def _search_card(self, page, course_name, enhanced_terms, deadline):
+        """개선된 검색어로 검색 후 교육명과 맞는 카드 -> (카드, 페이지 번호, 검색 결과 수)"""
+        with stage(logger, 'search', course_name=course_name) as ev:
+            success, count = self.search_with_enhanced_terms(page, enhanced_terms, deadline)
+            ev['results'] = count
+        if not success:
+            return None, 1, 0
+        # 교육명과 맞는 카드 선택 (현재 페이지에 없을 때만 다음 결과 페이지, 끝까지 없으면 첫 카드)
+        card, page_no, _ = find_matching_card(page, course_name, deadline)
+        return card, page_no, count
+
     def scrape_course(self, course_name, enhanced_terms):
         """단일 교육과정 스크래핑"""
+        from playwright.sync_api import sync_playwright, TimeoutError
+        from kohi_scraper_ultimate import classify_result
+
+        # 동시 검색 모드: 맞는 결과를 가장 먼저 준 카드로 바로 상세 페이지 (없으면 개선 검색어 + 단어 줄이기 재시도)
+        picked = None
+        if self.hedge is not None:
+            enhanced_terms, picked = self.hedge.pick(course_name, fallback=enhanced_terms)
+
         playwright = sync_playwright().start()
-        browser = None
+        browser = context = None
 
+        deadline = Deadline(self.course_budget)
         try:
-            browser = playwright.chromium.launch(headless=True)
-            context = browser.new_context(viewport={'width': 1920, 'height': 1080})
-            page = context.new_page()
-
-            # 타임아웃 설정
-            page.set_default_timeout(30000)
-
-            # 개선된 검색어로 검색
-            success, count = self.search_with_enhanced_terms(page, enhanced_terms)
-
-            if not success:
-                logging.warning(f"검색 결과 없음: {course_name}")
-                return {
-                    '원본_교육과정명': course_name,
-                    '검색어': enhanced_terms,
-                    '스크래핑결과': '검색결과없음',
-                    '검색결과수': 0
-                }
-
-            # 첫 번째 결과 선택
-            results = page.locator('.curriculum__item')
-            if results.count() > 0:
-                first_result = results.first
-                course_info = self.extract_course_info(page, first_result)
-                course_info['원본_교육과정명'] = course_name
-                course_info['검색어'] = enhanced_terms
-                course_info['스크래핑결과'] = '성공'
-                course_info['검색결과수'] = count
-
-                return course_info
-
-        except TimeoutError:
-            logging.error(f"타임아웃: {course_name}")
-            return {
+            viewport = {'width': 1920, 'height': 1080}
+            if self.profile is not None:
+                context = self.profile.open(playwright, headless=True, viewport=viewport)
+                page = self.profile.page(context)
+            else:
+                browser = launch_browser(playwright, self.server, headless=True)
+                page = browser.new_context(viewport=viewport).new_page()
+            metrics.attach_page(page)
+
+            # 타임아웃 설정 (단계별 상한 30초, 과정 예산이 그보다 적게 남으면 남은 만큼)
+            page.set_default_timeout(deadline.ms(30000))
+
+            if picked is not None:
+                # 동시 검색이 채택한 카드 하나 (브라우저 검색 없음)
+                card, page_no, count = None, 1, 1
+            else:
+                card, page_no, count = self._search_card(page, course_name, enhanced_terms, deadline)
+                if count == 0:
+                    logger.warning("검색 결과 없음: %s", course_name)
+                    return CourseRecord({
+                        '원본_교육과정명': course_name,
+                        '검색어': enhanced_terms,
+                        '스크래핑결과': '검색결과없음',
+                        '검색결과수': 0
+                    })
+
+                if card is None:
+                    # 검색 결과 수는 있었지만 카드를 찾지 못함 (페이지 구조 변경 등)
+                    logger.warning("검색 결과 카드 없음: %s", course_name)
+                    return CourseRecord({
+                        '원본_교육과정명': course_name,
+                        '검색어': enhanced_terms,
+                        '스크래핑결과': '검색결과없음',
+                        '검색결과수': count
+                    })
+
+            with stage(logger, 'extract', course_name=course_name) as ev:
+                page.set_default_timeout(deadline.ms(30000))
+                course_info = self.extract_course_info(page, card, deadline, picked=picked)
+                ev['source'] = 'hedge' if picked is not None else 'search'
+                ev['course'] = course_info.get('교육과정코드')
+                ev['fields'] = len(course_info)
+            course_info['원본_교육과정명'] = course_name
+            course_info['검색어'] = enhanced_terms
+            course_info['검색결과수'] = count
+            if page_no > 1:
+                course_info['검색결과_페이지'] = page_no
+            # ultimate 엔진과 같은 기준으로 판정 (projection이 있으면 요청 컬럼 중 찾은 비율)
+            classify_result(course_info, self.projection)
+            # 추출 중 예산이 끝났으면 모은 정보만 담아 나중에 다시 시도
+            if deadline.expired:
+                course_info['스크래핑결과'] = '타임아웃'
+
+            return course_info
+
+        except (TimeoutError, DeadlineExceeded):
+            logger.error("타임아웃: %s", course_name)
+            return CourseRecord({
                 '원본_교육과정명': course_name,
                 '검색어': enhanced_terms,
                 '스크래핑결과': '타임아웃',
                 '검색결과수': 0
-            }
+            })
 
         except Exception as e:
-            logging.error(f"스크래핑 실패 - {course_name}: {e}")
-            return {
+            logger.error("스크래핑 실패 - %s: %s", course_name, e)
+            return CourseRecord({
                 '원본_교육과정명': course_name,
                 '검색어': enhanced_terms,
                 '스크래핑결과': f'오류: {str(e)}',
                 '검색결과수': 0
-            }
+            })
 
         finally:
-            if browser:
+            if context is not None:
+                self.profile.close(context)
+            elif browser:
                 browser.close()
             if playwright:
                 playwright.stop()
 
-    def run(self, input_file='work_enhanced.csv', output_file='scraped_optimized.csv'):
-        """전체 스크래핑 실행"""
+    def run(self, input_file='work_enhanced.csv', output_file='scraped_optimized.csv',
+            temp_file='scraped_optimized_temp.csv', limit=None, completed=None,
+            save_every=10, delay=2.0, deadline_retries=1, scheduler=None,
+            selectors_file=LEARNED_FILE):
+        """전체 스크래핑 실행 (completed에 있는 과정은 건너뜀)
+
+        scheduler(kohi_priority.PriorityScheduler)를 주면 우선순위 순으로 처리하고 시간 예산이 끝나면 멈춘다.
+        selectors_file: 학습된 셀렉터 순서를 읽고 끝에 저장할 파일 (None이면 명세 순서만, 저장 안 함).
+        """
+        if selectors_file:
+            LEARNER.load(selectors_file)
         start_time = datetime.now()
-        logging.info("=" * 60)
-        logging.info("KOHI 교육과정 스크래핑 시작 (최적화 버전)")
-        logging.info("=" * 60)
+        logger.info("=" * 60)
+        logger.info("KOHI 교육과정 스크래핑 시작 (최적화 버전)")
+        logger.info("=" * 60)
 
         # 개선된 검색어 파일 로드
-        df = pd.read_csv(input_file, encoding='utf-8-sig')
-        total_courses = len(df)
-
-        logging.info(f"총 {total_courses}개 교육과정 스크래핑 시작")
-
-        # 각 교육과정 스크래핑
-        for idx, row in df.iterrows():
+        rows = read_rows(input_file)
+        if limit:
+            rows = rows[:limit]
+
+        self.results = list(completed or [])
+        done = {r.get('원본_교육과정명') for r in self.results}
+        pending = [row for row in rows if row['교육명'] not in done]
+        total_courses = len(rows)
+
+        logger.info("총 %d개 교육과정 스크래핑 시작 (남은 과정 %d개)", total_courses, len(pending))
+
+        # 각 교육과정 스크래핑 (시간 예산을 다 쓴 과정은 맨 뒤로 보내 deadline_retries번까지 재시도)
+        items = ((idx, row, 1) for idx, row in enumerate(pending))
+        if scheduler is not None:
+            queue = scheduler.queue(items, key=lambda item: item[1]['교육명'])
+        else:
+            queue = deque(items)
+        positions = {}  # pending 순번 -> self.results 위치 (재시도 결과로 부분 결과를 덮어씀)
+        finished = 0
+        while queue:
+            try:
+                idx, row, attempt = queue.popleft()
+            except IndexError:  # 스케줄러 시간 예산 소진
+                break
             course_name = row['교육명']
             enhanced_terms = row['검색어_개선']
 
-            logging.info(f"\n[{idx+1}/{total_courses}] 처리중: {course_name}")
-            logging.info(f"  검색어: {enhanced_terms}")
+            logger.info("[%d/%d] 처리중: %s", idx + 1, len(pending), course_name)
+
+            course_start = time.perf_counter()
+            with server_lease(self.server):
+                result = self.scrape_course(course_name, enhanced_terms)
+            if scheduler is not None:
+                scheduler.observe(time.perf_counter() - course_start)
+            if idx in positions:
+                self.results[positions[idx]] = result
+            else:
+                positions[idx] = len(self.results)
+                self.results.append(result)
+            log_event(logger, 'course', course=result.get('교육과정코드'), course_name=course_name,
+                      duration=time.perf_counter() - course_start,
+                      status=result.get('스크래핑결과'), attempt=attempt)
+
+            if result.get('스크래핑결과') == '타임아웃' and attempt <= deadline_retries:
+                metrics.retry('deadline')
+                logger.info("  시간 예산 소진, 나중에 다시 시도: %s", course_name)
+                queue.append((idx, row, attempt + 1))
+            else:
+                metrics.course_finished(result.get('스크래핑결과'))
+                finished += 1
+                # save_every개마다 임시 저장
+                if temp_file and finished % save_every == 0:
+                    write_rows(temp_file, self.results)
+                    logger.info("임시 저장 완료: %d개", finished)
 
-            result = self.scrape_course(course_name, enhanced_terms)
-            self.results.append(result)
+            # 잠시 대기 (서버 부하 방지)
+            time.sleep(delay)
 
-            # 10개마다 임시 저장
-            if (idx + 1) % 10 == 0:
-                temp_df = pd.DataFrame(self.results)
-                temp_df.to_csv('scraped_optimized_temp.csv', index=False, encoding='utf-8-sig')
-                logging.info(f"임시 저장 완료: {idx+1}개")
+        if self.hedge is not None:
+            self.hedge.log_report()
+        if scheduler is not None:
+            scheduler.log_summary()
 
-            # 잠시 대기 (서버 부하 방지)
-            time.sleep(2)
+        # 학습된 셀렉터 순서 저장
+        if selectors_file:
+            LEARNER.save(selectors_file)
+        if LEARNER.drifting:
+            logger.warning("⚠️ 셀렉터 드리프트 의심 필드: %s", ', '.join(sorted(LEARNER.drifting)))
 
-        # 최종 결과 저장
-        final_df = pd.DataFrame(self.results)
-        final_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        # 최종 결과 저장 (리포트/테스트 스크립트용으로 DataFrame 반환, 행 dict 대신 컬럼 버퍼로 생성)
+        write_rows(output_file, self.results)
+        write_children(output_file, self.results)
+        final_df = ColumnBuffer(self.results).to_frame()
 
         # 통계 출력
         end_time = datetime.now()
         duration = end_time - start_time
 
+        total_courses = len(self.results)
         success_count = sum(1 for r in self.results if r.get('스크래핑결과') == '성공')
         fail_count = total_courses - success_count
 
-        logging.info("\n" + "=" * 60)
-        logging.info("스크래핑 완료!")
-        logging.info("=" * 60)
-        logging.info(f"총 처리: {total_courses}개")
-        logging.info(f"성공: {success_count}개 ({success_count/total_courses*100:.1f}%)")
-        logging.info(f"실패: {fail_count}개 ({fail_count/total_courses*100:.1f}%)")
-        logging.info(f"소요시간: {duration}")
-        logging.info(f"결과 파일: {output_file}")
+        logger.info("\n" + "=" * 60)
+        logger.info("스크래핑 완료!")
+        logger.info("=" * 60)
+        if total_courses:
+            logger.info(f"총 처리: {total_courses}개")
+            logger.info(f"성공: {success_count}개 ({success_count/total_courses*100:.1f}%)")
+            logger.info(f"실패: {fail_count}개 ({fail_count/total_courses*100:.1f}%)")
+        logger.info(f"소요시간: {duration}")
+        logger.info(f"결과 파일: {output_file}")
 
         # 실패 케이스 분석
         if fail_count > 0:
-            logging.info("\n실패 케이스 분석:")
-            fail_df = final_df[final_df['스크래핑결과'] != '성공']
-            fail_reasons = fail_df['스크래핑결과'].value_counts()
-            for reason, count in fail_reasons.items():
-                logging.info(f"  - {reason}: {count}개")
+            logger.info("\n실패 케이스 분석:")
+            summary = summarize([r for r in self.results if r.get('스크래핑결과') != '성공'])
+            for reason, count in summary['status_counts'].most_common():
+                logger.info(f"  - {reason}: {count}개")
 
         return final_df
 
-def main():
-    scraper = KOHIScraperOptimized()
-
-    # 샘플 테스트 (처음 10개만)
-    test_mode = input("테스트 모드로 실행하시겠습니까? (y/n): ").lower() == 'y'
-
-    if test_mode:
-        df = pd.read_csv('work_enhanced.csv', encoding='utf-8-sig')
-        test_df = df.head(10)
-        test_df.to_csv('work_enhanced_test.csv', index=False, encoding='utf-8-sig')
-        scraper.run('work_enhanced_test.csv', 'scraped_optimized_test.csv')
-    else:
-        scraper.run('work_enhanced.csv', 'scraped_optimized_final.csv')
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    from kohi import main as cli_main
+    sys.exit(cli_main(['scrape', '--engine', 'optimized'] + sys.argv[1:]))
@@ -1,23 +1,35 @@
-import pandas as pd
-import json
-from playwright.sync_api import sync_playwright
 import time
 import logging
 from datetime import datetime
-import os
-import re
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper_ultimate.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+import threading
+from collections import deque
+
+import kohi_logging
+from kohi_browserd import launch as launch_browser, lease as server_lease, resolve as resolve_server
+from kohi_deadline import DEFAULT_COURSE_BUDGET, Deadline, DeadlineExceeded
+from kohi_hedge import open_detail
+from kohi_io import first_column, load_completed, write_rows
+from kohi_logging import debug_sampled, log_event, stage
+from kohi_metrics import RUN as metrics
+from kohi_report import format_report, summarize
+from kohi_paging import find_matching_card
+from kohi_record import CourseRecord
+from kohi_spec import CARD, CARD_SELECTOR, DETAIL, LEARNED_FILE, LEARNER
+from kohi_tables import write_children
+
+# pandas/playwright는 실제 스크래핑 시에만 지연 import (CLI 기동 속도)
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://edu.kohi.or.kr"
+SEARCH_PATH = "/pt/pa/paa/BD_paa0010l.do"
+SEARCH_URL = BASE_URL + SEARCH_PATH
+
+def setup_logging(log_file='scraper_ultimate.log', level=logging.INFO, log_format='json',
+                  debug_sample_rate=0.05):
+    """로깅 설정 (import 시점이 아닌 실행 시점에 호출, 큐 기반 비동기 파이프라인)"""
+    return kohi_logging.setup_logging(log_file, level=level, log_format=log_format,
+                                      debug_sample_rate=debug_sample_rate)
+
 def clean_text(text):
     """텍스트 정제"""
     if not text:
@@ -42,536 +54,469 @@ def safe_get_attribute(element, attr, default=""):
         pass
     return default
 
-def extract_search_result_info(result_box, page):
-    """검색 결과 페이지의 각 교육과정 박스에서 모든 정보 추출"""
+def extract_search_result_info(result_box, page, projection=None):
+    """검색 결과 페이지의 각 교육과정 박스에서 모든 정보 추출 (kohi_spec.CARD, JS 1회 호출)"""
     info = {}
 
     try:
-        # 1. 썸네일 이미지 URL
-        thumbnail = result_box.locator('.curriculum__thumbnail img').first
-        if thumbnail.count() > 0:
-            img_src = thumbnail.get_attribute('src')
-            if img_src and not img_src.endswith('no_img.gif'):
-                info['썸네일_이미지'] = img_src
-
-        # 2. 교육비 유료/무료
-        charge_elem = result_box.locator('.change-ico-box .ico').first
-        if charge_elem.count() > 0:
-            charge_text = charge_elem.inner_text()
-            info['교육비_구분'] = charge_text
-
-        # 3. 교육형태 배지 (대면/온라인 등)
-        badge = result_box.locator('.curriculum__info--badge .badge').first
-        if badge.count() > 0:
-            badge_class = badge.get_attribute('class')
-            badge_text = badge.inner_text()
-            info['교육형태'] = badge_text
-
-            # 클래스명으로 더 정확한 구분
-            if 'face' in badge_class:
-                info['교육형태_구분'] = '대면'
-            elif 'live' in badge_class:
-                info['교육형태_구분'] = '라이브'
-            elif 'hybrid' in badge_class:
-                info['교육형태_구분'] = '하이브리드'
-            elif 'e-learning' in badge_class:
-                info['교육형태_구분'] = '이러닝'
-            elif 'bl' in badge_class:
-                info['교육형태_구분'] = 'B/L'
-
-        # 4. 교육분야 카테고리
-        category_spans = result_box.locator('.curriculum__info--badge span').all()
-        categories = []
-        for span in category_spans:
-            text = clean_text(span.inner_text())
-            if text and not text.startswith('모집'):
-                categories.append(text)
-        if categories:
-            info['교육분야'] = ', '.join(categories)
-
-        # 5. 모집상태
-        recruit_status = result_box.locator('.curriculum__info--badge em').first
-        if recruit_status.count() > 0:
-            status_class = recruit_status.get_attribute('class')
-            status_text = recruit_status.inner_text()
-            info['모집상태'] = status_text
-
-            if 'yellow' in status_class:
-                info['모집상태_구분'] = '진행중'
-            elif 'gray' in status_class:
-                info['모집상태_구분'] = '마감'
-
-        # 6. 교육대상
-        target_elem = result_box.locator('.curriculum__info--badge em.gray').first
-        if target_elem.count() > 0:
-            target_text = target_elem.inner_text()
-            if '공무원' in target_text or '민간' in target_text:
-                info['교육대상_표시'] = target_text
-
-        # 7. 플랫폼 호환성
-        pc_elem = result_box.locator('.info--pc')
-        mobile_elem = result_box.locator('.info--mobile')
-        sign_elem = result_box.locator('.info--sign')
-
-        platforms = []
-        if pc_elem.count() > 0:
-            platforms.append('PC')
-        if mobile_elem.count() > 0:
-            platforms.append('Mobile')
-        if sign_elem.count() > 0:
-            platforms.append('수어지원')
-
-        if platforms:
-            info['지원플랫폼'] = ', '.join(platforms)
-
-        # 8. 맛보기 영상 링크
-        teaser = result_box.locator('.slide__link--teaser').first
-        if teaser.count() > 0:
-            info['맛보기영상'] = '있음'
-
-        # 9. 상세 정보 텍스트들
-        details = result_box.locator('.curriculum__info--detail p').all()
-        for detail in details:
-            text = detail.inner_text()
-            if '신청기간' in text:
-                info['검색결과_신청기간'] = text.replace('신청기간 : ', '').strip()
-            elif '교육기간' in text:
-                info['검색결과_교육기간'] = text.replace('교육기간 : ', '').strip()
-            elif '교육시간' in text:
-                info['검색결과_교육시간'] = text.replace('교육시간 : ', '').strip()
-            elif '신청인원' in text:
-                info['검색결과_신청현황'] = text.replace('신청인원/정원 : ', '').strip()
-
-        # 10. onclick 속성에서 코드 추출
-        link = result_box.locator('a').first
-        if link.count() > 0:
-            onclick = link.get_attribute('onclick')
-            if onclick:
-                match = re.search(r"btn_selectPaa0040\('([^']+)','([^']+)'\)", onclick)
-                if match:
-                    info['교육과정코드'] = match.group(1)
-                    info['교육그룹코드'] = match.group(2)
-
+        info = CARD.extract(result_box, projection)
     except Exception as e:
-        logger.error(f"검색 결과 정보 추출 오류: {e}")
+        logger.error("검색 결과 정보 추출 오류: %s", e)
+
+    for key, value in info.items():
+        debug_sampled(logger, "  카드 필드 %s = %s", key, value)
 
     return info
 
-def extract_detail_page_complete(page):
-    """상세 페이지에서 모든 정보 완전 추출"""
+def extract_detail_page_complete(page, projection=None):
+    """상세 페이지에서 모든 정보 완전 추출
+
+    제목(대체 셀렉터), h4 섹션, 표(신청정보/수료기준/교육구성/추천교육과정/기타),
+    첨부자료, 메타 정보를 공용 명세(kohi_spec.DETAIL)로 한 번에 읽는다.
+    projection(kohi_projection.Projection)을 주면 필요한 컬럼을 만드는 부분만 읽는다.
+    """
     data = {}
 
     try:
         # 현재 URL 저장
         data['상세페이지_URL'] = page.url
-
-        # 1. 페이지 제목 (다양한 selector 시도)
-        title_selectors = [
-            'h3.tit',
-            'h3.sub_cont_title_h3',
-            '.page-title h3',
-            '.content-title',
-            'h3'
-        ]
-
-        for selector in title_selectors:
-            elem = page.locator(selector).first
-            if elem.count() > 0:
-                title = clean_text(elem.inner_text())
-                if title and len(title) > 2:
-                    data['교육과정명'] = title
-                    break
-
-        # 2. 모든 h4 섹션 찾기 (교육소개, 교육목표 등)
-        h4_sections = page.locator('h4').all()
-        for h4 in h4_sections:
-            try:
-                section_title = clean_text(h4.inner_text())
-
-                # 다음 형제 요소들에서 내용 수집
-                content = page.evaluate(f"""
-                    (() => {{
-                        const h4 = Array.from(document.querySelectorAll('h4')).find(el => el.textContent.includes('{section_title}'));
-                        if (!h4) return '';
-                        let content = '';
-                        let next = h4.nextElementSibling;
-                        while (next && next.tagName !== 'H4') {{
-                            if (next.tagName !== 'SCRIPT' && next.tagName !== 'STYLE') {{
-                                content += next.innerText + ' ';
-                            }}
-                            next = next.nextElementSibling;
-                        }}
-                        return content.trim();
-                    }})()
-                """)
-
-                if content:
-                    # 섹션별로 저장
-                    if '교육소개' in section_title:
-                        data['교육소개'] = clean_text(content)
-                    elif '교육목표' in section_title:
-                        data['교육목표'] = clean_text(content)
-                    elif '학습방법' in section_title:
-                        data['학습방법'] = clean_text(content)
-                    elif '평가방법' in section_title:
-                        data['평가방법'] = clean_text(content)
-                    elif '강사' in section_title:
-                        data['강사정보'] = clean_text(content)
-                    elif '문의' in section_title:
-                        data['문의처'] = clean_text(content)
-                    else:
-                        # 기타 섹션
-                        data[f'기타_{section_title}'] = clean_text(content)[:500]
-
-            except Exception as e:
-                logger.debug(f"h4 섹션 파싱 오류: {e}")
-
-        # 3. 모든 테이블 분석 (더 정밀하게)
-        tables = page.locator('table').all()
-        logger.info(f"  테이블 수: {len(tables)}")
-
-        for idx, table in enumerate(tables):
-            try:
-                table_html = table.inner_html()
-                table_text = table.inner_text()
-
-                # 신청정보 테이블
-                if any(key in table_text for key in ['교육대상', '신청기간', '교육기간', '교육비']):
-                    rows = table.locator('tr').all()
-                    for row in rows:
-                        ths = row.locator('th').all()
-                        tds = row.locator('td').all()
-
-                        for i in range(len(ths)):
-                            if i < len(tds):
-                                key = clean_text(ths[i].inner_text())
-                                value = clean_text(tds[i].inner_text())
-                                if key:
-                                    # 키 이름 정규화
-                                    key_normalized = key.replace('/', '_').replace(' ', '_')
-                                    data[f'신청_{key_normalized}'] = value
-
-                # 수료기준 테이블
-                elif any(key in table_text for key in ['수료', '출석', '시험', '과제']):
-                    # 테이블 구조에 따라 다르게 처리
-                    rows = table.locator('tr').all()
-
-                    # 헤더가 있는 경우
-                    if len(rows) >= 2:
-                        headers = []
-                        for th in rows[0].locator('th, td').all():
-                            headers.append(clean_text(th.inner_text()))
-
-                        # 데이터 행
-                        if len(rows) > 1:
-                            values = []
-                            for td in rows[1].locator('td').all():
-                                values.append(clean_text(td.inner_text()))
-
-                            if len(headers) == len(values):
-                                for h, v in zip(headers, values):
-                                    if h:
-                                        data[f'수료_{h}'] = v
-
-                # 교육구성 테이블
-                elif any(key in table_text for key in ['교과목', '강사', '교육일', '차시']):
-                    # 헤더 찾기
-                    headers = []
-                    thead = table.locator('thead')
-                    if thead.count() > 0:
-                        headers = [clean_text(th.inner_text()) for th in thead.locator('th').all()]
-                    else:
-                        first_row = table.locator('tr').first
-                        if first_row.count() > 0:
-                            headers = [clean_text(th.inner_text()) for th in first_row.locator('th').all()]
-
-                    if headers:
-                        # 데이터 행 수집
-                        tbody = table.locator('tbody')
-                        if tbody.count() > 0:
-                            data_rows = tbody.locator('tr').all()
-                        else:
-                            all_rows = table.locator('tr').all()
-                            data_rows = all_rows[1:] if len(all_rows) > 1 else []
-
-                        curriculum_data = []
-                        for row in data_rows:
-                            cells = [clean_text(td.inner_text()) for td in row.locator('td').all()]
-                            if cells and len(cells) == len(headers):
-                                curriculum_data.append(dict(zip(headers, cells)))
-
-                        if curriculum_data:
-                            data['교육구성'] = json.dumps(curriculum_data, ensure_ascii=False)
-                            data['교육구성_과목수'] = len(curriculum_data)
-
-                            # 총 교육시간 계산 시도
-                            total_hours = 0
-                            for item in curriculum_data:
-                                for key in ['시간', '교육시간', '차시']:
-                                    if key in item:
-                                        try:
-                                            # 숫자만 추출
-                                            hours = re.findall(r'\d+\.?\d*', item[key])
-                                            if hours:
-                                                total_hours += float(hours[0])
-                                        except:
-                                            pass
-                            if total_hours > 0:
-                                data['교육구성_총시간'] = total_hours
-
-                # 추천교육과정 테이블
-                elif '추천' in table_text:
-                    if '추천 교육과정이 없습니다' in table_text:
-                        data['추천교육과정'] = '없음'
-                    else:
-                        # 추천 과정 파싱
-                        headers = []
-                        thead = table.locator('thead')
-                        if thead.count() > 0:
-                            headers = [clean_text(th.inner_text()) for th in thead.locator('th').all()]
-
-                        if headers:
-                            tbody = table.locator('tbody')
-                            if tbody.count() > 0:
-                                reco_data = []
-                                for row in tbody.locator('tr').all():
-                                    cells = [clean_text(td.inner_text()) for td in row.locator('td').all()]
-                                    if cells and len(cells) == len(headers):
-                                        reco_data.append(dict(zip(headers, cells)))
-
-                                if reco_data:
-                                    data['추천교육과정'] = json.dumps(reco_data, ensure_ascii=False)
-                                    data['추천교육과정_수'] = len(reco_data)
-
-                # 기타 정보 테이블
-                else:
-                    # 테이블에 유용한 정보가 있는지 확인
-                    if len(table_text) > 20 and len(table_text) < 2000:
-                        # th-td 쌍으로 이루어진 정보성 테이블
-                        rows = table.locator('tr').all()
-                        for row in rows:
-                            ths = row.locator('th').all()
-                            tds = row.locator('td').all()
-
-                            for i in range(len(ths)):
-                                if i < len(tds):
-                                    key = clean_text(ths[i].inner_text())
-                                    value = clean_text(tds[i].inner_text())
-                                    if key and value and len(key) < 30:
-                                        data[f'기타정보_{key}'] = value[:200]
-
-            except Exception as e:
-                logger.debug(f"테이블 {idx} 파싱 오류: {e}")
-
-        # 4. 다운로드 가능한 파일 확인
-        download_links = page.locator('a[href*="download"], a[href*="file"]').all()
-        if download_links:
-            downloads = []
-            for link in download_links[:5]:  # 최대 5개만
-                href = link.get_attribute('href')
-                text = clean_text(link.inner_text())
-                if href and text:
-                    downloads.append(f"{text}: {href}")
-            if downloads:
-                data['다운로드_자료'] = ', '.join(downloads)
-
-        # 5. 메타 정보 수집 (있다면)
-        meta_info = page.locator('meta[property*="og:"], meta[name*="description"]').all()
-        for meta in meta_info:
-            prop = meta.get_attribute('property') or meta.get_attribute('name')
-            content = meta.get_attribute('content')
-            if prop and content:
-                if 'description' in prop:
-                    data['메타_설명'] = content[:200]
-                elif 'image' in prop:
-                    data['메타_이미지'] = content
+        data.update(DETAIL.extract(page, projection))
 
     except Exception as e:
-        logger.error(f"상세 페이지 전체 파싱 오류: {e}")
+        logger.error("상세 페이지 전체 파싱 오류: %s", e)
         data['파싱오류'] = str(e)[:200]
 
+    for key, value in data.items():
+        debug_sampled(logger, "  상세 필드 %s = %s", key, value)
+
     return data
 
-def scrape_course_complete(course_name, playwright_instance):
-    """단일 교육과정 완전 스크래핑"""
-    result = {
-        '원본_교육과정명': course_name,
-        '스크래핑_시각': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }
+def classify_result(result, projection=None):
+    """수집된 필드 수로 스크래핑결과/수집_필드수 기록 (재추출에서도 같은 기준 사용)
+
+    projection을 주면 요청하지 않은 컬럼을 지우고, 요청 컬럼 중 찾은 비율로 판정한다.
+    """
+    if projection is not None:
+        projection.trim(result)
+    parsed_fields = len([k for k in result.keys()
+                         if k not in ['원본_교육과정명', '스크래핑_시각']])
+
+    if projection is not None:
+        # 요청 컬럼의 절반 이상을 찾으면 성공
+        found = projection.found(result)
+        success, partial = found * 2 >= len(projection.columns) and found > 0, found > 0
+    else:
+        success, partial = parsed_fields > 10, parsed_fields > 5
+
+    if success:
+        result['스크래핑결과'] = '성공'
+    elif partial:
+        result['스크래핑결과'] = '부분 성공'
+    else:
+        result['스크래핑결과'] = '정보 부족'
+    result['수집_필드수'] = parsed_fields
+    return result
 
-    browser = None
+def _archive_page(archive, kind, html_source, result, url):
+    """원본 HTML 보관 (보관 실패가 스크래핑을 막지 않도록)"""
     try:
-        # 브라우저 시작
-        browser = playwright_instance.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        page = browser.new_page()
+        archive.put(result.get('교육과정코드'), kind, html_source(), url=url,
+                    course_name=result.get('원본_교육과정명'))
+    except Exception as e:
+        logger.warning("  페이지 보관 실패 (%s): %s", kind, e)
 
-        # 1. 검색 페이지 이동
-        logger.info(f"  검색 시작: {course_name}")
-        page.goto("https://edu.kohi.or.kr/pt/pa/paa/BD_paa0010l.do", timeout=30000)
-        page.wait_for_load_state("networkidle", timeout=10000)
+def _search_card(page, course_name, query, search_url, deadline, result):
+    """브라우저 검색 후 교육명과 맞는 카드 (교육명과 맞는 카드가 없을 때만 다음 결과 페이지, 결과가 없으면 None)"""
+    with stage(logger, 'search', course_name=course_name) as ev:
+        # 1. 검색 페이지 이동 (첫 페이지 로드 시간은 프로필 캐시 효과 확인용)
+        load_start = time.perf_counter()
+        page.goto(search_url, timeout=deadline.ms(30000))
+        page.wait_for_load_state("networkidle", timeout=deadline.ms(10000))
+        ev['first_load_ms'] = round((time.perf_counter() - load_start) * 1000)
 
         # 2. 검색 실행
         search_input = page.locator("#planngCrseNm")
-        search_input.fill(course_name)
+        search_input.fill(query or course_name)
         page.keyboard.press("Enter")
 
         # 검색 결과 대기
-        time.sleep(3)
+        deadline.sleep(3)
 
         try:
-            page.wait_for_selector(".curriculum__box", timeout=5000)
+            page.wait_for_selector(CARD_SELECTOR, timeout=deadline.ms(5000))
+        except DeadlineExceeded:
+            raise
         except:
-            logger.debug("  검색 결과 대기 시간 초과")
+            logger.debug("  검색 결과 대기 시간 초과: %s", course_name)
 
         # 3. 검색 결과 분석
-        results = page.locator(".curriculum__box").all()
-        logger.info(f"  검색 결과: {len(results)}개")
+        card, page_no, _ = find_matching_card(page, course_name, deadline)
+        ev['results'] = page.locator(CARD_SELECTOR).count() if card is not None else 0
+        ev['page'] = page_no
+
+    if card is not None and page_no > 1:
+        result['검색결과_페이지'] = page_no
+    return card
+
+def _click_detail(page, card, deadline):
+    """카드의 상세 링크 클릭 (링크가 없으면 False)"""
+    detail_link = card.locator("a").first
+    if detail_link.count() == 0:
+        return False
+    # 새 페이지에서 열릴 수 있으므로 대기
+    try:
+        with page.expect_navigation(timeout=deadline.ms(30000),
+                                    wait_until="domcontentloaded"):
+            detail_link.click()
+    except DeadlineExceeded:
+        raise
+    except:
+        # navigation이 없을 경우 그냥 클릭
+        page.set_default_timeout(deadline.ms(30000))
+        detail_link.click()
+        page.wait_for_load_state("domcontentloaded", timeout=deadline.ms(30000))
+    return True
+
+def scrape_course_complete(course_name, playwright_instance, search_url=SEARCH_URL,
+                           archive=None, budget=DEFAULT_COURSE_BUDGET, query=None, profile=None,
+                           trace=None, server=None, projection=None, picked=None):
+    """단일 교육과정 완전 스크래핑 (query: 검색창에 넣을 검색어, 기본은 교육명 그대로)
+
+    picked(kohi_hedge.HedgedSearch.pick이 채택한 카드)를 주면 브라우저 검색을 건너뛰고 그 카드 필드를 쓴 뒤
+    상세 페이지로 바로 이동한다.
+
+    budget(초)은 과정 전체의 시간 예산으로, 각 단계는 원래 타임아웃과 남은 예산 중 작은 값만 쓴다.
+    예산을 다 쓰면 그때까지 모은 필드와 함께 '타임아웃'으로 반환한다 (None/0이면 무제한).
+    profile(kohi_profile.BrowserProfile)을 주면 빈 브라우저 대신 작업자별 영속 프로필(디스크 캐시, 쿠키)로 연다.
+    trace(kohi_trace.TraceCollector)를 주면 페이지 이벤트를 링 버퍼에 모아 실패/부분 결과일 때만 HAR로 저장한다.
+    server(kohi_browserd.resolve 결과)를 주면 브라우저를 띄우지 않고 상주 브라우저 서버에 연결한다.
+    projection(kohi_projection.Projection)을 주면 요청 컬럼에 필요한 필드만 읽고,
+    상세 페이지 컬럼이 없으면 상세 페이지로 이동하지 않는다.
+    """
+    result = CourseRecord({
+        '원본_교육과정명': course_name,
+        '스크래핑_시각': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+    if query and query != course_name:
+        result['검색어'] = query
+    course_start = time.perf_counter()
+    deadline = Deadline(budget)
 
-        if len(results) == 0:
-            result['스크래핑결과'] = '검색 결과 없음'
+    browser = context = page = buffer = None
+    try:
+        # 브라우저 시작
+        launch_args = ['--disable-blink-features=AutomationControlled']
+        if profile is not None:
+            context = profile.open(playwright_instance, headless=True, args=launch_args)
+            page = profile.page(context)
+        else:
+            browser = launch_browser(playwright_instance, server, headless=True, args=launch_args)
+            page = browser.new_page()
+        metrics.attach_page(page)
+        if trace is not None:
+            buffer = trace.start(course_name, page)
+
+        if picked is not None:
+            # 동시 검색이 채택한 카드: 브라우저 검색 없이 카드 필드를 그대로 쓰고 상세 페이지로 바로 이동
+            with stage(logger, 'card', course_name=course_name) as ev:
+                result.update(picked)
+                ev['course'] = result.get('교육과정코드')
+                ev['source'] = 'hedge'
+        else:
+            card = _search_card(page, course_name, query, search_url, deadline, result)
+            if card is None:
+                result['스크래핑결과'] = '검색 결과 없음'
+                return result
+
+            # 맞는 카드(없으면 1페이지 첫 카드)에서 정보 추출
+            with stage(logger, 'card', course_name=course_name) as ev:
+                # JS 추출 호출도 남은 예산 안에서만 기다림
+                page.set_default_timeout(deadline.ms(30000))
+                # 검색 결과 페이지에서 모든 정보 추출 (검색결과_제목 포함)
+                search_info = extract_search_result_info(card, page, projection)
+                result.update(search_info)
+                ev['course'] = result.get('교육과정코드')
+                ev['fields'] = len(search_info)
+
+            if archive is not None:
+                _archive_page(archive, 'card', lambda: card.evaluate('el => el.outerHTML'),
+                              result, page.url)
+
+        # 카드 컬럼만 요청했으면 상세 페이지로 가지 않음
+        if projection is not None and not projection.needs_detail:
+            classify_result(result, projection)
             return result
 
-        # 첫 번째 결과에서 정보 추출
-        first_result = results[0]
-
-        # 검색 결과 페이지에서 모든 정보 추출
-        search_info = extract_search_result_info(first_result, page)
-        result.update(search_info)
-
-        # 기본 제목 수집
-        title_elem = first_result.locator(".curriculum__info--title")
-        if title_elem.count() > 0:
-            result['검색결과_제목'] = clean_text(title_elem.inner_text())
-
         # 4. 상세 페이지로 이동
-        detail_link = first_result.locator("a").first
-
-        if detail_link.count() > 0:
-            # 새 페이지에서 열릴 수 있으므로 대기
-            try:
-                with page.expect_navigation(timeout=30000, wait_until="domcontentloaded"):
-                    detail_link.click()
-            except:
-                # navigation이 없을 경우 그냥 클릭
-                detail_link.click()
-                page.wait_for_load_state("domcontentloaded")
-
-            time.sleep(2)  # 페이지 완전 로딩 대기
-
-            # URL 확인
-            current_url = page.url
-            logger.info(f"  상세 페이지 이동: {current_url}")
-
-            # 5. 상세 페이지에서 완전한 정보 추출
-            detail_data = extract_detail_page_complete(page)
+        with stage(logger, 'detail', course=result.get('교육과정코드'),
+                   course_name=course_name):
+            if picked is not None:
+                open_detail(page, search_url.rsplit(SEARCH_PATH, 1)[0], picked,
+                            timeout=deadline.ms(30000))
+            elif not _click_detail(page, card, deadline):
+                result['스크래핑결과'] = '상세 링크 없음'
+                return result
+
+            deadline.sleep(2)  # 페이지 완전 로딩 대기
+
+        # 5. 상세 페이지에서 완전한 정보 추출
+        with stage(logger, 'extract', course=result.get('교육과정코드'),
+                   course_name=course_name) as ev:
+            page.set_default_timeout(deadline.ms(30000))
+            detail_data = extract_detail_page_complete(page, projection)
             result.update(detail_data)
+            ev['fields'] = len(detail_data)
 
-            # 성공 여부 판단
-            parsed_fields = len([k for k in result.keys()
-                               if k not in ['원본_교육과정명', '스크래핑_시각']])
-
-            if parsed_fields > 10:
-                result['스크래핑결과'] = '성공'
-                result['수집_필드수'] = parsed_fields
-            elif parsed_fields > 5:
-                result['스크래핑결과'] = '부분 성공'
-                result['수집_필드수'] = parsed_fields
-            else:
-                result['스크래핑결과'] = '정보 부족'
-                result['수집_필드수'] = parsed_fields
-
-            logger.info(f"  수집 완료: {parsed_fields}개 필드")
-        else:
-            result['스크래핑결과'] = '상세 링크 없음'
+        if archive is not None:
+            _archive_page(archive, 'detail', page.content, result, page.url)
+
+        # 성공 여부 판단 (추출 함수가 삼킨 타임아웃도 예산 소진이면 부분 결과로 처리)
+        classify_result(result, projection)
+        deadline.check()
 
     except Exception as e:
-        logger.error(f"  스크래핑 오류: {e}")
-        result['스크래핑결과'] = f'오류: {str(e)[:100]}'
+        if isinstance(e, DeadlineExceeded) or deadline.expired:
+            # 예산 소진: 모은 필드는 남기고 나중에 다시 시도
+            logger.warning("  시간 예산 소진 (%s, %.1f초)", course_name, deadline.elapsed())
+            classify_result(result, projection)
+            result['스크래핑결과'] = '타임아웃'
+        else:
+            logger.error("  스크래핑 오류 (%s): %s", course_name, e)
+            result['스크래핑결과'] = f'오류: {str(e)[:100]}'
 
     finally:
-        if browser:
+        if buffer is not None:
+            trace.finish(buffer, page, result)
+        if projection is not None:
+            projection.trim(result)
+        if context is not None:
+            profile.close(context)
+        elif browser:
             browser.close()
+        log_event(logger, 'course', course=result.get('교육과정코드'), course_name=course_name,
+                  duration=time.perf_counter() - course_start,
+                  status=result.get('스크래핑결과'), fields=result.get('수집_필드수'))
 
     return result
 
-def main():
-    """메인 실행 함수"""
-    # CSV 파일 로드
+def run_scrape(course_names, output_file='scraped_ultimate_final.csv',
+               temp_file='scraped_ultimate_temp.csv', save_every=10, delay=1.0,
+               completed=None, workers=1, search_url=SEARCH_URL, on_result=None,
+               archive=None, governor=None, course_budget=DEFAULT_COURSE_BUDGET,
+               deadline_retries=1, hedge=None, scheduler=None, profile=None, trace=None,
+               server=None, projection=None, selectors_file=LEARNED_FILE):
+    """교육과정 목록 스크래핑 (completed에 있는 과정은 건너뜀)
+
+    workers개의 스레드가 각자 playwright 인스턴스를 갖고 대기열에서 과정을 꺼내 처리한다.
+    on_result(result, seconds)는 과정 하나가 끝날 때마다 호출된다 (벤치마크 등).
+    archive(kohi_archive.PageArchive)를 주면 카드/상세 원본 HTML을 보관한다.
+    governor(kohi_governor.ResourceGovernor)를 주면 workers는 최대치가 되고, 실제 동시 작업자 수와
+    playwright 인스턴스 재시작은 메모리/CPU 예산에 따라 조절기가 정한다.
+    course_budget(초) 안에 끝나지 않은 과정은 부분 결과를 남기고 대기열 맨 뒤로 보내
+    deadline_retries번까지 새 예산으로 다시 시도한다.
+    hedge(kohi_hedge.HedgedSearch)를 주면 검색어 변형을 동시에 HTTP로 보내 채택된 카드의 상세 페이지로 바로 간다.
+    scheduler(kohi_priority.PriorityScheduler)를 주면 입력 순서 대신 우선순위 순으로 처리하고
+    시간 예산이 끝나면 남은 과정은 이번 실행에서 제외한다.
+    profile(kohi_profile.BrowserProfile)을 주면 작업자 스레드마다 영속 브라우저 프로필을 쓴다.
+    trace(kohi_trace.TraceCollector)를 주면 실패/부분 결과 과정의 최근 페이지 이벤트를 HAR로 남긴다.
+    server(kohi_browserd.resolve 결과)를 주면 과정마다 브라우저를 띄우는 대신 상주 브라우저 서버에 연결한다.
+    projection(kohi_projection.Projection)을 주면 요청 컬럼에 필요한 부분만 추출한다.
+    selectors_file: 학습된 셀렉터 순서를 읽고 끝에 저장할 파일 (None이면 명세 순서만, 저장 안 함).
+    """
+    from playwright.sync_api import sync_playwright
+
+    if selectors_file:
+        LEARNER.load(selectors_file)
+
+    results = list(completed or [])
+    done = {row.get('원본_교육과정명') for row in results}
+    pending = [name for name in course_names if name not in done]
+    if done:
+        logger.info("이어하기: %d개 완료, %d개 남음", len(results), len(pending))
+
+    new_results = [None] * len(pending)
+    if scheduler is not None:
+        queue = scheduler.queue(enumerate(pending))
+    else:
+        queue = deque(enumerate(pending))
+    lock = threading.Lock()
+    finished = [0]
+    attempts = {}
+
+    def start_playwright():
+        if governor is None:
+            return sync_playwright().start(), None
+        return governor.launch(lambda: sync_playwright().start())
+
+    def worker():
+        try:
+            p, driver_pid = start_playwright()
+        except Exception:
+            logger.exception("playwright 시작 실패")
+            return
+        try:
+            while True:
+                if governor is not None:
+                    governor.acquire()
+                try:
+                    idx, course_name = queue.popleft()
+                except IndexError:
+                    if governor is not None:
+                        governor.release()
+                    return
+                logger.info("[%d/%d] %s", idx + 1, len(pending), course_name)
+
+                # 각 교육과정 완전 스크래핑
+                start = time.perf_counter()
+                try:
+                    query, picked = hedge.pick(course_name) if hedge is not None else (None, None)
+                    result = scrape_course_complete(course_name, p, search_url=search_url,
+                                                    archive=archive, budget=course_budget,
+                                                    query=query, picked=picked, profile=profile,
+                                                    trace=trace, server=server,
+                                                    projection=projection)
+                finally:
+                    if governor is not None:
+                        governor.release()
+                if scheduler is not None:
+                    scheduler.observe(time.perf_counter() - start)
+                if on_result:
+                    on_result(result, time.perf_counter() - start)
+
+                with lock:
+                    # 부분 결과는 일단 기록하고, 재시도가 성공하면 덮어씀
+                    new_results[idx] = result
+                    attempts[idx] = attempts.get(idx, 0) + 1
+                    if result.get('스크래핑결과') == '타임아웃' and attempts[idx] <= deadline_retries:
+                        metrics.retry('deadline')
+                        logger.info("  시간 예산 소진, 나중에 다시 시도: %s", course_name)
+                        queue.append((idx, course_name))
+                    else:
+                        # 다시 시도하지 않는 최종 결과만 과정 수/실패 수에 셈
+                        metrics.course_finished(result.get('스크래핑결과'))
+                        finished[0] += 1
+                        count = finished[0]
+                        # 진행상황 저장 (save_every개마다)
+                        if temp_file and count % save_every == 0:
+                            write_rows(temp_file, results + [r for r in new_results if r])
+                            logger.info("임시 저장: %d개 완료", count)
+
+                # 드라이버/브라우저 메모리가 임계치를 넘으면 playwright 인스턴스 재시작
+                if governor is not None and queue and governor.should_recycle(driver_pid):
+                    p.stop()
+                    p, driver_pid = start_playwright()
+
+                # 속도 조절 (서버 부하 방지)
+                if queue:
+                    time.sleep(delay)
+        except Exception:
+            logger.exception("작업 스레드 오류")
+        finally:
+            p.stop()
+
+    workers = max(1, min(workers, len(pending)))
+    if governor is not None:
+        governor.cap(workers)
+        governor.start()
     try:
-        df = pd.read_csv(r"C:\KOHI\work.csv")
-        course_names = df.iloc[:, 0].tolist()
-        logger.info(f"총 {len(course_names)}개 교육과정 로드")
-    except Exception as e:
-        logger.error(f"CSV 로드 실패: {e}")
-        return
-
-    results = []
-
-    with sync_playwright() as p:
-        for idx, course_name in enumerate(course_names, 1):
-            logger.info(f"\n[{idx}/{len(course_names)}] {course_name}")
+        if workers == 1:
+            worker()
+        else:
+            threads = [threading.Thread(target=worker, name=f'kohi-worker-{i + 1}')
+                       for i in range(workers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    finally:
+        if governor is not None:
+            governor.stop()
 
-            # 각 교육과정 완전 스크래핑
-            result = scrape_course_complete(course_name, p)
-            results.append(result)
+    # 입력 순서대로 결과 정리
+    results.extend(r for r in new_results if r)
 
-            # 진행상황 저장 (10개마다)
-            if idx % 10 == 0:
-                temp_df = pd.DataFrame(results)
-                temp_df.to_csv(r"C:\KOHI\scraped_ultimate_temp.csv", index=False, encoding='utf-8-sig')
-                logger.info(f"임시 저장: {idx}개 완료")
+    if hedge is not None:
+        hedge.log_report()
+    if scheduler is not None:
+        scheduler.log_summary()
 
-            # 속도 조절 (서버 부하 방지)
-            if idx < len(course_names):
-                time.sleep(1)
+    # 학습된 셀렉터 순서 저장, 드리프트 의심 필드 요약
+    if selectors_file:
+        LEARNER.save(selectors_file)
+    if LEARNER.drifting:
+        logger.warning("⚠️ 셀렉터 드리프트 의심 필드: %s", ', '.join(sorted(LEARNER.drifting)))
 
     # 최종 결과 저장
     if results:
-        final_df = pd.DataFrame(results)
-        final_df.to_csv(r"C:\KOHI\scraped_ultimate_final.csv", index=False, encoding='utf-8-sig')
+        write_rows(output_file, results)
+        write_children(output_file, results)
 
-        # 통계 출력
         logger.info("\n" + "="*50)
         logger.info("🎉 완벽한 스크래핑 완료!")
-        logger.info(f"총 처리: {len(results)}개")
-
-        if '스크래핑결과' in final_df.columns:
-            stats = final_df['스크래핑결과'].value_counts()
-            for status, count in stats.items():
-                logger.info(f"  {status}: {count}개")
-
-        # 수집된 필드 통계
-        all_columns = set(final_df.columns)
-        logger.info(f"\n총 수집 필드 종류: {len(all_columns)}개")
-
-        # 주요 필드별 수집률
-        field_counts = {}
-        for col in final_df.columns:
-            non_null = final_df[col].notna().sum()
-            if non_null > 0:
-                field_counts[col] = non_null
-
-        logger.info("\n📊 주요 수집 필드 (상위 20개):")
-        for field, count in sorted(field_counts.items(), key=lambda x: x[1], reverse=True)[:20]:
-            percentage = (count / len(results)) * 100
-            logger.info(f"  {field}: {count}개 ({percentage:.1f}%)")
-
-        # 새로 추가된 필드 강조
-        new_fields = [col for col in all_columns if any(keyword in col for keyword in
-                     ['썸네일', '교육형태', '모집상태', '교육비_구분', '플랫폼', '교육목표',
-                      '학습방법', '평가방법', '강사', '교육분야', '맛보기'])]
-
-        if new_fields:
-            logger.info(f"\n✨ 새로 추가된 주요 필드:")
-            for field in new_fields:
-                count = final_df[field].notna().sum()
-                if count > 0:
-                    logger.info(f"  {field}: {count}개")
-
-        logger.info(f"\n💾 최종 결과 파일: C:\\KOHI\\scraped_ultimate_final.csv")
+        for line in format_report(summarize(results)):
+            logger.info(line)
+        logger.info("\n💾 최종 결과 파일: %s", output_file)
+
+    return results
+
+def main(input_file='work.csv', output_file='scraped_ultimate_final.csv',
+         temp_file='scraped_ultimate_temp.csv', limit=None, resume=False,
+         completed=None, save_every=10, delay=1.0, workers=1, base_url=BASE_URL,
+         archive_file=None, governor=None, course_budget=DEFAULT_COURSE_BUDGET, hedge=None,
+         scheduler=None, profile_dir=None, trace_dir=None, browser_server=None,
+         projection=None):
+    """메인 실행 함수 (archive_file: 원본 HTML 보관소 경로, None이면 보관 안 함,
+    governor: kohi_governor.ResourceGovernor, None이면 workers개 고정,
+    course_budget: 과정당 시간 예산(초), 0이면 무제한,
+    hedge: kohi_hedge.HedgedSearch, None이면 교육명 그대로 검색,
+    scheduler: kohi_priority.PriorityScheduler, None이면 입력 순서대로,
+    profile_dir: 영속 브라우저 프로필 디렉터리, None이면 과정마다 빈 브라우저,
+    trace_dir: 실패 과정 트레이스(HAR) 저장 디렉터리, None이면 저장 안 함,
+    browser_server: 브라우저 서버 상태 파일 또는 ws:// 주소, None이면 환경 변수 KOHI_BROWSER_SERVER,
+    projection: kohi_projection.Projection, None이면 모든 컬럼)"""
+    # CSV 파일 로드
+    try:
+        course_names = first_column(input_file)
+        if limit:
+            course_names = course_names[:limit]
+        logger.info("총 %d개 교육과정 로드", len(course_names))
+    except Exception as e:
+        logger.error("CSV 로드 실패: %s", e)
+        return []
+
+    if resume and completed is None:
+        completed = load_completed(temp_file)
+
+    archive = None
+    if archive_file:
+        from kohi_archive import PageArchive
+        archive = PageArchive(archive_file)
+    profile = None
+    if profile_dir:
+        from kohi_profile import BrowserProfile
+        profile = BrowserProfile(profile_dir)
+        profile.prepare(base_url)
+    trace = None
+    if trace_dir:
+        from kohi_trace import TraceCollector
+        trace = TraceCollector(trace_dir)
+    server = None if profile is not None else resolve_server(browser_server)
+    try:
+        with server_lease(server):
+            return run_scrape(course_names, output_file=output_file, temp_file=temp_file,
+                              save_every=save_every, delay=delay, completed=completed,
+                              workers=workers, search_url=base_url.rstrip('/') + SEARCH_PATH,
+                              archive=archive, governor=governor, course_budget=course_budget,
+                              hedge=hedge, scheduler=scheduler, profile=profile, trace=trace,
+                              server=server, projection=projection)
+    finally:
+        if trace is not None:
+            logger.info("실패 과정 트레이스: %s", trace.stats())
+        if archive is not None:
+            logger.info("원본 페이지 보관소: %s", archive.stats())
+            archive.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    from kohi import main as cli_main
+    sys.exit(cli_main(['scrape', '--engine', 'ultimate'] + sys.argv[1:]))
@@ -0,0 +1,391 @@
+"""
+KOHI 수집 결과 로컬 검색 서비스
+스크래핑 결과 CSV를 메모리에 색인해 교육과정을 HTTP/JSON으로 검색한다. CSV를 grep하거나
+edu.kohi.or.kr에 다시 접속하지 않고도 수시 질의에 답하기 위한 도구.
+
+- 문자 바이그램 역색인: 교육과정명, 교육소개, 교육구성 과목명 (공백 무시, 모든 검색어 AND)
+- 필터 색인: 교육형태, 모집상태, 교육분야, 교육기간/신청기간 날짜
+- 결과 CSV의 수정 시각을 주기적으로 확인해 바뀐 행만 다시 색인 (스크래핑 실행이 끝나면 자동 반영)
+
+    python kohi.py search --records scraped_ultimate_final.csv --port 8770
+    curl 'http://127.0.0.1:8770/search?q=역량평가&모집상태=모집중&date=2025-06-01'
+
+API (GET):
+    /search?q=..&교육형태=..&모집상태=..&교육분야=..&date=YYYY-MM-DD&open=YYYY-MM-DD&limit=20
+    /course?code=B2030518     전체 행
+    /facets                   필터 값별 과정 수
+    /health                   색인 크기, 원본 파일, 마지막 갱신
+    POST /reload              원본 파일 즉시 다시 확인
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from kohi_io import read_rows
+
+logger = logging.getLogger(__name__)
+
+# 검색 대상 텍스트 필드와 점수 가중치 (교육구성은 과목명만 뽑아 씀)
+TEXT_FIELDS = {'교육과정명': 3, '교육구성': 2, '교육소개': 1}
+
+# 정확히 일치로 거르는 필터 필드 (교육분야는 쉼표로 여러 값)
+FILTER_FIELDS = ['교육형태', '모집상태', '교육분야']
+
+# 날짜 필터: 질의 파라미터 -> 기간 컬럼
+DATE_FIELDS = {'date': '검색결과_교육기간', 'open': '검색결과_신청기간'}
+
+# 교육구성 JSON 항목에서 과목명으로 볼 키 (일부만 포함해도 됨)
+SUBJECT_KEY_PARTS = ['과목', '차시', '강의', '주제', '내용']
+
+# 검색 결과에 포함할 요약 필드
+SUMMARY_FIELDS = ['교육형태', '모집상태', '교육분야', '검색결과_교육기간', '검색결과_신청기간',
+                  '검색결과_신청현황', '상세페이지_URL']
+
+DEFAULT_LIMIT = 20
+
+_SPACE = re.compile(r'\s+')
+_PERIOD = re.compile(r'(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})')
+_SEP = '\x00'  # 필드 경계 (경계를 넘는 바이그램은 만들지 않음)
+
+
+def _norm(text):
+    """공백 제거 + 소문자 (띄어쓰기 차이 무시)"""
+    return _SPACE.sub('', text or '').lower()
+
+
+def _grams(text):
+    """문자 바이그램 집합 (필드 경계 제외)"""
+    return {text[i:i + 2] for i in range(len(text) - 1) if _SEP not in text[i:i + 2]}
+
+
+def course_key(row):
+    return row.get('교육과정코드') or row.get('원본_교육과정명') or ''
+
+
+def curriculum_subjects(raw):
+    """교육구성 JSON -> 과목명 목록 (해석 불가/해당 키 없음은 빈 목록)"""
+    if not raw or not raw.startswith('['):
+        return []
+    try:
+        items = json.loads(raw)
+    except ValueError:
+        return []
+    subjects = []
+    for item in items:
+        if isinstance(item, dict):
+            subjects.extend(str(v) for k, v in item.items()
+                            if v and any(part in k for part in SUBJECT_KEY_PARTS))
+    return subjects
+
+
+def _period(value):
+    match = _PERIOD.search(value or '')
+    return match.groups() if match else None
+
+
+class CourseIndex:
+    """교육과정 행 색인 (바이그램/문자 역색인 + 필터 색인, 행 단위 갱신)"""
+
+    def __init__(self):
+        self.docs = {}                 # doc id -> 원본 행
+        self.texts = {}                # doc id -> {필드: 정규화 텍스트}
+        self.ids = {}                  # course key -> doc id
+        self.fingerprints = {}         # doc id -> 행 해시 (바뀐 행만 다시 색인)
+        self.postings = defaultdict(set)                       # 바이그램/글자 -> doc ids
+        self.filters = {f: defaultdict(set) for f in FILTER_FIELDS}
+        self.periods = {param: {} for param in DATE_FIELDS}    # doc id -> (시작, 종료)
+        self._starts = {param: [] for param in DATE_FIELDS}    # 정렬된 (시작, doc id)
+        self._next_id = 0
+        self._lock = threading.RLock()
+        self.sources = {}              # 경로 -> 마지막으로 읽은 수정 시각
+        self.updated_at = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- 색인 갱신 ---
+
+    @staticmethod
+    def _fingerprint(row):
+        return hashlib.sha1(json.dumps(row, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _doc_texts(self, row):
+        texts = {
+            '교육과정명': _norm(row.get('교육과정명') or row.get('검색결과_제목') or row.get('원본_교육과정명')),
+            '교육구성': _SEP.join(_norm(s) for s in curriculum_subjects(row.get('교육구성'))),
+            '교육소개': _norm(row.get('교육소개')),
+        }
+        return {field: text for field, text in texts.items() if text}
+
+    def _terms(self, doc_id):
+        """문서의 색인 키 (바이그램 + 한 글자 검색용 글자)"""
+        keys = set()
+        for text in self.texts[doc_id].values():
+            keys |= _grams(text)
+            keys.update(text)
+        keys.discard(_SEP)
+        return keys
+
+    def _remove(self, doc_id):
+        for key in self._terms(doc_id):
+            postings = self.postings.get(key)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self.postings[key]
+        row = self.docs.pop(doc_id)
+        for field in FILTER_FIELDS:
+            for value in self._filter_values(row, field):
+                self.filters[field][value].discard(doc_id)
+        for param in DATE_FIELDS:
+            period = self.periods[param].pop(doc_id, None)
+            if period:
+                starts = self._starts[param]
+                starts.pop(bisect.bisect_left(starts, (period[0], doc_id)))
+        del self.texts[doc_id]
+
+    @staticmethod
+    def _filter_values(row, field):
+        value = (row.get(field) or '').strip()
+        if field == '교육분야':
+            return [v.strip() for v in value.split(',') if v.strip()]
+        return [value] if value else []
+
+    def upsert(self, row):
+        """행 추가/교체, 실제로 바뀌었으면 True"""
+        key = course_key(row)
+        if not key:
+            return False
+        fingerprint = self._fingerprint(row)
+        with self._lock:
+            doc_id = self.ids.get(key)
+            if doc_id is not None:
+                if self.fingerprints.get(doc_id) == fingerprint:
+                    return False
+                self._remove(doc_id)
+            else:
+                doc_id = self.ids[key] = self._next_id
+                self._next_id += 1
+
+            self.docs[doc_id] = row
+            self.fingerprints[doc_id] = fingerprint
+            self.texts[doc_id] = self._doc_texts(row)
+            for term in self._terms(doc_id):
+                self.postings[term].add(doc_id)
+            for field in FILTER_FIELDS:
+                for value in self._filter_values(row, field):
+                    self.filters[field][value].add(doc_id)
+            for param, column in DATE_FIELDS.items():
+                period = _period(row.get(column))
+                if period:
+                    self.periods[param][doc_id] = period
+                    bisect.insort(self._starts[param], (period[0], doc_id))
+            return True
+
+    def refresh(self, paths, force=False):
+        """원본 CSV 중 수정 시각이 바뀐 파일만 다시 읽어 바뀐 행 반영 (갱신된 행 수 반환)
+
+        성공 행(교육과정코드가 있는 행)만 색인하며, 이번 파일에 없는 과정은 그대로 둔다
+        (--limit 실행이나 다른 결과 파일에서 온 과정을 지우지 않도록).
+        """
+        changed = 0
+        for path in paths:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if not force and self.sources.get(path) == mtime:
+                continue
+            rows = [row for row in read_rows(path) if row.get('교육과정코드')]
+            changed += sum(self.upsert(row) for row in rows)
+            self.sources[path] = mtime
+        if changed:
+            self.updated_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+            logger.info("검색 색인 갱신: %d개 행 (전체 %d개)", changed, len(self))
+        return changed
+
+    # --- 조회 ---
+
+    def _match_term(self, term):
+        """검색어 하나를 포함하는 doc id 집합 (바이그램 교집합 후 부분 문자열 확인)"""
+        if len(term) == 1:
+            return set(self.postings.get(term, ()))
+        keys = sorted(_grams(term), key=lambda g: len(self.postings.get(g, ())))
+        candidates = set(self.postings.get(keys[0], ()))
+        for key in keys[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(key, set())
+        if len(term) > 2:
+            candidates = {d for d in candidates if any(term in t for t in self.texts[d].values())}
+        return candidates
+
+    def _date_filter(self, param, day):
+        """기간(시작 <= day <= 종료)에 day가 포함되는 doc id 집합"""
+        starts = self._starts[param]
+        end = bisect.bisect_right(starts, (day, float('inf')))
+        return {doc_id for _, doc_id in starts[:end] if self.periods[param][doc_id][1] >= day}
+
+    def search(self, query='', filters=None, limit=DEFAULT_LIMIT):
+        """검색어(AND)와 필터로 교육과정 검색, (전체 건수, 결과 목록) 반환"""
+        filters = filters or {}
+        terms = [_norm(t) for t in (query or '').split() if _norm(t)]
+        with self._lock:
+            sets = []
+            for term in sorted(terms, key=len, reverse=True):
+                sets.append(self._match_term(term))
+            for field in FILTER_FIELDS:
+                if filters.get(field):
+                    sets.append(self.filters[field].get(filters[field], set()))
+            for param in DATE_FIELDS:
+                if filters.get(param):
+                    sets.append(self._date_filter(param, filters[param]))
+
+            if sets:
+                sets.sort(key=len)
+                matched = set(sets[0]).intersection(*sets[1:])
+            else:
+                matched = set(self.docs)
+
+            scored = []
+            for doc_id in matched:
+                texts = self.texts[doc_id]
+                score = sum(weight for field, weight in TEXT_FIELDS.items()
+                            for term in terms if term in texts.get(field, ''))
+                scored.append((-score, texts.get('교육과정명', ''), doc_id))
+            scored.sort()
+            results = [self._summary(doc_id, -neg) for neg, _, doc_id in scored[:limit]]
+        return len(matched), results
+
+    def _summary(self, doc_id, score):
+        row = self.docs[doc_id]
+        summary = {'교육과정코드': row.get('교육과정코드'),
+                   '교육과정명': row.get('교육과정명') or row.get('검색결과_제목'),
+                   'score': score}
+        summary.update({f: row[f] for f in SUMMARY_FIELDS if row.get(f)})
+        return summary
+
+    def course(self, key):
+        with self._lock:
+            doc_id = self.ids.get(key)
+            return dict(self.docs[doc_id]) if doc_id is not None and doc_id in self.docs else None
+
+    def facets(self):
+        with self._lock:
+            return {field: {value: len(ids) for value, ids in sorted(values.items()) if ids}
+                    for field, values in self.filters.items()}
+
+
+class SearchService:
+    """색인 + 원본 파일 감시 + HTTP 서버"""
+
+    def __init__(self, paths, refresh_interval=10.0):
+        self.paths = list(paths)
+        self.refresh_interval = refresh_interval
+        self.index = CourseIndex()
+        self.index.refresh(self.paths)
+        self.server = None
+        self._stop = threading.Event()
+
+    def _watch(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.index.refresh(self.paths)
+            except Exception as e:
+                # 스크래퍼가 파일을 교체하는 순간 등 일시적 오류는 다음 주기에 다시 시도
+                logger.warning("검색 색인 갱신 실패: %s", e)
+
+    def start(self, port=0, addr='127.0.0.1'):
+        """백그라운드 스레드에서 서버 시작, base URL 반환"""
+        self.server = ThreadingHTTPServer((addr, port), _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='kohi-search', daemon=True).start()
+        if self.refresh_interval:
+            threading.Thread(target=self._watch, name='kohi-search-watch', daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def stop(self):
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def handle(self, method, path, params):
+        """(상태 코드, JSON 응답 객체)"""
+        if method == 'POST' and path == '/reload':
+            return 200, {'updated': self.index.refresh(self.paths), 'courses': len(self.index)}
+        if path == '/search':
+            try:
+                limit = int(params.get('limit') or DEFAULT_LIMIT)
+            except ValueError:
+                return 400, {'error': 'limit은 정수여야 합니다'}
+            start = time.perf_counter()
+            total, results = self.index.search(params.get('q', ''), params, limit)
+            return 200, {'query': params.get('q', ''), 'total': total,
+                         'took_ms': round((time.perf_counter() - start) * 1000, 3),
+                         'results': results}
+        if path == '/course':
+            course = self.index.course(params.get('code', ''))
+            return (200, course) if course else (404, {'error': '교육과정을 찾을 수 없습니다'})
+        if path == '/facets':
+            return 200, self.index.facets()
+        if path == '/health':
+            return 200, {'courses': len(self.index), 'terms': len(self.index.postings),
+                         'sources': self.paths, 'updated_at': self.index.updated_at}
+        return 404, {'error': 'not found'}
+
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug("search %s", format % args)
+
+        def _reply(self):
+            parsed = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            if self.command == 'POST':
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+            status, body = service.handle(self.command, parsed.path, params)
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = _reply
+        do_POST = _reply
+
+    return Handler
+
+
+def serve_forever(paths, port=8770, host='127.0.0.1', refresh_interval=10.0):
+    """검색 서비스를 띄우고 Ctrl+C까지 대기"""
+    service = SearchService(paths, refresh_interval)
+    service.start(port, host)
+    logger.info("검색 서비스 시작: %s (교육과정 %d개)", service.base_url, len(service.index))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        service.stop()
+    return 0
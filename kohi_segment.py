@@ -0,0 +1,284 @@
+"""
+교육명 사전 기반 한국어 분리기
+알려진 교육명에서 띄어쓰기 단위 단어 빈도(유니그램)를 모아 트라이로 만들고,
+붙어 쓴 단어는 비용(-log 확률)이 가장 작은 경로(Viterbi/DP)로 나눈다.
+
+    "장애인거주시설서비스최저기준의적용과딜레마"
+        -> ['장애인', '거주', '시설', '서비스', '최저', '기준', '적용', '딜레마']
+
+- 분리 결과는 사전에 있는 단어(= 실제 교육명에 나오는 단어) 또는 원문의 연속된 글자 묶음
+- 조사(의, 을, 에서 ...)는 떼어 내되, 사전에 없는 한 글자와 붙은 경우는 한 단어로 둔다 ('결과', '가족')
+- 각 위치에서 트라이를 최대 MAX_WORD 글자까지만 내려가므로 교육명 길이에 선형
+- enhance는 모은 빈도를 단어 사전 파일(DICTIONARY_FILE)에 고정해 두고 --rebuild-dictionary로만 다시 모음
+  (교육명이 하나 늘 때마다 빈도가 바뀌면 이미 분리한 교육명의 결과와 검색어 메모가 모두 바뀌므로)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from kohi_io import read_rows
+from kohi_memo import source_digest
+
+logger = logging.getLogger(__name__)
+
+# 조사 (긴 것 먼저)
+PARTICLES = ['에서', '으로', '의', '을', '를', '이', '가', '와', '과', '에', '로']
+
+# 사전에 넣을 최대 단어 길이 (더 긴 토큰은 붙여 쓴 복합어로 보고 그 안의 조각만 셈)
+MAX_WORD = 6
+
+# 사전에 없는 글자 하나의 추가 비용 (알려진 단어 조합이 있으면 항상 그쪽이 선택되도록)
+UNKNOWN_PENALTY = 10.0
+
+# 조사의 사전 빈도 (교육명 수로 환산, 낮을수록 조사를 떼어 내는 데 보수적)
+PARTICLE_WEIGHT = 3
+
+# 교육명을 모을 CSV와 컬럼 (입력 목록 + 스크래핑 결과의 실제 과정명)
+TITLE_SOURCES = ['work.csv', 'scraped_ultimate_final.csv', 'scraped_optimized_final.csv']
+TITLE_COLUMNS = ['교육명', '검색결과_제목', '교육과정명']
+
+# 고정 단어 사전 (조사 목록, 모은 빈도, 버전)
+DICTIONARY_FILE = 'segment_dictionary.json'
+
+_HANGUL = re.compile(r'[가-힣]+')
+_HANGUL_WORD = re.compile(r'^[가-힣]+$')
+
+_COUNT = None  # 트라이 노드에서 단어 끝 빈도를 담는 키
+
+
+def _lone(segment, counts):
+    """사전에 없는 한 글자 조각인지"""
+    return len(segment) == 1 and segment not in counts
+
+
+def load_titles(paths: Iterable[str] = TITLE_SOURCES) -> List[str]:
+    """존재하는 CSV에서 교육명 목록 수집 (중복 제거, 순서 유지)"""
+    titles = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for row in read_rows(path):
+            for column in TITLE_COLUMNS:
+                value = (row.get(column) or '').strip()
+                if value:
+                    titles.append(value)
+    return list(dict.fromkeys(titles))
+
+
+def counts_version(counts) -> str:
+    """단어 빈도 전체의 해시"""
+    items = sorted(counts.items())
+    return hashlib.sha256(repr(items).encode('utf-8')).hexdigest()[:16]
+
+
+def load_dictionary(path=DICTIONARY_FILE, titles: Iterable[str] = (), particles: Iterable[str] = PARTICLES,
+                    rebuild=False) -> Tuple[Counter, str]:
+    """단어 사전 -> (빈도, 버전)
+
+    path 파일이 있으면 그 빈도를 그대로 쓰고, 없거나 rebuild면 titles + load_titles()에서 다시 모아 저장한다.
+    path가 None이면 파일 없이 매번 모은다 (eval/hedge처럼 메모를 쓰지 않는 실행).
+    """
+    particles = sorted(set(particles))
+    if path and not rebuild and os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('particles') == particles:
+                return Counter(data['counts']), data['version']
+            logger.info("조사 목록이 달라 단어 사전을 다시 만듭니다: %s", path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("단어 사전을 읽지 못해 다시 만듭니다 (%s): %s", path, e)
+
+    titles = list(dict.fromkeys(list(titles) + load_titles()))
+    counts = mine_counts(titles, particles)
+    version = counts_version(counts)
+    if path:
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'titles': len(titles), 'particles': particles,
+                       'counts': dict(sorted(counts.items()))}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+        logger.info("단어 사전 저장: %s (교육명 %d개, 단어 %d개)", path, len(titles), len(counts))
+    return counts, version
+
+
+def mine_counts(titles: Iterable[str], particles: Iterable[str] = PARTICLES) -> Counter:
+    """교육명 목록에서 단어 빈도 수집 (빈도 = 그 단어가 나오는 교육명 수)
+
+    1. 띄어쓰기 단위 한글 토큰(MAX_WORD 이하)과, 붙여 쓴 토큰 안의 2~MAX_WORD 글자 조각 중
+       두 개 이상의 교육명에 나오는 것을 단어 후보로 모음
+    2. 항상 같은 앞/뒤 글자와 함께 나오는 조각은 더 긴 단어의 일부로 보고 버림
+       ('장애인거주시'는 언제나 '설'이 뒤따름, 토큰 끝에서 조사가 뒤따르는 경우는 제외)
+    3. 끝에 조사가 붙은 후보는 앞부분이 따로 후보이면, 앞에 조사가 붙은 후보는 나머지가
+       더 자주 나오면 버림 ('정책과' -> '정책', '를위한' -> '위한')
+    """
+    particles = list(particles)
+    tokens = Counter()
+    grams = Counter()
+    finals = set()
+    for title in dict.fromkeys(titles):
+        seen_tokens = set()
+        seen_grams = set()
+        for token in _HANGUL.findall(title):
+            if len(token) <= MAX_WORD:
+                seen_tokens.add(token)
+            finals.update(token[i:] for i in range(max(0, len(token) - MAX_WORD - 1), len(token)))
+            # 2단계 판정을 위해 MAX_WORD + 1 글자 조각까지 셈
+            for i in range(len(token)):
+                for j in range(i + 2, min(len(token), i + MAX_WORD + 1) + 1):
+                    seen_grams.add(token[i:j])
+        tokens.update(seen_tokens)
+        grams.update(seen_grams)
+
+    single = {p for p in particles if len(p) == 1}
+    absorbed = set()
+    for gram, count in grams.items():
+        if len(gram) > 2:
+            head, tail = gram[:-1], gram[1:]
+            if grams[head] == count and not (gram[-1] in single and gram in finals):
+                absorbed.add(head)
+            if grams[tail] == count:
+                absorbed.add(tail)
+
+    counts = Counter({g: c for g, c in grams.items()
+                      if len(g) <= MAX_WORD and (g in tokens or (c >= 2 and g not in absorbed))})
+    for word in list(counts):
+        if any(word.endswith(p) and len(word) - len(p) >= 2 and word[:-len(p)] in counts
+               for p in particles):
+            del counts[word]
+        elif any(word.startswith(p) and counts.get(word[len(p):], 0) > counts[word]
+                 for p in particles):
+            # '를위한'처럼 앞 단어의 조사가 붙은 조각 ('위한'이 더 자주 따로 나옴)
+            del counts[word]
+    return counts
+
+
+class Segmenter:
+    """유니그램 트라이 + 최소 비용 경로 분리기"""
+
+    def __init__(self, counts: Counter, particles: Iterable[str] = PARTICLES, version=None):
+        self.particles = sorted(set(particles), key=lambda p: (-len(p), p))
+        self.counts = Counter({w: c for w, c in counts.items() if c > 0})
+        self.version = version or counts_version(self.counts)
+        self.total = sum(self.counts.values()) or 1
+        self.max_len = max((len(w) for w in self.counts), default=1)
+        self._log_total = math.log(self.total)
+        self._unknown = self._log_total + UNKNOWN_PENALTY
+        self.root = {}
+        for word, count in self.counts.items():
+            node = self.root
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[_COUNT] = count
+
+    def memo_key(self):
+        """분리 결과를 정하는 값 (규칙 상수, 코드, 단어 사전 버전, 검색어 메모 버전에 쓰임)"""
+        return {'particles': self.particles, 'max_word': MAX_WORD, 'unknown_penalty': UNKNOWN_PENALTY,
+                'particle_weight': PARTICLE_WEIGHT, 'code': source_digest(type(self)),
+                'dictionary': self.version}
+
+    @classmethod
+    def from_counts(cls, counts: Counter, extra_words: Iterable[str] = (),
+                    particles: Iterable[str] = PARTICLES, extra_weight: int = 5, version=None):
+        """모은 단어 빈도(mine_counts/load_dictionary) + 복합명사 사전 -> 분리기
+
+        extra_words(복합명사 사전)는 extra_weight만큼 가중해 항상 한 단어로 남도록 하고,
+        조사는 단어 중간의 '의', '와' 등을 떼어 낼 수 있도록 사전에 넣되 결과에서는 제외
+        """
+        counts = Counter(counts)
+        for word in extra_words:
+            counts[word] += extra_weight
+        for p in particles:
+            counts[p] = max(counts[p], PARTICLE_WEIGHT)
+        return cls(counts, particles, version=version)
+
+    def _best_path(self, text: str) -> Tuple[float, List[str]]:
+        """DP 최소 비용 분리 (사전에 없는 연속 글자는 한 조각으로 합침)"""
+        n = len(text)
+        best = [0.0] + [math.inf] * n
+        back = [0] * (n + 1)
+        known = [False] * (n + 1)
+        for i in range(n):
+            if best[i] == math.inf:
+                continue
+            # 사전에 없는 글자 하나
+            step = best[i] + self._unknown
+            if step < best[i + 1]:
+                best[i + 1], back[i + 1], known[i + 1] = step, i, False
+            # 트라이를 따라 i에서 시작하는 사전 단어
+            node = self.root
+            for j in range(i, min(n, i + self.max_len)):
+                node = node.get(text[j])
+                if node is None:
+                    break
+                count = node.get(_COUNT)
+                if count:
+                    step = best[i] + self._log_total - math.log(count)
+                    if step < best[j + 1]:
+                        best[j + 1], back[j + 1], known[j + 1] = step, i, True
+
+        segments = []
+        end = n
+        while end > 0:
+            start = back[end]
+            if not known[end] and segments and segments[-1][1]:
+                # 사전에 없는 글자가 이어지면 하나로 합침
+                segments[-1] = (text[start:end] + segments[-1][0], True)
+            else:
+                segments.append((text[start:end], not known[end]))
+            end = start
+        return best[n], [s for s, _ in reversed(segments)]
+
+    def split_word(self, word: str) -> List[str]:
+        """띄어쓰기 없는 한 단어 -> 분리된 조각 (조사 조각은 제외)"""
+        if not _HANGUL_WORD.match(word):
+            return [word]
+        _, segments = self._best_path(word)
+
+        # 1. 사전에 없는 한 글자 옆의 조사는 그 글자와 한 단어로 봄 ('가족'은 '가' + '족'이 아님)
+        pieces = []
+        for seg in segments:
+            if pieces and _lone(pieces[-1], self.counts) and seg in self.particles:
+                pieces[-1] += seg
+            elif pieces and pieces[-1] in self.particles and _lone(seg, self.counts) and (
+                    len(pieces) == 1 or pieces[-2] not in self.counts):
+                pieces[-1] += seg
+            else:
+                pieces.append(seg)
+
+        # 2. 그래도 남은 사전에 없는 한 글자는 이웃 단어에 붙임 ('한' + '의약' -> '한의약', 조사 너머로는 붙이지 않음)
+        words = []
+        carry = ''
+        previous = None
+        for seg in pieces:
+            if _lone(seg, self.counts):
+                if words and previous == words[-1]:
+                    words[-1] += seg
+                    previous = words[-1]
+                else:
+                    carry += seg
+            elif seg in self.particles:
+                if carry:
+                    words.append(carry)
+                    carry = ''
+                previous = None
+            else:
+                words.append(carry + seg)
+                carry = ''
+                previous = words[-1]
+        if carry:
+            words.append(carry)
+        return words or [word]
+
+    def segment(self, text: str) -> List[str]:
+        """교육명 전체 -> 검색어 조각 목록 (조사 제외, 한글 외 토큰은 그대로)"""
+        pieces = []
+        for token in text.split():
+            pieces.extend(self.split_word(token))
+        return pieces
@@ -0,0 +1,671 @@
+"""
+KOHI 추출 명세 (두 스크래퍼 공용)
+검색 결과 카드와 상세 페이지에서 읽을 필드를 셀렉터/대체 셀렉터/후처리 이름으로 선언한다.
+명세는 하나의 JS 프로그램으로 실행되어 카드 1개(또는 상세 페이지 1개)당 page.evaluate
+왕복 한 번으로 모든 필드를 읽고, 같은 명세를 kohi_html 트리에도 적용할 수 있다 (오프라인).
+
+- 필드마다 마지막으로 성공한 대체 셀렉터를 기억해 다음 호출에서 먼저 시도
+  ('generic'으로 표시한 'a', 'h3' 같은 포괄 셀렉터는 앞당기지 않고 항상 명세 위치에서 시도)
+- 학습 파일은 import 시 읽지 않고 스크래핑 실행이 LEARNER.load/save로 명시적으로 사용
+- 필드마다 만들어 내는 컬럼('columns', 끝에 *면 접두어, 없으면 필드 이름)을 선언해 두어
+  컬럼 투영(kohi_projection)을 주면 필요한 필드만 실행
+- 최근 적중률이 지금까지의 최고치보다 크게 떨어지면 셀렉터 드리프트로 경고
+
+    from kohi_spec import CARD, DETAIL
+    info = CARD.extract(result_box)      # Playwright Locator/ElementHandle
+    data = DETAIL.extract(page)          # Playwright Page
+    info = CARD.extract(node)            # kohi_html.Node (브라우저 없이)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+
+from kohi_logging import debug_sampled
+from kohi_metrics import RUN as metrics
+from kohi_tables import GROUP_KEY, header_records
+
+logger = logging.getLogger(__name__)
+
+# 명세가 바뀌면 올림 (학습된 셀렉터 순서는 같은 버전에서만 재사용)
+SPEC_VERSION = '2025.3'
+
+LEARNED_FILE = 'kohi_selectors.json'
+
+# 검색 결과 카드 루트 (실제 사이트, 구 마크업 순)
+CARD_ROOTS = ['.curriculum__box', '.curriculum__item']
+
+CARD_FIELDS = [
+    {'name': '썸네일_이미지', 'selectors': ['.curriculum__thumbnail img'],
+     'kind': 'first', 'attrs': ['src'], 'text': False, 'post': 'thumbnail'},
+    {'name': '교육비_구분', 'selectors': ['.change-ico-box .ico', '.badge--price'],
+     'kind': 'first', 'post': 'text'},
+    {'name': '교육형태', 'selectors': ['.curriculum__info--badge .badge', '.badge--type'],
+     'kind': 'first', 'attrs': ['class'], 'post': 'edu_type', 'columns': ['교육형태', '교육형태_구분']},
+    {'name': '교육분야', 'selectors': ['.curriculum__info--badge span', '.curriculum__category'],
+     'kind': 'all', 'post': 'categories'},
+    {'name': '모집상태', 'selectors': ['.curriculum__info--badge em', '.badge--status'],
+     'kind': 'first', 'attrs': ['class'], 'post': 'recruit_status',
+     'columns': ['모집상태', '모집상태_구분']},
+    {'name': '교육대상_표시', 'selectors': ['.curriculum__info--badge em.gray'],
+     'kind': 'first', 'post': 'target'},
+    {'name': '지원플랫폼', 'selectors': ['.info--pc', '.info--mobile', '.info--sign'],
+     'kind': 'any', 'labels': ['PC', 'Mobile', '수어지원'], 'post': 'platforms'},
+    {'name': '맛보기영상', 'selectors': ['.slide__link--teaser'],
+     'kind': 'exists', 'post': 'present'},
+    {'name': '검색결과_상세', 'selectors': ['.curriculum__info--detail p'],
+     'kind': 'all', 'post': 'card_details',
+     'columns': ['검색결과_신청기간', '검색결과_교육기간', '검색결과_교육시간', '검색결과_신청현황']},
+    {'name': '교육과정코드', 'selectors': ['a[onclick*="btn_selectPaa0040"]', 'a', '.curriculum__title'],
+     'generic': ['a'],
+     'kind': 'first', 'attrs': ['onclick'], 'text': False, 'post': 'course_codes',
+     'columns': ['교육과정코드', '교육그룹코드']},
+    {'name': '검색결과_제목', 'selectors': ['.curriculum__info--title', '.curriculum__title'],
+     'kind': 'first', 'post': 'clean'},
+]
+
+DETAIL_FIELDS = [
+    {'name': '교육과정명',
+     'selectors': ['h3.tit', 'h3.sub_cont_title_h3', '.page-title h3', '.content-title', 'h3'],
+     'generic': ['h3'],
+     'kind': 'first', 'min_length': 3, 'post': 'clean'},
+    {'name': '섹션', 'selectors': ['h4'], 'kind': 'sections', 'post': 'sections',
+     'columns': ['교육소개', '교육목표', '학습방법', '평가방법', '강사정보', '문의처', '기타_*']},
+    {'name': '테이블', 'selectors': ['table'], 'kind': 'tables', 'post': 'tables',
+     'columns': ['신청_*', '수료_*', '교육구성', '교육구성_과목수', '교육구성_총시간',
+                 '추천교육과정', '추천교육과정_수', '기타정보_*']},
+    {'name': '다운로드_자료', 'selectors': ['a[href*="download"], a[href*="file"]'],
+     'kind': 'all', 'attrs': ['href'], 'limit': 5, 'post': 'downloads'},
+    {'name': '메타', 'selectors': ['meta[property*="og:"], meta[name*="description"]'],
+     'kind': 'all', 'attrs': ['property', 'name', 'content'], 'text': False, 'post': 'meta',
+     'columns': ['메타_설명', '메타_이미지']},
+]
+
+# 명세 하나를 실행하는 JS (root: Element 또는 document, plan: 필드별 셀렉터 시도 순서)
+PROGRAM_JS = r"""
+(root, plan) => {
+  const text = el => (el.innerText || el.textContent || '');
+  const pick = (el, f) => {
+    const o = {};
+    if (f.text) o.text = text(el);
+    for (const a of f.attrs) o[a] = el.getAttribute(a);
+    return o;
+  };
+  const out = {};
+  for (const f of plan) {
+    if (f.kind === 'any') {
+      out[f.name] = {hit: 0, value: f.selectors.map((s, i) => root.querySelector(s) ? i : -1).filter(i => i >= 0)};
+      continue;
+    }
+    for (const i of f.order) {
+      const els = Array.from(root.querySelectorAll(f.selectors[i]));
+      if (!els.length) continue;
+      let value;
+      if (f.kind === 'first') {
+        if (f.min_length && text(els[0]).replace(/\s+/g, ' ').trim().length < f.min_length) continue;
+        value = pick(els[0], f);
+      } else if (f.kind === 'all') {
+        value = els.slice(0, f.limit || els.length).map(el => pick(el, f));
+      } else if (f.kind === 'exists') {
+        value = true;
+      } else if (f.kind === 'sections') {
+        value = els.map(h => {
+          const parts = [];
+          for (let n = h.nextElementSibling; n && n.tagName !== h.tagName; n = n.nextElementSibling) {
+            if (n.tagName !== 'SCRIPT' && n.tagName !== 'STYLE') parts.push(text(n));
+          }
+          return {text: text(h), content: parts.join(' ')};
+        });
+      } else if (f.kind === 'tables') {
+        value = els.map(t => ({
+          text: text(t),
+          caption: t.caption ? text(t.caption) : '',
+          rows: Array.from(t.querySelectorAll('tr')).map(tr => ({
+            section: tr.parentElement ? tr.parentElement.tagName.toLowerCase() : '',
+            link: (a => a ? a.getAttribute('onclick') : null)(tr.querySelector('[onclick*="btn_selectPaa0040"]')),
+            cells: Array.from(tr.children)
+              .filter(c => c.tagName === 'TH' || c.tagName === 'TD')
+              .map(c => ({tag: c.tagName.toLowerCase(), text: text(c), rowspan: c.rowSpan, colspan: c.colSpan})),
+          })),
+        }));
+      }
+      out[f.name] = {hit: i, value: value};
+      break;
+    }
+  }
+  return out;
+}
+"""
+
+PAGE_PROGRAM_JS = f"plan => ({PROGRAM_JS})(document, plan)"
+
+ONCLICK_PATTERN = re.compile(r"btn_selectPaa0040\('([^']+)',\s*'([^']+)'\)")
+
+
+def clean_text(text):
+    """텍스트 정제 (연속 공백 제거)"""
+    if not text:
+        return ""
+    return ' '.join(text.split()).strip()
+
+
+# ---------------------------------------------------------------------------
+# 후처리: (원시값, 필드 명세) -> {컬럼: 값}
+# ---------------------------------------------------------------------------
+
+def _post_text(raw, field):
+    return {field['name']: (raw.get('text') or '').strip()}
+
+
+def _post_clean(raw, field):
+    text = clean_text(raw.get('text'))
+    return {field['name']: text} if text else {}
+
+
+def _post_thumbnail(raw, field):
+    src = raw.get('src')
+    if src and not src.endswith('no_img.gif'):
+        return {field['name']: src}
+    return {}
+
+
+def _post_edu_type(raw, field):
+    out = {field['name']: (raw.get('text') or '').strip()}
+    badge_class = raw.get('class') or ''
+    for key, label in (('face', '대면'), ('live', '라이브'), ('hybrid', '하이브리드'),
+                       ('e-learning', '이러닝'), ('bl', 'B/L')):
+        if key in badge_class:
+            out['교육형태_구분'] = label
+            break
+    return out
+
+
+def _post_categories(raw, field):
+    categories = [clean_text(item.get('text')) for item in raw]
+    categories = [c for c in categories if c and not c.startswith('모집')]
+    return {field['name']: ', '.join(categories)} if categories else {}
+
+
+def _post_recruit_status(raw, field):
+    out = {field['name']: (raw.get('text') or '').strip()}
+    status_class = raw.get('class') or ''
+    if 'yellow' in status_class:
+        out['모집상태_구분'] = '진행중'
+    elif 'gray' in status_class:
+        out['모집상태_구분'] = '마감'
+    return out
+
+
+def _post_target(raw, field):
+    text = (raw.get('text') or '').strip()
+    if '공무원' in text or '민간' in text:
+        return {field['name']: text}
+    return {}
+
+
+def _post_platforms(raw, field):
+    platforms = [field['labels'][i] for i in raw]
+    return {field['name']: ', '.join(platforms)} if platforms else {}
+
+
+def _post_present(raw, field):
+    return {field['name']: '있음'} if raw else {}
+
+
+def _post_card_details(raw, field):
+    out = {}
+    for item in raw:
+        text = clean_text(item.get('text'))
+        if '신청기간' in text:
+            out['검색결과_신청기간'] = text.replace('신청기간 : ', '').strip()
+        elif '교육기간' in text:
+            out['검색결과_교육기간'] = text.replace('교육기간 : ', '').strip()
+        elif '교육시간' in text:
+            out['검색결과_교육시간'] = text.replace('교육시간 : ', '').strip()
+        elif '신청인원' in text:
+            out['검색결과_신청현황'] = text.replace('신청인원/정원 : ', '').strip()
+    return out
+
+
+def _post_course_codes(raw, field):
+    match = ONCLICK_PATTERN.search(raw.get('onclick') or '')
+    if not match:
+        return {}
+    return {'교육과정코드': match.group(1), '교육그룹코드': match.group(2)}
+
+
+# h4 섹션 제목 -> 컬럼 (없으면 기타_<제목>, 바꾸면 DETAIL_FIELDS '섹션'의 columns도)
+SECTION_COLUMNS = [('교육소개', '교육소개'), ('교육목표', '교육목표'), ('학습방법', '학습방법'),
+                   ('평가방법', '평가방법'), ('강사', '강사정보'), ('문의', '문의처')]
+
+
+def _post_sections(raw, field):
+    out = {}
+    for section in raw:
+        title = clean_text(section.get('text'))
+        content = clean_text(section.get('content'))
+        if not content:
+            continue
+        column = next((col for key, col in SECTION_COLUMNS if key in title), None)
+        if column:
+            out[column] = content
+        else:
+            out[f'기타_{title}'] = content[:500]
+    return out
+
+
+def _cells(row, *tags):
+    return [clean_text(c['text']) for c in row['cells'] if c['tag'] in tags]
+
+
+def _pairs(row):
+    """th-td 짝 (같은 위치끼리)"""
+    ths, tds = _cells(row, 'th'), _cells(row, 'td')
+    return list(zip(ths, tds))
+
+
+def _header_table(table, thead_only=False, codes=False):
+    """헤더 행 + 데이터 행 표를 dict 목록으로 (병합 셀은 kohi_tables 격자로 펼침)
+
+    codes=True면 행 안의 btn_selectPaa0040 링크에서 교육과정코드/교육그룹코드도 담는다.
+    """
+    items = []
+    for row, item in header_records(table, thead_only=thead_only):
+        match = ONCLICK_PATTERN.search(row.get('link') or '') if codes else None
+        if match:
+            item['교육과정코드'], item['교육그룹코드'] = match.group(1), match.group(2)
+        items.append(item)
+    return items
+
+
+# 표 종류: 캡션의 'OO에 관한 표' 주제(공백 제거)가 이 이름으로 시작하면 그 종류
+TABLE_CAPTIONS = [('추천교육과정', 'recommend'), ('신청정보', 'apply'), ('수료기준', 'completion'),
+                  ('교육구성', 'curriculum'), ('교육일정', 'curriculum'), ('시간표', 'curriculum')]
+
+# 캡션으로 정하지 못한 표는 헤더 칸(th) 이름이 정확히 같은지로 판별 (위에서부터)
+TABLE_HEADERS = [
+    ('recommend', {'과정명', '과정분류'}),
+    ('curriculum', {'교과목', '교과목명', '과목명', '차시명', '강사', '강사명', '교육일', '교육일자', '교육일시'}),
+    ('completion', {'학습진도', '시험', '과제', '토론', '출석', '출석률', '수료기준점수'}),
+    ('apply', {'교육대상', '신청기간', '교육기간', '교육비'}),
+]
+
+# 교육구성 총시간에 더하는 열 (여러 줄 헤더로 나뉜 '교육시간_이론' 등 포함, 차시는 시간 열이 없을 때만)
+HOUR_COLUMNS = ('시간', '교육시간', '학습시간')
+HOUR_TOTAL_PARTS = ('계', '합계', '소계')
+
+def _table_kind(table):
+    """표 종류 (recommend/apply/completion/curriculum, 모르면 None)"""
+    caption = clean_text(table.get('caption'))
+    match = re.match(r'(.+?)에\s*관한\s*표', caption)
+    subject = (match.group(1) if match else caption).replace(' ', '')
+    if subject:
+        for name, kind in TABLE_CAPTIONS:
+            if subject.startswith(name):
+                return kind
+    headers = {h.replace(' ', '') for row in table['rows'] for h in _cells(row, 'th')}
+    for kind, names in TABLE_HEADERS:
+        if headers & names:
+            return kind
+    return None
+
+
+def _hours(value):
+    """'3', '1 시간 30 분', '60분 56초' -> 시간 (단위가 없으면 숫자 그대로)"""
+    units = [re.search(rf'(\d+\.?\d*)\s*{unit}', value) for unit in ('시간', '분', '초')]
+    if any(units):
+        return sum(float(m.group(1)) / scale for m, scale in zip(units, (1, 60, 3600)) if m)
+    found = re.findall(r'\d+\.?\d*', value)
+    return float(found[0]) if found else 0.0
+
+
+def _item_hours(item):
+    """교육구성 레코드 하나의 시간 (나뉜 시간 열은 합, '계' 열이 있으면 그 값만)"""
+    columns = [k for k in item if k.split('_')[0] in HOUR_COLUMNS] or [k for k in item if k == '차시']
+    totals = [k for k in columns if '_' in k and k.rsplit('_', 1)[1] in HOUR_TOTAL_PARTS]
+    return sum(_hours(item[key]) for key in totals or columns)
+
+
+def _post_tables(raw, field):
+    """상세 페이지 표 분류 (신청정보, 수료기준, 교육구성, 추천교육과정, 기타)
+
+    종류는 캡션 또는 헤더 칸 이름으로만 정한다 (본문 글자로 정하면 개인정보 제공 안내 표의 '교육일정' 같은
+    값 때문에 다른 표가 교육구성으로 잡힘). 교육구성은 처음 찾은 시간표만 쓴다.
+    """
+    out = {}
+    debug_sampled(logger, "  테이블 수: %d", len(raw))
+    for idx, table in enumerate(raw):
+        try:
+            table_text = table.get('text') or ''
+            rows = table['rows']
+            kind = _table_kind(table)
+
+            # 추천교육과정 테이블
+            if kind == 'recommend':
+                if '추천 교육과정이 없습니다' in table_text:
+                    out['추천교육과정'] = '없음'
+                else:
+                    reco_data = _header_table(table, thead_only=True, codes=True)
+                    if reco_data:
+                        out['추천교육과정'] = json.dumps(reco_data, ensure_ascii=False)
+                        out['추천교육과정_수'] = len(reco_data)
+
+            # 신청정보 테이블
+            elif kind == 'apply':
+                for row in rows:
+                    for key, value in _pairs(row):
+                        if key:
+                            # 키 이름 정규화
+                            out[f"신청_{key.replace('/', '_').replace(' ', '_')}"] = value
+
+            # 수료기준 테이블 (헤더 행 아래 첫 값 행, 병합 셀은 펼쳐서)
+            elif kind == 'completion':
+                records = header_records(table)
+                if records:
+                    for h, v in records[0][1].items():
+                        if h != GROUP_KEY:
+                            out[f'수료_{h}'] = v
+
+            # 교육구성 테이블 (처음 찾은 시간표만)
+            elif kind == 'curriculum':
+                if '교육구성' in out:
+                    continue
+                curriculum_data = _header_table(table)
+                if curriculum_data:
+                    out['교육구성'] = json.dumps(curriculum_data, ensure_ascii=False)
+                    out['교육구성_과목수'] = len(curriculum_data)
+                    total_hours = sum(_item_hours(item) for item in curriculum_data)
+                    if total_hours > 0:
+                        out['교육구성_총시간'] = round(total_hours, 2)
+
+            # 기타 정보 테이블 (th-td 쌍으로 이루어진 정보성 테이블)
+            elif 20 < len(table_text) < 2000:
+                for row in rows:
+                    for key, value in _pairs(row):
+                        if key and value and len(key) < 30:
+                            out[f'기타정보_{key}'] = value[:200]
+
+        except Exception as e:
+            debug_sampled(logger, "테이블 %d 파싱 오류: %s", idx, e)
+    return out
+
+
+def _post_downloads(raw, field):
+    downloads = [f"{clean_text(item.get('text'))}: {item.get('href')}" for item in raw
+                 if item.get('href') and clean_text(item.get('text'))]
+    return {field['name']: ', '.join(downloads)} if downloads else {}
+
+
+def _post_meta(raw, field):
+    out = {}
+    for item in raw:
+        prop = item.get('property') or item.get('name')
+        content = item.get('content')
+        if prop and content:
+            if 'description' in prop:
+                out['메타_설명'] = content[:200]
+            elif 'image' in prop:
+                out['메타_이미지'] = content
+    return out
+
+
+POST_PROCESSORS = {
+    'text': _post_text,
+    'clean': _post_clean,
+    'thumbnail': _post_thumbnail,
+    'edu_type': _post_edu_type,
+    'categories': _post_categories,
+    'recruit_status': _post_recruit_status,
+    'target': _post_target,
+    'platforms': _post_platforms,
+    'present': _post_present,
+    'card_details': _post_card_details,
+    'course_codes': _post_course_codes,
+    'sections': _post_sections,
+    'tables': _post_tables,
+    'downloads': _post_downloads,
+    'meta': _post_meta,
+}
+
+
+# ---------------------------------------------------------------------------
+# 대체 셀렉터 학습 / 드리프트 감지
+# ---------------------------------------------------------------------------
+
+class SelectorLearner:
+    """필드별로 마지막에 성공한 셀렉터 위치와 최근 적중률 추적
+
+    generic(포괄 셀렉터 위치)은 적중해도 앞당기지 않는다. 구체적인 셀렉터가 없는 페이지에서 한 번 맞았다고
+    'h3' 같은 셀렉터가 먼저 시도되면 이후 페이지에서 사이트 메뉴 제목 등을 잘못 읽기 때문.
+    """
+
+    def __init__(self, path=None, window=20, drift_ratio=0.5):
+        self.path = path
+        self.window = window
+        self.drift_ratio = drift_ratio
+        self.preferred = {}
+        self._recent = {}
+        self._best = {}
+        self.drifting = set()
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    def order(self, key, count, generic=()):
+        """시도 순서: 마지막 성공 셀렉터 먼저, 나머지는 명세 순"""
+        first = self.preferred.get(key)
+        if first is None or first >= count or first in generic:
+            return list(range(count))
+        return [first] + [i for i in range(count) if i != first]
+
+    def record(self, key, hit, generic=()):
+        """추출 결과 기록 (hit: 성공한 셀렉터 위치, 실패면 None, generic 위치는 선호로 기억하지 않음)"""
+        with self._lock:
+            learn = hit is not None and hit not in generic
+            if learn and self.preferred.get(key, hit) != hit:
+                logger.info("  셀렉터 전환: %s #%d -> #%d", key, self.preferred[key], hit)
+            if learn:
+                self.preferred[key] = hit
+
+            recent = self._recent.setdefault(key, deque(maxlen=self.window))
+            recent.append(hit is not None)
+            if len(recent) < self.window:
+                return
+            coverage = sum(recent) / len(recent)
+            best = self._best[key] = max(self._best.get(key, 0.0), coverage)
+            metrics.selector_coverage.set(round(coverage, 3), field=key)
+
+            if coverage < best * self.drift_ratio:
+                if key not in self.drifting:
+                    self.drifting.add(key)
+                    metrics.selector_drift.inc(field=key)
+                    logger.warning("⚠️ 셀렉터 드리프트 의심: %s 최근 적중률 %.0f%% (최고 %.0f%%)",
+                                   key, coverage * 100, best * 100)
+            else:
+                self.drifting.discard(key)
+
+    def coverage(self):
+        """필드별 최근 적중률"""
+        with self._lock:
+            return {key: sum(r) / len(r) for key, r in self._recent.items() if r}
+
+    def load(self, path):
+        """저장된 셀렉터 순서 읽기 (이후 save()의 기본 경로가 됨)"""
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get('version') == SPEC_VERSION:
+            self.preferred.update(saved.get('preferred', {}))
+
+    def save(self, path=None):
+        """학습된 셀렉터 순서 저장 (명세 버전 포함, 원자적 교체)"""
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            state = {'version': SPEC_VERSION, 'preferred': dict(self.preferred)}
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# 명세 실행
+# ---------------------------------------------------------------------------
+
+def _python_field(root, field, order):
+    """PROGRAM_JS와 같은 의미로 kohi_html 트리에서 필드 하나 읽기"""
+    from kohi_html import select
+
+    selectors = field['selectors']
+    want_text = field.get('text', True)
+    attrs = field.get('attrs', [])
+
+    def pick(node):
+        item = {'text': node.text()} if want_text else {}
+        item.update({a: node.attrs.get(a) for a in attrs})
+        return item
+
+    if field['kind'] == 'any':
+        return 0, [i for i, s in enumerate(selectors) if select(root, s)]
+
+    for i in order:
+        nodes = select(root, selectors[i])
+        if not nodes:
+            continue
+        kind = field['kind']
+        if kind == 'first':
+            if field.get('min_length') and len(nodes[0].text()) < field['min_length']:
+                continue
+            return i, pick(nodes[0])
+        if kind == 'all':
+            return i, [pick(n) for n in nodes[:field.get('limit') or len(nodes)]]
+        if kind == 'exists':
+            return i, True
+        if kind == 'sections':
+            sections = []
+            for h in nodes:
+                parts = []
+                sibling = h.next_element()
+                while sibling is not None and sibling.tag != h.tag:
+                    if sibling.tag not in ('script', 'style'):
+                        parts.append(sibling.text())
+                    sibling = sibling.next_element()
+                sections.append({'text': h.text(), 'content': ' '.join(parts)})
+            return i, sections
+        if kind == 'tables':
+            return i, [_python_table(t) for t in nodes]
+    return None, None
+
+
+def _python_table(table):
+    """표 노드 -> PROGRAM_JS 'tables'와 같은 구조 (브라우저처럼 tr의 암묵적 tbody 보정)"""
+    from kohi_html import Node, select
+
+    rows = []
+    for tr in select(table, 'tr'):
+        section = tr.parent.tag if tr.parent is not None else ''
+        links = select(tr, '[onclick*="btn_selectPaa0040"]')
+        rows.append({
+            'section': 'tbody' if section == 'table' else section,
+            'link': links[0].get('onclick') if links else None,
+            'cells': [{'tag': c.tag, 'text': c.text(), 'rowspan': c.get('rowspan') or 1,
+                       'colspan': c.get('colspan') or 1}
+                      for c in tr.children if isinstance(c, Node) and c.tag in ('th', 'td')],
+        })
+    captions = select(table, 'caption')
+    return {'text': table.text(), 'caption': captions[0].text() if captions else '', 'rows': rows}
+
+
+class ExtractionProgram:
+    """필드 명세를 한 번에 실행하는 추출기 (브라우저: JS 1회 호출, 오프라인: kohi_html)"""
+
+    def __init__(self, name, fields, learner):
+        for field in fields:
+            if field['post'] not in POST_PROCESSORS:
+                raise ValueError(f"알 수 없는 후처리: {field['post']}")
+        self.name = name
+        self.fields = fields
+        self.learner = learner
+        self._static = [{
+            'name': f['name'],
+            'kind': f['kind'],
+            'selectors': f['selectors'],
+            'attrs': f.get('attrs', []),
+            'text': f.get('text', True),
+            'limit': f.get('limit', 0),
+            'min_length': f.get('min_length', 0),
+        } for f in fields]
+
+    def _key(self, field):
+        return f"{self.name}.{field['name']}"
+
+    @staticmethod
+    def _generic(field):
+        generic = field.get('generic') or ()
+        return {i for i, selector in enumerate(field['selectors']) if selector in generic}
+
+    def _selected(self, projection=None):
+        """투영이 필요로 하는 필드 위치 (None이면 전부)"""
+        return [i for i, f in enumerate(self.fields)
+                if projection is None or projection.wants(f.get('columns') or [f['name']])]
+
+    def needed(self, projection=None):
+        """이 명세에서 읽을 필드가 하나라도 있는지 (없으면 페이지 이동/호출 자체를 건너뜀)"""
+        return bool(self._selected(projection))
+
+    def plan(self, projection=None):
+        """현재 학습 상태를 반영한 셀렉터 시도 순서"""
+        return [dict(self._static[i], order=self.learner.order(self._key(self.fields[i]),
+                                                               len(self.fields[i]['selectors']),
+                                                               self._generic(self.fields[i])))
+                for i in self._selected(projection)]
+
+    def run(self, target, projection=None):
+        """필드별 원시값 {이름: {'hit': 위치, 'value': 값}}"""
+        plan = self.plan(projection)
+        if hasattr(target, 'evaluate'):
+            if hasattr(target, 'goto'):  # Page
+                return target.evaluate(PAGE_PROGRAM_JS, plan)
+            return target.evaluate(PROGRAM_JS, plan)
+
+        raw = {}
+        for step, i in zip(plan, self._selected(projection)):
+            field = self.fields[i]
+            hit, value = _python_field(target, field, step['order'])
+            if hit is not None:
+                raw[field['name']] = {'hit': hit, 'value': value}
+        return raw
+
+    def extract(self, target, projection=None):
+        """명세의 필드(투영을 주면 필요한 필드만)를 읽어 후처리한 dict (필드 순서 유지)
+
+        건너뛴 필드는 셀렉터 적중률에도 기록하지 않는다 (드리프트 오탐 방지).
+        """
+        raw = self.run(target, projection)
+        data = {}
+        for field in (self.fields[i] for i in self._selected(projection)):
+            found = raw.get(field['name'])
+            if field['kind'] != 'any':
+                self.learner.record(self._key(field), found['hit'] if found else None,
+                                    self._generic(field))
+            if found:
+                data.update(POST_PROCESSORS[field['post']](found['value'], field))
+        return data
+
+
+# 학습 파일은 스크래핑 실행이 명시적으로 읽음 (재추출 작업자 등은 항상 명세 순서)
+LEARNER = SelectorLearner()
+
+CARD = ExtractionProgram('card', CARD_FIELDS, LEARNER)
+DETAIL = ExtractionProgram('detail', DETAIL_FIELDS, LEARNER)
+
+# 카드 루트 셀렉터 (Playwright/CSS 공통)
+CARD_SELECTOR = ', '.join(CARD_ROOTS)
@@ -0,0 +1,205 @@
+"""
+KOHI 상세 페이지 표 엔진 (rowspan/colspan -> 격자, 헤더 표 -> 자식 레코드)
+추출 명세(kohi_spec PROGRAM_JS / _python_table)가 표 하나를 한 번에 읽어 온 행 목록
+({section, link, cells: [{tag, text, rowspan, colspan}]})을 병합 셀이 펼쳐진 격자로 바꾸고,
+헤더 행(여러 줄 thead 포함) 아래 데이터 행을 헤더 이름 -> 값 레코드로 만든다.
+
+- 병합 셀은 걸친 칸마다 같은 값으로 채움 (교육구성 시간표의 날짜/강사 칸 등), 칸 수가 달라도 행을 버리지 않음
+- 여러 줄 헤더는 위에서 아래로 '교육시간_이론'처럼 이어 붙임
+- 표 전체 너비를 차지하는 한 칸짜리 행('1일차' 등)은 다음 행들의 '구분' 값
+- 교육구성/추천교육과정 레코드는 결과 CSV 옆에 과정 키가 붙은 긴 형식 자식 CSV로도 저장
+
+    scraped_ultimate_final.csv
+    scraped_ultimate_final_교육구성.csv       # 교육과정코드, 원본_교육과정명, 순번, 구분, 교과목, 강사, ...
+    scraped_ultimate_final_추천교육과정.csv
+"""
+
+import json
+import logging
+import os
+
+from kohi_io import write_rows
+
+logger = logging.getLogger(__name__)
+
+# 부모 행에 JSON 목록으로 담기고 자식 CSV로 펼치는 컬럼
+CHILD_COLUMNS = ('교육구성', '추천교육과정')
+
+# 자식 레코드 앞에 붙는 부모 키
+PARENT_KEYS = ('교육과정코드', '교육그룹코드', '원본_교육과정명')
+
+GROUP_KEY = '구분'
+
+
+def _span(cell, name):
+    try:
+        return max(1, int(cell.get(name) or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def table_grid(rows):
+    """표 행 목록 -> 병합 셀을 펼친 같은 모양의 행 목록
+
+    펼쳐진 칸은 원래 셀의 복사본이며 'origin'(원래 행, 열)이 같다. rowspan은 thead/tbody 경계를 넘지 않는다.
+    """
+    grid = []
+    carry = {}      # 열 -> [남은 행 수, 셀, origin]
+    section = None
+    for r, row in enumerate(rows):
+        if row.get('section') != section:
+            section, carry = row.get('section'), {}
+        out = []
+        col = 0
+
+        def fill_carried():
+            nonlocal col
+            while col in carry:
+                left, cell, origin = carry[col]
+                out.append(dict(cell, origin=origin))
+                if left <= 1:
+                    del carry[col]
+                else:
+                    carry[col][0] = left - 1
+                col += 1
+
+        for cell in row.get('cells') or []:
+            fill_carried()
+            origin = (r, col)
+            rowspan = _span(cell, 'rowspan')
+            for _ in range(_span(cell, 'colspan')):
+                out.append(dict(cell, origin=origin))
+                if rowspan > 1:
+                    carry[col] = [rowspan - 1, cell, origin]
+                col += 1
+        # 행 끝 뒤쪽 열에 걸친 셀 (중간에 빈 열이 있으면 빈 칸)
+        while carry and col <= max(carry):
+            if col in carry:
+                fill_carried()
+            else:
+                out.append({'tag': 'td', 'text': '', 'origin': (r, col)})
+                col += 1
+        grid.append(dict(row, cells=out))
+    return grid
+
+
+def _text(cell):
+    return ' '.join((cell.get('text') or '').split())
+
+
+def _is_header_row(row):
+    return bool(row['cells']) and all(c.get('tag') == 'th' for c in row['cells'])
+
+
+def _headers(head_rows):
+    """여러 줄 헤더 -> 열 이름 (같은 원래 셀에서 온 이름은 한 번만)"""
+    width = max(len(r['cells']) for r in head_rows)
+    headers = []
+    for j in range(width):
+        parts, seen = [], set()
+        for row in head_rows:
+            if j >= len(row['cells']):
+                continue
+            cell = row['cells'][j]
+            if cell['origin'] in seen or not _text(cell):
+                continue
+            seen.add(cell['origin'])
+            parts.append(_text(cell).replace(':', ''))
+        name = '_'.join(parts)
+        # colspan 헤더 아래 하위 헤더가 없으면 같은 이름이 반복되므로 번호를 붙임
+        if name and name in headers:
+            n = 2
+            while f'{name}_{n}' in headers:
+                n += 1
+            name = f'{name}_{n}'
+        headers.append(name)
+    return headers
+
+
+def header_records(table, thead_only=False):
+    """헤더 행 + 데이터 행 표 -> [(행, 레코드)] (행은 link 등 원래 행 정보)
+
+    헤더는 thead 행, thead가 없으면 맨 위의 th로만 된 행들 (thead_only면 thead가 있어야 함).
+    """
+    grid = table_grid(table['rows'])
+    head = [r for r in grid if r['section'] == 'thead']
+    if head:
+        body = [r for r in grid if r['section'] != 'thead']
+    elif thead_only:
+        return []
+    else:
+        count = 0
+        while count < len(grid) and _is_header_row(grid[count]):
+            count += 1
+        # th만 있는 행이 없으면 첫 행을 헤더로 (기존 동작)
+        count = count or min(1, len(grid))
+        head, body = grid[:count], grid[count:]
+    if not head:
+        return []
+    headers = _headers(head)
+    if not any(headers):
+        return []
+
+    records = []
+    group = None
+    for row in body:
+        cells = row['cells']
+        if not cells:
+            continue
+        # 표 너비를 다 차지하는 한 칸짜리 행은 구분 제목 (예: '1일차')
+        if len(cells) >= len(headers) > 1 and len({c['origin'] for c in cells}) == 1:
+            group = _text(cells[0]) or None
+            continue
+        values = [_text(c) for c in cells[:len(headers)]]
+        values += [''] * (len(headers) - len(values))
+        if not any(values):
+            continue
+        record = {}
+        if group:
+            record[GROUP_KEY] = group
+        for header, value in zip(headers, values):
+            if header:
+                record[header] = value
+        records.append((row, record))
+    return records
+
+
+def child_records(rows, column):
+    """결과 행들의 JSON 목록 컬럼 -> 부모 키 + 순번이 붙은 긴 형식 레코드"""
+    out = []
+    for row in rows:
+        try:
+            items = json.loads(row.get(column) or '[]')
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(items, list):
+            continue
+        parent = {key: row.get(key, '') for key in PARENT_KEYS}
+        for seq, item in enumerate(items, 1):
+            if not isinstance(item, dict):
+                continue
+            record = dict(parent, 순번=seq)
+            for key, value in item.items():
+                # 추천 과정의 교육과정코드처럼 부모 키와 겹치면 컬럼 이름을 앞에 붙임
+                record[f'{column}_{key}' if key in record else key] = value
+            out.append(record)
+    return out
+
+
+def child_path(path, column):
+    stem, ext = os.path.splitext(path)
+    return f'{stem}_{column}{ext or ".csv"}'
+
+
+def write_children(path, rows):
+    """결과 CSV(path) 옆에 자식 CSV 저장 (레코드가 없는 컬럼은 건너뜀), 저장한 경로 목록 반환"""
+    written = []
+    for column in CHILD_COLUMNS:
+        records = child_records(rows, column)
+        if not records:
+            continue
+        target = child_path(path, column)
+        write_rows(target, records)
+        written.append(target)
+        logger.info("자식 레코드 %d개: %s", len(records), target)
+    return written
@@ -0,0 +1,180 @@
+"""
+KOHI 실패 과정 트레이스 (항상 켜 두는 링 버퍼)
+과정마다 페이지의 최근 네트워크 요청/응답, 콘솔 메시지, 페이지 오류를 크기가 정해진 메모리 링 버퍼에 모으고,
+과정이 실패(오류/타임아웃)하거나 부분 결과('상세 링크 없음', '정보 부족', '부분 성공')로 분류될 때만
+그 시점의 DOM 스냅샷과 함께 HAR 파일로 저장한다. 성공한 과정의 버퍼는 그대로 버린다.
+
+    python kohi.py scrape --trace-dir traces
+
+    traces/20250101-093000_교육과정코드.har    # HAR 1.2 + _kohi(결과 행, 콘솔, 페이지 오류, DOM 스냅샷)
+
+- 전체 Playwright tracing(스크린샷/스냅샷 매 동작)을 모든 과정에 켜는 것보다 훨씬 가벼움
+  (이벤트 핸들러에서 dict 하나를 deque에 넣는 정도, DOM은 저장할 때 한 번만 읽음)
+- HAR 뷰어(브라우저 개발자 도구 Network 탭 가져오기 등)로 열 수 있음
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+TRACE_DIR = 'traces'
+
+# 과정당 링 버퍼 크기
+MAX_REQUESTS = 200
+MAX_CONSOLE = 100
+
+# 이 결과로 끝난 과정만 저장 ('오류: ...'는 접두어로)
+TRACE_STATUSES = ('상세 링크 없음', '정보 부족', '부분 성공', '타임아웃', '검색결과없음')
+TRACE_PREFIXES = ('오류',)
+
+_UNSAFE = re.compile(r'[^0-9A-Za-z가-힣_-]+')
+
+
+def should_trace(result):
+    status = (result or {}).get('스크래핑결과') or ''
+    return status in TRACE_STATUSES or status.startswith(TRACE_PREFIXES)
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec='milliseconds')
+
+
+class TraceBuffer:
+    """과정 하나의 페이지 이벤트 링 버퍼"""
+
+    def __init__(self, course_name, max_requests=MAX_REQUESTS, max_console=MAX_CONSOLE):
+        self.course_name = course_name
+        self.started = time.time()
+        self.entries = deque(maxlen=max_requests)    # 끝난 요청 (HAR entry)
+        self.console = deque(maxlen=max_console)     # 콘솔 메시지/페이지 오류/이동
+        self.pending = {}                            # 응답을 아직 받지 못한 요청 -> entry
+        self._lock = threading.Lock()
+
+    def attach(self, page):
+        page.on('request', self._on_request)
+        page.on('response', self._on_response)
+        page.on('requestfailed', self._on_failed)
+        page.on('console', lambda msg: self._note('console', msg.type, msg.text))
+        page.on('pageerror', lambda error: self._note('pageerror', 'error', str(error)))
+        page.on('framenavigated',
+                lambda frame: frame.parent_frame is None and self._note('navigate', 'info', frame.url))
+        return self
+
+    def _note(self, kind, level, text):
+        self.console.append({'time': _iso(time.time()), 'kind': kind, 'level': level,
+                             'text': (text or '')[:2000]})
+
+    def _on_request(self, request):
+        entry = {'startedDateTime': _iso(time.time()), 'time': 0,
+                 'request': {'method': request.method, 'url': request.url, 'httpVersion': 'HTTP/1.1',
+                             'headers': [], 'queryString': [], 'cookies': [],
+                             'headersSize': -1, 'bodySize': len(request.post_data or '')},
+                 '_resourceType': request.resource_type, '_t0': time.perf_counter()}
+        with self._lock:
+            self.pending[request] = entry
+
+    def _finish(self, request):
+        with self._lock:
+            entry = self.pending.pop(request, None)
+        if entry is not None:
+            entry['time'] = round((time.perf_counter() - entry.pop('_t0')) * 1000, 1)
+            self.entries.append(entry)
+        return entry
+
+    def _on_response(self, response):
+        entry = self._finish(response.request)
+        if entry is None:
+            return
+        headers = response.headers
+        length = headers.get('content-length', '')
+        entry['response'] = {
+            'status': response.status, 'statusText': response.status_text, 'httpVersion': 'HTTP/1.1',
+            'headers': [{'name': k, 'value': v} for k, v in headers.items()], 'cookies': [],
+            'content': {'size': int(length) if length.isdigit() else -1,
+                        'mimeType': headers.get('content-type', '')},
+            'redirectURL': headers.get('location', ''), 'headersSize': -1,
+            'bodySize': int(length) if length.isdigit() else -1}
+
+    def _on_failed(self, request):
+        entry = self._finish(request)
+        if entry is not None:
+            entry['response'] = {'status': 0, 'statusText': '', 'httpVersion': '', 'headers': [],
+                                 'cookies': [], 'content': {'size': 0, 'mimeType': ''},
+                                 'redirectURL': '', 'headersSize': -1, 'bodySize': -1,
+                                 '_error': request.failure or ''}
+
+    def har(self, result=None, dom=None):
+        """HAR 1.2 dict (응답을 못 받은 요청은 _pending으로 포함)"""
+        now = time.perf_counter()
+        with self._lock:
+            pending = [dict(entry, time=round((now - entry['_t0']) * 1000, 1), _pending=True)
+                       for entry in self.pending.values()]
+        entries = list(self.entries)
+        for entry in pending:
+            entry.pop('_t0', None)
+            entry['response'] = {'status': 0, 'statusText': '', 'httpVersion': '', 'headers': [],
+                                 'cookies': [], 'content': {'size': 0, 'mimeType': ''},
+                                 'redirectURL': '', 'headersSize': -1, 'bodySize': -1}
+        for entry in entries + pending:
+            entry.setdefault('cache', {})
+            entry.setdefault('timings', {'send': 0, 'wait': entry['time'], 'receive': 0})
+        return {'log': {
+            'version': '1.2',
+            'creator': {'name': 'kohi-trace', 'version': '1'},
+            'pages': [{'startedDateTime': _iso(self.started), 'id': 'page_1',
+                       'title': self.course_name, 'pageTimings': {}}],
+            'entries': [dict(entry, pageref='page_1') for entry in entries + pending],
+            '_kohi': {'course_name': self.course_name, 'result': result or {},
+                      'console': list(self.console), 'dom': dom},
+        }}
+
+
+class TraceCollector:
+    """과정별 버퍼를 만들고, 실패/부분 결과인 과정의 버퍼만 파일로 저장"""
+
+    def __init__(self, directory=TRACE_DIR, max_requests=MAX_REQUESTS, max_console=MAX_CONSOLE):
+        self.directory = directory
+        self.max_requests = max_requests
+        self.max_console = max_console
+        self.saved = 0
+        self.discarded = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self, course_name, page) -> TraceBuffer:
+        return TraceBuffer(course_name, self.max_requests, self.max_console).attach(page)
+
+    def finish(self, buffer, page, result):
+        """결과에 따라 저장하거나 버림 (저장한 경로 반환, 저장 실패가 스크래핑을 막지 않도록)"""
+        if not should_trace(result):
+            with self._lock:
+                self.discarded += 1
+            return None
+        try:
+            dom = None
+            try:
+                dom = page.content()
+            except Exception as e:
+                logger.debug("  DOM 스냅샷 실패: %s", e)
+            name = _UNSAFE.sub('_', result.get('교육과정코드') or buffer.course_name)[:60]
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+            path = os.path.join(self.directory, f'{stamp}_{name}.har')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(buffer.har(result, dom), f, ensure_ascii=False, default=str)
+        except Exception as e:
+            logger.warning("  트레이스 저장 실패 (%s): %s", buffer.course_name, e)
+            return None
+        with self._lock:
+            self.saved += 1
+        logger.info("  트레이스 저장 (%s): %s", result.get('스크래핑결과'), path)
+        return path
+
+    def stats(self):
+        return {'saved': self.saved, 'discarded': self.discarded, 'directory': self.directory}
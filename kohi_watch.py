@@ -0,0 +1,326 @@
+"""
+KOHI 모집중 과정 신청현황 감시 (watch 모드)
+이전 스크래핑 결과에서 모집중 과정만 골라, 검색 결과 카드만 주기적으로 다시 읽어
+검색결과_신청현황 / 모집상태 변화를 이벤트로 내보낸다.
+
+- 브라우저와 상세 페이지 없이 검색 요청(BD_paa0010l.do POST) 1회로 카드만 파싱
+- 한 응답에 다른 감시 대상 카드가 함께 오면 같은 주기에서 재요청하지 않음
+- 요청은 주기(interval) 안에 고르게 분산, 연결은 keep-alive로 재사용
+- 상태는 메모리에만 유지 (시작 시 결과 CSV 값으로 초기화)
+
+    python kohi.py watch --records scraped_ultimate_final.csv --interval 300 \\
+        --jsonl watch_events.jsonl --webhook http://127.0.0.1:9000/kohi
+"""
+
+import gzip
+import http.client
+import json
+import logging
+import re
+import socket
+import threading
+import time
+from concurrent.futures import CancelledError
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+from kohi_cards import parse_cards
+from kohi_io import read_rows
+from kohi_logging import log_event, stage
+from kohi_metrics import RUN as metrics
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = "/pt/pa/paa/BD_paa0010l.do"
+DETAIL_PATH = "/pt/pa/paa/BD_paa0040d.do"
+
+# 변화를 감시하는 카드 필드
+WATCH_FIELDS = ('검색결과_신청현황', '모집상태', '모집상태_구분')
+
+OPEN_STATUS = '모집중'
+
+ENROLLMENT_PATTERN = re.compile(r'(\d+)\s*/\s*(\d+)')
+
+
+def parse_enrollment(text):
+    """'11 / 25 명' -> (11, 25), 형식이 다르면 (None, None)"""
+    match = ENROLLMENT_PATTERN.search(text or '')
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+
+class CardFetcher:
+    """검색 카드(와 상세 페이지 HTML)를 가져오는 HTTP 클라이언트 (연결 재사용, gzip 응답)"""
+
+    def __init__(self, base_url="https://edu.kohi.or.kr", timeout=15.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'https'
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip('/') or ''
+        self.path = self.prefix + SEARCH_PATH
+        self.timeout = timeout
+        self._conn = None
+        self.requests = 0
+        self.bytes = 0
+        self.cancelled = False
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, timeout=self.timeout)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _request(self, query, path=None, params=None):
+        if self._conn is None:
+            self._conn = self._connect()
+        body = urlencode(params or {'planngCrseNm': query})
+        self._conn.request('POST', path or self.path, body=body, headers={
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Accept': 'text/html',
+            'Accept-Encoding': 'gzip',
+            'User-Agent': 'Mozilla/5.0 (kohi-watch)',
+        })
+        response = self._conn.getresponse()
+        data = response.read()
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        self.bytes += len(data)
+        metrics.fetched_bytes.inc(len(data))
+        if response.getheader('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return data.decode(charset, errors='replace')
+
+    def cancel(self):
+        """다른 스레드에서 진행 중인 요청 중단 (소켓을 끊어 응답 대기를 깨우고 재연결하지 않음)"""
+        self.cancelled = True
+        conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def fetch(self, query, page_index=1):
+        """검색어로 카드 목록 조회 (page_index: 결과 페이지 번호, 끊긴 keep-alive 연결은 1회 재연결)"""
+        if self.cancelled:
+            raise CancelledError(query)
+        self.requests += 1
+        params = {'planngCrseNm': query}
+        if page_index > 1:
+            params['pageIndex'] = page_index
+        try:
+            html = self._request(query, params=params)
+        except (http.client.HTTPException, OSError):
+            self.close()
+            if self.cancelled:
+                raise CancelledError(query)
+            html = self._request(query, params=params)
+        return parse_cards(html)
+
+    def pages(self, query, max_pages=5):
+        """결과 페이지별 카드 목록을 지연 생성 (빈 페이지나 앞 페이지와 같은 페이지에서 멈춤)"""
+        previous = None
+        for page_index in range(1, max_pages + 1):
+            cards = self.fetch(query, page_index)
+            codes = [card.get('교육과정코드') for card in cards]
+            if not cards or codes == previous:
+                return
+            yield cards
+            previous = codes
+
+    def detail_html(self, code, group):
+        """상세 페이지 HTML (btn_selectPaa0040(code, group)과 같은 POST, 끊긴 연결은 1회 재연결)"""
+        path, params = self.prefix + DETAIL_PATH, {'crseCd': code, 'grnoCd': group}
+        self.requests += 1
+        try:
+            return self._request(code, path, params)
+        except (http.client.HTTPException, OSError):
+            self.close()
+            return self._request(code, path, params)
+
+
+class JsonlSink:
+    """이벤트를 JSONL 파일에 한 줄씩 추가"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, event):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """이벤트를 JSON POST로 전달 (실패해도 감시는 계속)"""
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, event):
+        from urllib.request import Request, urlopen
+
+        request = Request(self.url, data=json.dumps(event, ensure_ascii=False).encode('utf-8'),
+                          headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except OSError as e:
+            logger.warning("웹훅 전송 실패 (%s): %s", self.url, e)
+
+
+def load_targets(records_file, limit=None):
+    """결과 CSV에서 모집중 과정만 감시 대상으로 선택 (교육과정코드 기준 중복 제거)"""
+    targets = {}
+    for row in read_rows(records_file):
+        code = row.get('교육과정코드')
+        if not code or code in targets or row.get('모집상태') != OPEN_STATUS:
+            continue
+        targets[code] = {
+            'query': row.get('원본_교육과정명') or row.get('검색결과_제목'),
+            'title': row.get('검색결과_제목') or row.get('원본_교육과정명'),
+            'state': {field: row.get(field, '') for field in WATCH_FIELDS},
+            'misses': 0,
+        }
+        if limit and len(targets) >= limit:
+            break
+    return targets
+
+
+class CourseWatcher:
+    """감시 대상 카드를 주기적으로 조회하고 변화 이벤트 발생"""
+
+    def __init__(self, targets, fetcher, sinks, interval=300.0, miss_limit=3):
+        self.targets = targets
+        self.fetcher = fetcher
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.miss_limit = miss_limit
+        self.events = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, event_type, code, **data):
+        target = self.targets[code]
+        event = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'event': event_type,
+            'course': code,
+            'title': target['title'],
+        }
+        event.update(data)
+        self.events += 1
+        log_event(logger, 'watch', course=code, event=event_type)
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def _update(self, code, card):
+        """카드 값과 메모리 상태 비교 후 변화 이벤트 발생 (마감되면 감시 종료)"""
+        target = self.targets[code]
+        target['misses'] = 0
+        state = target['state']
+        changes = {field: {'old': state.get(field, ''), 'new': card.get(field, '')}
+                   for field in WATCH_FIELDS if card.get(field, '') != state.get(field, '')}
+        if changes:
+            state.update({field: change['new'] for field, change in changes.items()})
+            applied, capacity = parse_enrollment(state.get('검색결과_신청현황'))
+            self._emit('change', code, changes=changes, applied=applied, capacity=capacity)
+
+        if state.get('모집상태') != OPEN_STATUS:
+            self._emit('closed', code, status=state.get('모집상태'))
+            del self.targets[code]
+
+    def _missed(self, code):
+        """자기 검색어로도 카드가 안 보이는 경우 (miss_limit회 연속이면 감시 종료)"""
+        target = self.targets[code]
+        target['misses'] += 1
+        if target['misses'] >= self.miss_limit:
+            self._emit('missing', code, misses=target['misses'])
+            del self.targets[code]
+
+    def poll_cycle(self):
+        """한 주기: 대상마다 최대 1회 검색, 요청 간격은 interval 안에 고르게 분산"""
+        start = time.perf_counter()
+        codes = list(self.targets)
+        spacing = self.interval / max(len(codes), 1)
+        seen = set()
+        requests = 0
+
+        for code in codes:
+            if self._stop.is_set():
+                break
+            if code in seen or code not in self.targets:
+                continue
+            if requests:
+                self._stop.wait(spacing)
+
+            requests += 1
+            try:
+                with stage(logger, 'watch_fetch', course=code) as ev:
+                    cards = self.fetcher.fetch(self.targets[code]['query'])
+                    ev['cards'] = len(cards)
+            except Exception as e:
+                metrics.retry('watch_fetch')
+                logger.warning("  카드 조회 실패 (%s): %s", code, e)
+                continue
+
+            for card in cards:
+                card_code = card.get('교육과정코드')
+                if card_code in self.targets and card_code not in seen:
+                    seen.add(card_code)
+                    self._update(card_code, card)
+            if code not in seen and code in self.targets:
+                self._missed(code)
+
+        log_event(logger, 'watch_cycle', duration=time.perf_counter() - start,
+                  requests=requests, targets=len(self.targets), events=self.events)
+        return requests
+
+    def run(self, cycles=0):
+        """cycles회(0이면 stop() 또는 대상 소진까지) 반복"""
+        done = 0
+        while self.targets and not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_cycle()
+            done += 1
+            if cycles and done >= cycles:
+                break
+            # 요청이 적어 주기보다 빨리 끝나면 남은 시간만큼 대기
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+        self.fetcher.close()
+        return done
+
+
+def watch(records_file, base_url="https://edu.kohi.or.kr", interval=300.0, jsonl=None,
+          webhook=None, cycles=0, limit=None, miss_limit=3):
+    """감시 실행 (대상이 없으면 바로 종료)"""
+    targets = load_targets(records_file, limit=limit)
+    logger.info("감시 대상: 모집중 과정 %d개 (주기 %.0f초)", len(targets), interval)
+    if not targets:
+        return None
+
+    sinks = []
+    if jsonl:
+        sinks.append(JsonlSink(jsonl))
+    if webhook:
+        sinks.append(WebhookSink(webhook))
+
+    watcher = CourseWatcher(targets, CardFetcher(base_url), sinks,
+                            interval=interval, miss_limit=miss_limit)
+    try:
+        watcher.run(cycles=cycles)
+    except KeyboardInterrupt:
+        logger.info("감시 중단")
+    finally:
+        watcher.fetcher.close()
+    logger.info("감시 종료: 요청 %d회, 이벤트 %d건", watcher.fetcher.requests, watcher.events)
+    return watcher
@@ -3,18 +3,13 @@
 10개 샘플로 개선 효과 검증
 """
 
-import pandas as pd
 import logging
-from kohi_scraper_optimized import KOHIScraperOptimized
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 
 def test_optimized_scraper():
     """최적화 스크래퍼 테스트"""
+    # pandas/playwright는 실행 시점에 지연 import
+    import pandas as pd
+    from kohi_scraper_optimized import KOHIScraperOptimized
 
     print("\n" + "="*70)
     print(" "*25 + "최적화 스크래퍼 테스트")
@@ -95,5 +90,10 @@ def test_optimized_scraper():
     return result_df
 
 if __name__ == "__main__":
+    # 로깅 설정
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     test_results = test_optimized_scraper()
     print("\n테스트 완료! 결과는 scraped_optimized_test.csv에 저장되었습니다.")
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""저장소 루트의 kohi_*.py 모듈을 import할 수 있도록 경로 추가"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
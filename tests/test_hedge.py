@@ -0,0 +1,74 @@
+"""동시 검색: 같은 검색어는 한 번만 보내고, 채택된 카드를 스크래퍼에 넘김"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import ROOT
+from kohi_hedge import HedgedSearch
+from kohi_mock_server import build_mock
+
+
+class SlowFetcher:
+    """검색어별 호출 수를 세는 느린 가짜 CardFetcher"""
+
+    def __init__(self, cards, calls):
+        self.cards = cards
+        self.calls = calls
+
+    def fetch(self, query):
+        self.calls.append(query)
+        time.sleep(0.05)
+        return self.cards.get(query, [])
+
+
+def test_in_flight_query_is_fetched_once():
+    hedge = HedgedSearch('http://unused', variants=['basic'])
+    try:
+        cards = {'교육 과정': [{'검색결과_제목': '다른 제목'}]}
+        calls = []
+        shared = {'lock': threading.Lock(), 'cards': {}}
+        stop = threading.Event()
+        plans = [['교육 과정', '교육'], ['교육 과정', '교육']]
+        with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+            outcomes = list(pool.map(
+                lambda plan: hedge._run_plan('교육 과정', plan, SlowFetcher(cards, calls), shared, stop),
+                plans))
+    finally:
+        hedge.close()
+
+    assert sorted(calls) == ['교육', '교육 과정']
+    assert [outcome for outcome, _, _ in outcomes] == ['miss', 'miss']
+
+
+@pytest.fixture(scope='module')
+def mock():
+    mock = build_mock(os.path.join(ROOT, 'scraped_ultimate_temp.csv'))
+    mock.start()
+    yield mock
+    mock.stop()
+
+
+def test_pick_returns_winning_card(mock):
+    course = next(c for c in mock.catalog if c.get('교육과정코드') and c.get('교육그룹코드'))
+    name = course['검색결과_제목']
+    hedge = HedgedSearch(mock.base_url, titles=[name], timeout=10.0)
+    try:
+        query, card = hedge.pick(name)
+    finally:
+        hedge.close()
+
+    assert query
+    assert card['교육과정코드'] and card['교육그룹코드']
+    assert card['검색결과_제목'] == name
+
+
+def test_pick_falls_back_without_card(mock):
+    hedge = HedgedSearch(mock.base_url, timeout=10.0)
+    try:
+        assert hedge.pick('없는 교육과정 이름 zzz', fallback='개선 검색어') == ('개선 검색어', None)
+    finally:
+        hedge.close()
@@ -0,0 +1,73 @@
+"""검색어 메모: 교육명 하나를 추가하면 그 교육명만 새로 계산"""
+
+import os
+
+import pytest
+
+from conftest import ROOT
+from enhance_search_terms import SearchTermEnhancer
+from enhance_search_terms_v2 import AdvancedSearchEnhancer
+from kohi_io import first_column
+from kohi_memo import EnhanceMemo, algorithm_version
+
+ENHANCERS = [
+    (AdvancedSearchEnhancer, 'smart_split'),
+    (SearchTermEnhancer, 'split_by_meaning_units'),
+]
+
+
+@pytest.fixture
+def titles(tmp_path, monkeypatch):
+    # load_titles()가 작업 디렉터리의 work.csv/결과 CSV를 읽으므로 빈 디렉터리에서 실행
+    names = first_column(os.path.join(ROOT, 'work.csv'))
+    monkeypatch.chdir(tmp_path)
+    return names
+
+
+def run(cls, method, titles, tmp_path):
+    enhancer = cls(titles=titles, dictionary_file=str(tmp_path / 'segment_dictionary.json'))
+    memo = EnhanceMemo(str(tmp_path / 'enhance_memo.json'), enhancer)
+    results = {title: memo.get(title, getattr(enhancer, method)) for title in titles}
+    memo.save()
+    return memo, results
+
+
+@pytest.mark.parametrize('cls,method', ENHANCERS)
+def test_appended_title_is_the_only_new_computation(cls, method, titles, tmp_path):
+    first, _ = run(cls, method, titles[:-1], tmp_path)
+    assert first.misses == len(set(titles[:-1]))
+
+    second, results = run(cls, method, titles, tmp_path)
+    assert (second.hits, second.misses) == (len(set(titles[:-1])), 1)
+
+    # 메모한 결과는 같은 단어 사전으로 새로 계산한 결과와 같음
+    fresh = cls(titles=titles, dictionary_file=str(tmp_path / 'segment_dictionary.json'))
+    assert results == {title: getattr(fresh, method)(title) for title in titles}
+
+
+def test_new_result_csv_does_not_invalidate_memo(titles, tmp_path):
+    run(AdvancedSearchEnhancer, 'smart_split', titles, tmp_path)
+    (tmp_path / 'scraped_ultimate_final.csv').write_text(
+        '원본_교육과정명,교육과정명\n새과정,완전히새로운교육과정명\n', encoding='utf-8-sig')
+
+    memo, _ = run(AdvancedSearchEnhancer, 'smart_split', titles, tmp_path)
+    assert memo.misses == 0
+
+
+def test_version_follows_memo_key_only(titles, tmp_path):
+    enhancer = AdvancedSearchEnhancer(titles=titles, dictionary_file=str(tmp_path / 'segment_dictionary.json'))
+    version = algorithm_version(enhancer)
+
+    enhancer.unrelated_cache = {'anything': 1}
+    assert algorithm_version(enhancer) == version
+
+    enhancer.preserve_compounds.add('교육과정')
+    assert algorithm_version(enhancer) != version
+
+
+def test_rebuilt_dictionary_changes_version(titles, tmp_path):
+    path = str(tmp_path / 'segment_dictionary.json')
+    before = algorithm_version(AdvancedSearchEnhancer(titles=titles[:-20], dictionary_file=path))
+    assert algorithm_version(AdvancedSearchEnhancer(titles=titles, dictionary_file=path)) == before
+    after = algorithm_version(AdvancedSearchEnhancer(titles=titles, dictionary_file=path, rebuild_dictionary=True))
+    assert after != before
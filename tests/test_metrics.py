@@ -0,0 +1,54 @@
+"""실행 메트릭: 시간 예산 소진으로 다시 시도한 과정은 최종 결과만 셈"""
+
+import pytest
+
+import kohi_scraper_ultimate
+from kohi_metrics import RUN as metrics
+
+
+class FakePlaywright:
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def no_browser(monkeypatch):
+    monkeypatch.setattr('playwright.sync_api.sync_playwright', lambda: FakePlaywright())
+
+
+def counts():
+    return {
+        'success': metrics.courses.value(result='성공'),
+        'timeout': metrics.courses.value(result='타임아웃'),
+        'failures': metrics.failures.value(result='타임아웃'),
+        'retries': metrics.retries.value(stage='deadline'),
+    }
+
+
+def run(monkeypatch, tmp_path, outcomes, deadline_retries=1):
+    """과정명 -> 시도마다 돌려줄 스크래핑결과 목록으로 run_scrape 실행, 메트릭 증가분 반환"""
+    def fake_scrape(course_name, playwright_instance, **kwargs):
+        return {'원본_교육과정명': course_name, '스크래핑결과': outcomes[course_name].pop(0)}
+
+    monkeypatch.setattr(kohi_scraper_ultimate, 'scrape_course_complete', fake_scrape)
+    before = counts()
+    results = kohi_scraper_ultimate.run_scrape(
+        list(outcomes), output_file=str(tmp_path / 'out.csv'), temp_file=None, delay=0,
+        deadline_retries=deadline_retries, selectors_file=None)
+    after = counts()
+    return results, {key: after[key] - before[key] for key in after}
+
+
+def test_retried_timeout_is_counted_once(no_browser, monkeypatch, tmp_path):
+    results, delta = run(monkeypatch, tmp_path, {'과정A': ['타임아웃', '성공'], '과정B': ['성공']})
+    assert [r['스크래핑결과'] for r in results] == ['성공', '성공']
+    assert delta == {'success': 2, 'timeout': 0, 'failures': 0, 'retries': 1}
+
+
+def test_timeout_without_retry_left_is_counted_as_failure(no_browser, monkeypatch, tmp_path):
+    results, delta = run(monkeypatch, tmp_path, {'과정A': ['타임아웃', '타임아웃']})
+    assert results[0]['스크래핑결과'] == '타임아웃'
+    assert delta == {'success': 0, 'timeout': 1, 'failures': 1, 'retries': 1}
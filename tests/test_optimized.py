@@ -0,0 +1,73 @@
+"""최적화 스크래퍼 scrape_course: 결과 판정과 카드 없는 검색 결과 (브라우저 없이 검색/추출 단계를 바꿔 끼움)"""
+
+import pytest
+
+import kohi_scraper_optimized
+from kohi_scraper_optimized import KOHIScraperOptimized
+
+
+class FakePage:
+    def set_default_timeout(self, ms):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+
+class FakeBrowser:
+    def new_context(self, **kwargs):
+        return self
+
+    def new_page(self):
+        return FakePage()
+
+    def close(self):
+        pass
+
+
+class FakePlaywright:
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr('playwright.sync_api.sync_playwright', lambda: FakePlaywright())
+    monkeypatch.setattr(kohi_scraper_optimized, 'launch_browser', lambda *args, **kwargs: FakeBrowser())
+    return KOHIScraperOptimized(course_budget=None)
+
+
+def scrape(scraper, monkeypatch, info):
+    monkeypatch.setattr(scraper, '_search_card', lambda page, name, terms, deadline: (object(), 1, 3))
+    monkeypatch.setattr(scraper, 'extract_course_info',
+                        lambda page, card, deadline, picked=None: dict(info))
+    return scraper.scrape_course('과정A', '과정 A')
+
+
+def test_card_only_result_is_not_success(scraper, monkeypatch):
+    # 상세 페이지 추출이 실패해 카드 필드 몇 개만 모은 과정
+    result = scrape(scraper, monkeypatch, {'검색결과_제목': '과정A', '교육과정코드': 'C1'})
+    assert result['스크래핑결과'] == '정보 부족'
+    assert result['수집_필드수'] == 4  # 카드 2개 + 검색어, 검색결과수
+
+
+def test_full_result_is_success(scraper, monkeypatch):
+    info = {f'필드{i}': str(i) for i in range(12)}
+    result = scrape(scraper, monkeypatch, info)
+    assert result['스크래핑결과'] == '성공'
+    assert result['검색결과수'] == 3
+
+
+def test_results_without_matching_card(scraper, monkeypatch):
+    # 검색 결과 수는 있지만 카드를 찾지 못한 경우 (페이지 구조 변경 등): 첫 카드 대신 검색결과없음
+    monkeypatch.setattr(scraper, 'search_with_enhanced_terms', lambda page, terms, deadline: (True, 3))
+    monkeypatch.setattr(kohi_scraper_optimized, 'find_matching_card',
+                        lambda page, course_name, deadline: (None, 1, 0))
+    monkeypatch.setattr(scraper, 'extract_course_info', lambda *args, **kwargs: pytest.fail('추출하면 안 됨'))
+    result = scraper.scrape_course('과정A', '과정 A')
+    assert result['스크래핑결과'] == '검색결과없음'
+    assert result['검색결과수'] == 3
+    assert result['검색어'] == '과정 A'
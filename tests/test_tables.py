@@ -0,0 +1,70 @@
+"""상세 페이지 표 분류: 캡션/헤더로 종류를 정하고 교육구성은 처음 찾은 시간표만"""
+
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+from kohi_html import parse_html
+from kohi_mock_server import load_catalog, render_detail_page
+from kohi_spec import DETAIL
+from kohi_tables import child_path, write_children
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return load_catalog(os.path.join(ROOT, 'scraped_ultimate_temp.csv'))
+
+
+def test_mock_detail_page_keeps_timetable_not_privacy_table(catalog, tmp_path):
+    # 기록된 '교육구성' 값(개인정보 제3자 제공 안내 표)이 있어 대역 페이지에 시간표 뒤에 그 표가 붙는 과정
+    course = next(c for c in catalog if c.get('기타_교육구성(이러닝)') and c.get('교육구성'))
+    data = DETAIL.extract(parse_html(render_detail_page(course, '1', recommended=catalog[:2])))
+
+    timetable = json.loads(data['교육구성'])
+    assert '차시명' in timetable[0] and '제공받는 자' not in timetable[0]
+    assert data['교육구성_과목수'] == len(timetable)
+    assert data['추천교육과정_수'] == 2
+    assert any(key.startswith('신청_') for key in data)
+    assert data['수료_학습진도']
+
+    rows = [dict(data, 교육과정코드=course['교육과정코드'], 원본_교육과정명=course['원본_교육과정명'])]
+    out = tmp_path / 'scraped.csv'
+    write_children(str(out), rows)
+    with open(child_path(str(out), '교육구성'), encoding='utf-8-sig') as f:
+        header = f.readline()
+    assert '차시명' in header and '제공받는 자' not in header
+
+
+def test_free_text_does_not_make_a_timetable():
+    page = parse_html('''
+    <table><caption>개인정보 제3자 제공 안내</caption>
+      <thead><tr><th>제공받는 자</th><th>제공항목</th></tr></thead>
+      <tbody><tr><td>국민건강보험공단</td><td>교육생 성명, 교육일정</td></tr></tbody>
+    </table>''')
+    data = DETAIL.extract(page)
+    assert '교육구성' not in data
+
+
+def test_merged_hour_columns_are_summed():
+    page = parse_html('''
+    <table><caption>교육구성에 관한 표로 교과목, 강사, 교육시간에 대한 내용을 담고있다.</caption>
+      <thead>
+        <tr><th rowspan="2">교과목</th><th rowspan="2">강사</th><th colspan="2">교육시간</th></tr>
+        <tr><th>이론</th><th>실습</th></tr>
+      </thead>
+      <tbody>
+        <tr><td>사례관리 실무</td><td>홍길동</td><td>2</td><td>1</td></tr>
+        <tr><td>상담기법</td><td>김철수</td><td>1.5</td><td>0</td></tr>
+      </tbody>
+    </table>
+    <table><caption>교육일정 안내</caption>
+      <thead><tr><th>교과목</th><th>시간</th></tr></thead>
+      <tbody><tr><td>다른 표</td><td>9</td></tr></tbody>
+    </table>''')
+    data = DETAIL.extract(page)
+    items = json.loads(data['교육구성'])
+    assert items[0]['교육시간_이론'] == '2'
+    assert data['교육구성_과목수'] == 2
+    assert data['교육구성_총시간'] == 4.5